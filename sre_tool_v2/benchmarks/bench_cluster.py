@@ -0,0 +1,245 @@
+"""End-to-end benchmark of the cluster commands against a fake API server
+
+Starts benchmarks.fake_api in a subprocess with the requested cluster size
+and latency, points a temporary kubeconfig at it and runs list, info,
+diagnostic and scale through the real KubernetesClient and managers. Every
+command runs in a fresh process so that its peak RSS is its own. For each
+command the latency percentiles, the API requests and bytes per run, the
+peak RSS and the failed runs are written to a JSON file.
+
+Pass the JSON file of an earlier commit with --compare to exit non-zero
+when a command's median latency regressed by more than --max-regression
+percent or when it makes more API requests, so it can gate CI.
+
+Usage (from the sre_tool_v2 directory):
+    python -m benchmarks.bench_cluster --deployments 10000 --pods-per-deployment 10 --output bench.json
+    python -m benchmarks.bench_cluster --latency-ms 5 --compare bench.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.fake_api import deployment_target
+from utils.aggregate import interpolate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CASES = ("list", "info", "diagnostic", "scale")
+KUBECONFIG = """apiVersion: v1
+kind: Config
+clusters:
+- cluster: {{server: "{server}"}}
+  name: fake
+contexts:
+- context: {{cluster: fake, user: bench}}
+  name: fake
+current-context: fake
+users:
+- name: bench
+  user: {{token: bench}}
+"""
+
+
+def case_argv(case: str, iteration: int, options: dict) -> list:
+    """Command line of one run of a case
+
+    Runs spread over the cluster so no single deployment is hot, and scale
+    alternates between two replica counts so every run changes something.
+    """
+    namespace, name = deployment_target(iteration * 7919 % options["deployments"], options["namespaces"])
+    if case == "list":
+        return ["list", "--page-size", "500"]
+    if case == "info":
+        return ["info", "--deployment", name, "--namespace", namespace]
+    if case == "diagnostic":
+        return ["diagnostic", "--deployment", name, "--namespace", namespace]
+    return ["scale", "--deployment", name, "--namespace", namespace,
+            "--replicas", str(options["pods_per_deployment"] + 1 + iteration % 2)]
+
+
+def api_stats(server: str, reset: bool = False) -> dict:
+    """Read, or read and reset, the request counters of the fake API server"""
+    request = urllib.request.Request(f"{server}/_reset" if reset else f"{server}/_stats",
+                                     data=b"" if reset else None)
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def run_case(case: str, server: str, options: dict) -> dict:
+    """Run the iterations of one case, in a fresh process
+
+    Returns:
+        dict: Latencies in seconds, API usage, peak RSS and failed runs
+    """
+    from commands import Session, build_parser, dispatch
+    from utils.render import render
+    from utils.timings import StageTimings
+
+    parser = build_parser()
+    session = Session()
+    errors = 0
+    latencies = []
+    with open(os.devnull, "w") as devnull:
+        for iteration in range(-options["warmup"], options["iterations"]):
+            if iteration == 0:
+                api_stats(server, reset=True)
+            args = parser.parse_args(case_argv(case, iteration, options))
+            start_time = time.perf_counter()
+            failed = render(args.command, dispatch(args, session, StageTimings()), args.output, devnull)
+            if iteration >= 0:
+                latencies.append(time.perf_counter() - start_time)
+                errors += failed
+    stats = api_stats(server)
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {"latencies": latencies, "requests": stats["requests"], "bytes": stats["bytes"],
+            "peak_rss": peak_rss, "errors": errors}
+
+
+def summarize(run: dict) -> dict:
+    """Turn the raw measurements of a case into the reported figures"""
+    latencies = sorted(run["latencies"])
+    count = len(latencies)
+    return {
+        "latency_ms": {
+            "p50": round(interpolate(latencies, 0, count, 50) * 1000, 2),
+            "p90": round(interpolate(latencies, 0, count, 90) * 1000, 2),
+            "p99": round(interpolate(latencies, 0, count, 99) * 1000, 2),
+            "max": round(latencies[-1] * 1000, 2),
+            "mean": round(sum(latencies) / count * 1000, 2),
+        },
+        "requests_per_op": round(run["requests"] / count, 2),
+        "bytes_per_op": round(run["bytes"] / count),
+        "peak_rss_mib": round(run["peak_rss"] / 2 ** 20, 1),
+        "errors": run["errors"],
+    }
+
+
+def start_server(args) -> tuple:
+    """Start the fake API server and wait until it listens
+
+    Returns:
+        tuple: (server process, server URL)
+    """
+    process = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.fake_api", "--deployments", str(args.deployments),
+         "--pods-per-deployment", str(args.pods_per_deployment), "--namespaces", str(args.namespaces),
+         "--nodes", str(args.nodes), "--latency-ms", str(args.latency_ms), "--rollout-ms", str(args.rollout_ms)],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True
+    )
+    for line in process.stdout:
+        print(f"fake API: {line.strip()}")
+        if line.startswith("Listening on "):
+            return process, line.split()[-1]
+    process.wait()
+    print(f"Fake API server exited with code {process.returncode}")
+    sys.exit(1)
+
+
+def git_commit() -> str:
+    """Commit of the benchmarked tree, empty outside a git checkout"""
+    completed = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return completed.stdout.strip()
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> bool:
+    """Print the change of every case against a baseline
+
+    Returns:
+        bool: True when a case regressed
+    """
+    regressed = False
+    print(f"\nAgainst {baseline.get('commit') or 'baseline'}:")
+    for case, result in results["cases"].items():
+        before = baseline["cases"].get(case)
+        if before is None:
+            continue
+        change = (result["latency_ms"]["p50"] / before["latency_ms"]["p50"] - 1) * 100
+        requests_change = result["requests_per_op"] - before["requests_per_op"]
+        slower = change > max_regression
+        chattier = requests_change > 0
+        regressed = regressed or slower or chattier
+        print(f"  {case:<12} p50 {before['latency_ms']['p50']:>9.2f} -> {result['latency_ms']['p50']:>9.2f} ms "
+              f"({change:+.1f}%)  requests {before['requests_per_op']:g} -> {result['requests_per_op']:g}"
+              f"{'  REGRESSED' if slower or chattier else ''}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cluster commands against a fake API server")
+    parser.add_argument('--cases', default=",".join(CASES), help="Comma-separated commands to run")
+    parser.add_argument('--deployments', type=int, default=1000, help="Deployments in the fake cluster")
+    parser.add_argument('--pods-per-deployment', type=int, default=10, help="Pods of every deployment")
+    parser.add_argument('--namespaces', type=int, default=50, help="Namespaces the deployments are spread over")
+    parser.add_argument('--nodes', type=int, default=100, help="Nodes the pods are spread over")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Latency added to every API request")
+    parser.add_argument('--rollout-ms', type=float, default=50.0, help="Time the fake controller takes to scale")
+    parser.add_argument('--iterations', type=int, default=20, help="Measured runs per command")
+    parser.add_argument('--warmup', type=int, default=2, help="Unmeasured runs per command")
+    parser.add_argument('--output', default="bench_cluster.json", help="JSON file to write the results to")
+    parser.add_argument('--compare', help="JSON results of an earlier run to compare with")
+    parser.add_argument('--max-regression', type=float, default=25.0,
+                        help="Median latency increase, in percent, that fails --compare")
+    args = parser.parse_args()
+
+    cases = [case.strip() for case in args.cases.split(",") if case.strip()]
+    unknown = set(cases) - set(CASES)
+    if unknown or args.iterations < 1:
+        parser.error(f"unknown cases {', '.join(sorted(unknown))}" if unknown else "--iterations must be positive")
+    options = {"deployments": args.deployments, "pods_per_deployment": args.pods_per_deployment,
+               "namespaces": args.namespaces, "iterations": args.iterations, "warmup": args.warmup}
+
+    process, server = start_server(args)
+    results = {
+        "version": 1,
+        "commit": git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "config": {**options, "nodes": args.nodes, "latency_ms": args.latency_ms, "rollout_ms": args.rollout_ms},
+        "cases": {},
+    }
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            kubeconfig = os.path.join(directory, "kubeconfig")
+            with open(kubeconfig, "w") as f:
+                f.write(KUBECONFIG.format(server=server))
+            # Inherited by the case processes; the private cache keeps the namespace index out of the runs
+            os.environ["KUBECONFIG"] = kubeconfig
+            os.environ["XDG_CACHE_HOME"] = directory
+
+            print(f"{'case':<12} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'requests':>9} {'KiB/op':>9} "
+                  f"{'RSS MiB':>8} {'errors':>6}")
+            for case in cases:
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+                    result = summarize(pool.submit(run_case, case, server, options).result())
+                results["cases"][case] = result
+                latency = result["latency_ms"]
+                print(f"{case:<12} {latency['p50']:>9.2f} {latency['p90']:>9.2f} {latency['p99']:>9.2f} "
+                      f"{result['requests_per_op']:>9g} {result['bytes_per_op'] / 1024:>9.1f} "
+                      f"{result['peak_rss_mib']:>8.1f} {result['errors']:>6}")
+    finally:
+        process.terminate()
+        process.wait()
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    failed = any(result["errors"] for result in results["cases"].values())
+    if args.compare:
+        with open(args.compare) as f:
+            failed = compare(results, json.load(f), args.max_regression) or failed
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Micro-benchmark of joining pod metrics with pod specs
+
+Compares the original nested scan of the PodMetricsList with the indexed
+join used by PodManager.get_pods_status on a synthetic payload.
+
+Usage (from the sre_tool_v2 directory):
+    python -m benchmarks.bench_metrics_join --pods 5000 --containers 2
+"""
+import argparse
+import time
+
+from managers.pod_manager import PodManager
+from utils.resource_converter import convert_cpu_to_cores, convert_memory_to_bytes, parse_cpu, parse_memory
+from utils.results import ContainerStatus
+
+
+def build_payload(pod_count: int, container_count: int):
+    """Build synthetic pod specs and a matching PodMetricsList"""
+    pods = []
+    items = []
+    for i in range(pod_count):
+        pod_name = f"pod-{i:06d}"
+        containers = [(f"c{j}", {"cpu": "250m", "memory": "256Mi"}) for j in range(container_count)]
+        pods.append((pod_name, containers))
+        items.append({
+            "metadata": {"name": pod_name},
+            "containers": [
+                {"name": name, "usage": {"cpu": f"{100 + i % 100}m", "memory": f"{128 + i % 64}Mi"}}
+                for name, _ in containers
+            ],
+        })
+    return pods, {"items": items}
+
+
+def nested_join(pods, pod_metrics):
+    """Original join: scan every metrics item for every container"""
+    results = []
+    for pod_name, containers in pods:
+        for container_name, requests in containers:
+            data = (None, None, None, None)
+            for item in pod_metrics.get('items', []):
+                if item['metadata']['name'] == pod_name:
+                    for container_metric in item['containers']:
+                        if container_metric['name'] == container_name:
+                            usage_cpu = convert_cpu_to_cores(container_metric['usage']['cpu'])
+                            usage_mem = convert_memory_to_bytes(container_metric['usage']['memory'])
+                            data = (usage_cpu, usage_mem,
+                                    usage_cpu / convert_cpu_to_cores(requests['cpu']) * 100,
+                                    usage_mem / convert_memory_to_bytes(requests['memory']) * 100)
+            results.append(data)
+    return results
+
+
+def indexed_join(pods, pod_metrics):
+    """Current join: index once, one dictionary lookup per container, then
+    the usage percentages of every container in one columnar step"""
+    metrics_index = PodManager.index_pod_metrics(pod_metrics)
+    containers = [
+        ContainerStatus(container_name, "", parse_cpu(requests['cpu']), parse_memory(requests['memory']), None, None,
+                        *PodManager.container_usage(metrics_index, pod_name, container_name))
+        for pod_name, containers in pods
+        for container_name, requests in containers
+    ]
+    PodManager.fill_usage_percentages(containers)
+    return [(c.cpu_usage_cores, c.memory_usage_bytes, c.cpu_usage_percent, c.memory_usage_percent)
+            for c in containers]
+
+
+def timed(func, *args, warm_up=None):
+    """Time one call of func, after an unmeasured call on the warm_up arguments
+
+    The warm-up keeps the lazy NumPy import and the first fill of the
+    quantity parsing caches out of the measured call.
+    """
+    if warm_up is not None:
+        func(*warm_up)
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the pod metrics join")
+    parser.add_argument('--pods', type=int, default=5000, help="Number of synthetic pods")
+    parser.add_argument('--containers', type=int, default=2, help="Containers per pod")
+    args = parser.parse_args()
+
+    pods, pod_metrics = build_payload(args.pods, args.containers)
+    # The nested join is quadratic, so it warms up on a small payload
+    small_payload = build_payload(min(args.pods, 100), args.containers)
+    nested_result, nested_time = timed(nested_join, pods, pod_metrics, warm_up=small_payload)
+    indexed_result, indexed_time = timed(indexed_join, pods, pod_metrics, warm_up=(pods, pod_metrics))
+    assert nested_result == indexed_result, "joins disagree"
+
+    print(f"pods={args.pods} containers/pod={args.containers}")
+    print(f"nested join:  {nested_time * 1000:10.1f} ms")
+    print(f"indexed join: {indexed_time * 1000:10.1f} ms")
+    print(f"speedup:      {nested_time / indexed_time:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+"""Memory benchmark of the pod status records of a diagnostic
+
+Compares the retained size of the original dictionaries of "N/A" and
+pre-formatted strings with the slotted records returned by
+PodManager.get_pods_status, measured with tracemalloc on a synthetic payload.
+
+Usage (from the sre_tool_v2 directory):
+    python -m benchmarks.bench_pod_memory --pods 20000 --containers 2
+"""
+import argparse
+import gc
+import tracemalloc
+
+from benchmarks.bench_metrics_join import build_payload
+from managers.pod_manager import PodManager
+from utils.resource_converter import parse_cpu, parse_memory
+from utils.results import ContainerStatus, PodCondition, PodStatus
+
+CONDITIONS = [("Initialized", "True"), ("Ready", "True"), ("ContainersReady", "True"), ("PodScheduled", "True")]
+
+
+def dict_pods(pods, pod_metrics):
+    """Original layout: one dictionary per pod and per container"""
+    metrics_index = {
+        (item['metadata']['name'], container['name']): container['usage']
+        for item in pod_metrics['items'] for container in item['containers']
+    }
+    results = []
+    for pod_name, containers in pods:
+        container_resources = []
+        for container_name, requests in containers:
+            usage = metrics_index[(pod_name, container_name)]
+            container_resources.append({
+                "name": container_name,
+                "image": "registry.example.com/app:1.0",
+                "cpu_request": requests['cpu'],
+                "memory_request": requests['memory'],
+                "cpu_limit": "N/A",
+                "memory_limit": "N/A",
+                "cpu_usage": usage['cpu'],
+                "memory_usage": usage['memory'],
+                "cpu_usage_percentage": f"{parse_cpu(usage['cpu']) / parse_cpu(requests['cpu']) * 100:.1f}%",
+                "memory_usage_percentage":
+                    f"{parse_memory(usage['memory']) / parse_memory(requests['memory']) * 100:.1f}%",
+            })
+        results.append({
+            "name": pod_name,
+            "namespace": "default",
+            "replicaset": "app-5d8f7c9b4",
+            "phase": "Running",
+            "reason": None,
+            "node": "node-1",
+            "start_time": "2024-01-01T00:00:00+00:00",
+            "conditions": [
+                {"type": condition, "status": status, "reason": None, "message": None}
+                for condition, status in CONDITIONS
+            ],
+            "container_reasons": [],
+            "containers": container_resources,
+        })
+    return results
+
+
+def record_pods(pods, pod_metrics):
+    """Current layout: slotted records holding parsed values"""
+    metrics_index = PodManager.index_pod_metrics(pod_metrics)
+    results = []
+    for pod_name, containers in pods:
+        container_resources = []
+        for container_name, requests in containers:
+            container_resources.append(ContainerStatus(
+                container_name,
+                "registry.example.com/app:1.0",
+                parse_cpu(requests['cpu']),
+                parse_memory(requests['memory']),
+                None,
+                None,
+                *PodManager.container_usage(metrics_index, pod_name, container_name)
+            ))
+        results.append(PodStatus(
+            name=pod_name,
+            namespace="default",
+            replicaset="app-5d8f7c9b4",
+            phase="Running",
+            reason=None,
+            node="node-1",
+            start_time="2024-01-01T00:00:00+00:00",
+            conditions=[PodCondition(condition, status) for condition, status in CONDITIONS],
+            container_reasons=[],
+            containers=container_resources,
+        ))
+    PodManager.fill_usage_percentages([c for pod in results for c in pod.containers])
+    return results
+
+
+def retained_bytes(func, *args) -> int:
+    """Measure the memory still allocated by the result of func
+
+    func runs once unmeasured first, so that the lazy NumPy import and the
+    quantity parsing caches are not counted as part of its result.
+    """
+    func(*args)
+    gc.collect()
+    tracemalloc.start()
+    result = func(*args)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the memory of pod status records")
+    parser.add_argument('--pods', type=int, default=20000, help="Number of synthetic pods")
+    parser.add_argument('--containers', type=int, default=2, help="Containers per pod")
+    args = parser.parse_args()
+
+    pods, pod_metrics = build_payload(args.pods, args.containers)
+    dict_size = retained_bytes(dict_pods, pods, pod_metrics)
+    record_size = retained_bytes(record_pods, pods, pod_metrics)
+
+    print(f"pods={args.pods} containers/pod={args.containers}")
+    print(f"dicts:     {dict_size / args.pods:10.0f} bytes/pod")
+    print(f"records:   {record_size / args.pods:10.0f} bytes/pod")
+    print(f"reduction: {dict_size / record_size:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Micro-benchmark of Kubernetes quantity parsing and utilization math
+
+Compares parsing every quantity from scratch with the memoized scalar path,
+and per-container division with the columnar utilization_percent step (which
+uses NumPy when it is installed).
+
+Usage (from the sre_tool_v2 directory):
+    python -m benchmarks.bench_quantities --containers 100000
+"""
+import argparse
+import random
+import time
+
+from utils.resource_converter import optional_numpy, parse_quantities, parse_quantity, utilization_percent
+
+
+def build_columns(container_count: int):
+    """Build request and usage quantities as reported by the API and metrics-server"""
+    rng = random.Random(0)
+    requests = [rng.choice(["100m", "250m", "500m", "1", "2"]) for _ in range(container_count)]
+    usage = [f"{rng.randrange(1, 2_000_000_000)}n" for _ in range(container_count)]
+    return requests, usage
+
+
+def timed(func, *args):
+    start_time = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark quantity parsing and utilization math")
+    parser.add_argument('--containers', type=int, default=100000, help="Number of synthetic containers")
+    args = parser.parse_args()
+
+    requests, usage = build_columns(args.containers)
+    optional_numpy()
+
+    uncached = parse_quantity.__wrapped__
+    _, uncached_time = timed(lambda: [uncached(q) for q in requests])
+    parse_quantity.cache_clear()
+    _, cached_time = timed(lambda: [parse_quantity(q) for q in requests])
+
+    request_column = parse_quantities(requests)
+    usage_column = parse_quantities(usage)
+    scalar, scalar_time = timed(lambda: [u / r * 100 for u, r in zip(usage_column, request_column)])
+    _, column_time = timed(utilization_percent, usage_column, request_column)
+
+    print(f"containers={args.containers} numpy={'yes' if optional_numpy() else 'no'}")
+    print(f"parse requests, uncached:  {uncached_time * 1000:10.1f} ms")
+    print(f"parse requests, memoized:  {cached_time * 1000:10.1f} ms")
+    print(f"utilization, per element: {scalar_time * 1000:10.1f} ms")
+    print(f"utilization, columnar:    {column_time * 1000:10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
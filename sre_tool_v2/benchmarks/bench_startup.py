@@ -0,0 +1,92 @@
+"""Startup benchmark of the CLI for commands that never reach the cluster
+
+Runs `main.py --help` and `main.py debug` in fresh interpreters, reports
+the median wall time above a bare interpreter start and the slowest
+imports from `-X importtime`, and exits non-zero when a command goes over
+the budget or imports the Kubernetes SDK, so it can gate CI.
+
+Usage (from the sre_tool_v2 directory):
+    python -m benchmarks.bench_startup --runs 5 --budget-ms 50
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MAIN_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+CASES = {
+    "--help": [MAIN_PATH, "--help"],
+    "debug": [MAIN_PATH, "debug", "--level", "INFO"],
+    "usage": [MAIN_PATH],
+}
+# Packages that must stay out of the startup path of these commands
+FORBIDDEN_IMPORTS = ("kubernetes", "clients", "managers")
+
+
+def run_once(argv):
+    """Run one fresh interpreter with -X importtime
+
+    Returns:
+        tuple: (wall time in seconds, list of (cumulative us, module) tuples)
+    """
+    start_time = time.perf_counter()
+    completed = subprocess.run([sys.executable, "-X", "importtime"] + argv,
+                               capture_output=True, text=True, cwd=os.path.dirname(MAIN_PATH))
+    elapsed = time.perf_counter() - start_time
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), module.strip()))
+    return elapsed, imports
+
+
+def median_time(argv, runs: int):
+    """Median wall time of several runs and the imports of the last one"""
+    times = []
+    imports = []
+    for _ in range(runs):
+        elapsed, imports = run_once(argv)
+        times.append(elapsed)
+    return statistics.median(times), imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per command")
+    parser.add_argument('--budget-ms', type=float, default=50.0,
+                        help="Allowed time above a bare interpreter start")
+    parser.add_argument('--top', type=int, default=5, help="Slowest imports to show per command")
+    args = parser.parse_args()
+
+    baseline, baseline_imports = median_time(["-c", "pass"], args.runs)
+    interpreter_modules = {module for _, module in baseline_imports}
+    print(f"bare interpreter: {baseline * 1000:8.1f} ms")
+
+    failures = []
+    for name, argv in CASES.items():
+        elapsed, imports = median_time(argv, args.runs)
+        overhead = (elapsed - baseline) * 1000
+        print(f"{name:<8} {elapsed * 1000:8.1f} ms  (+{overhead:.1f} ms, budget {args.budget_ms:.0f} ms)")
+        # Modules loaded by every interpreter (site, .pth hooks) are not ours to trim
+        imports = [(cumulative, module) for cumulative, module in imports if module not in interpreter_modules]
+        for cumulative, module in sorted(imports, reverse=True)[:args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {module}")
+
+        if overhead > args.budget_ms:
+            failures.append(f"{name} took {overhead:.1f} ms over the interpreter start")
+        loaded = sorted({module.split(".")[0] for _, module in imports} & set(FORBIDDEN_IMPORTS))
+        if loaded:
+            failures.append(f"{name} imported {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,569 @@
+"""Fake Kubernetes API server for the cluster benchmarks
+
+Serves synthetic deployments, ReplicaSets, pods, warning events and pod
+and node metrics from memory. It covers the apps/v1, core/v1 and
+metrics.k8s.io calls the managers make: paginated lists with label
+selectors and equality field selectors, reads, the scale subresource and watches. A
+scale is rolled out by a fake controller after --rollout-ms.
+
+Every object is serialized once when it is created or changed, so that
+even 100k pods can be listed at close to network speed. --latency-ms is
+added to every request. GET /_stats reports the requests served and the
+bytes sent, and POST /_reset clears them.
+
+The tests drive the same server in-process through FakeCluster: they can
+delete deployments, close or expire open watches and inspect the watch
+requests that were made.
+
+Usage (from the sre_tool_v2 directory):
+    python -m benchmarks.fake_api --deployments 10000 --pods-per-deployment 10 --latency-ms 5
+"""
+import argparse
+import collections
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from utils.label_selector import parse_selector as parse_label_selector, selector_matches
+
+# The API server compresses responses larger than this when the client accepts gzip
+GZIP_MIN_BYTES = 128 * 1024
+# Watch events kept to resume watches from an older resourceVersion
+EVENT_HISTORY = 10000
+# Reason of the Status objects sent with an error code
+STATUS_REASONS = {403: "Forbidden", 404: "NotFound"}
+
+# Objects are stored serialized, with the labels and fields the selectors can match
+Entry = collections.namedtuple("Entry", ["labels", "fields", "data"])
+
+LIST_KINDS = {
+    "deployments": "DeploymentList",
+    "replicasets": "ReplicaSetList",
+    "pods": "PodList",
+    "events": "EventList",
+    "podmetrics": "PodMetricsList",
+    "nodemetrics": "NodeMetricsList",
+}
+
+
+def deployment_target(index: int, namespaces: int) -> Tuple[str, str]:
+    """Name the namespace and deployment generated for an index
+
+    Args:
+        index: Index of the deployment
+        namespaces: Number of namespaces the deployments are spread over
+
+    Returns:
+        Tuple[str, str]: Namespace and name of the deployment
+    """
+    return f"ns-{index % namespaces:03d}", f"web-{index:05d}"
+
+
+def parse_selector(selector: Optional[str]) -> List[Tuple[str, str]]:
+    """Parse an equality-based field selector into (key, value) pairs"""
+    requirements = []
+    for term in (selector or "").split(","):
+        if term.strip():
+            key, value = term.split("==", 1) if "==" in term else term.split("=", 1)
+            requirements.append((key.strip(), value.strip()))
+    return requirements
+
+
+class FakeCluster:
+    """Synthetic cluster state shared by the request handlers"""
+
+    def __init__(self, deployments: int = 1000, pods_per_deployment: int = 10, namespaces: int = 50,
+                 nodes: int = 100, latency: float = 0.0, rollout_delay: Optional[float] = 0.05):
+        """Generate the cluster
+
+        Args:
+            deployments: Number of deployments
+            pods_per_deployment: Replicas and pods of every deployment
+            namespaces: Number of namespaces the deployments are spread over
+            nodes: Number of nodes the pods are spread over
+            latency: Seconds added to every request
+            rollout_delay: Seconds the fake controller takes to roll out a
+                scale, None to roll out only when roll_out is called
+        """
+        self.latency = latency
+        self.rollout_delay = rollout_delay
+        self.pods_per_deployment = pods_per_deployment
+        self.namespaces = namespaces
+        self.nodes = nodes
+        self.lock = threading.Condition()
+        self.resource_version = 1
+        self.requests = 0
+        self.bytes_sent = 0
+        # (resourceVersion, kind, namespace, event type, Entry) of the watched changes
+        self.history = collections.deque(maxlen=EVENT_HISTORY)
+        # Watches from a resourceVersion older than this are answered with 410 Gone
+        self.compacted_version = 0
+        # Send a BOOKMARK every time a watch has caught up
+        self.bookmarks = True
+        self.expire_watches = 0
+        self.watch_epoch = 0
+        self.watch_requests: List[Dict[str, str]] = []
+        self.list_requests: List[Dict[str, str]] = []
+        # Kinds whose cluster-wide lists and watches are forbidden, like RBAC granted per namespace
+        self.forbidden_kinds: Set[str] = set()
+        # kind -> namespace -> name -> Entry, in creation order
+        self.store: Dict[str, Dict[Optional[str], Dict[str, Entry]]] = {
+            kind: collections.defaultdict(dict) for kind in LIST_KINDS
+        }
+        self.deployments = {}
+
+        with self.lock:
+            for node in range(nodes):
+                self.add("nodemetrics", None, {
+                    "kind": "NodeMetrics", "apiVersion": "metrics.k8s.io/v1beta1",
+                    "metadata": {"name": f"node-{node:03d}"},
+                    "usage": {"cpu": f"{1000 + node % 7 * 250}m", "memory": f"{8 + node % 5}Gi"},
+                })
+            for index in range(deployments):
+                self.add_deployment(index)
+
+    def next_version(self) -> str:
+        self.resource_version += 1
+        return str(self.resource_version)
+
+    def add(self, kind: str, namespace: Optional[str], obj: dict, fields: Optional[dict] = None):
+        """Store an object, serialized"""
+        metadata = obj["metadata"]
+        metadata["resourceVersion"] = self.next_version()
+        entry_fields = {"metadata.name": metadata["name"], **(fields or {})}
+        entry = Entry(metadata.get("labels") or {}, entry_fields, json.dumps(obj).encode())
+        self.store[kind][namespace][metadata["name"]] = entry
+        return entry
+
+    def add_deployment(self, index: int, namespace: Optional[str] = None):
+        """Generate a deployment with its ReplicaSets, pods, metrics and events
+
+        Args:
+            index: Index of the deployment, which names it
+            namespace: Optional namespace overriding the generated one
+        """
+        default_namespace, name = deployment_target(index, self.namespaces)
+        namespace = namespace or default_namespace
+        replicas = self.pods_per_deployment
+        labels = {"app": name}
+        containers = [{
+            "name": "app", "image": f"registry.example.com/{name}:1.0",
+            "resources": {"requests": {"cpu": "250m", "memory": "256Mi"},
+                          "limits": {"cpu": "500m", "memory": "512Mi"}},
+        }]
+        deployment = {
+            "apiVersion": "apps/v1", "kind": "Deployment",
+            "metadata": {"name": name, "namespace": namespace, "uid": f"uid-{name}", "generation": 1,
+                         "labels": labels, "creationTimestamp": "2024-01-01T00:00:00Z"},
+            "spec": {"replicas": replicas, "selector": {"matchLabels": labels},
+                     "template": {"metadata": {"labels": labels}, "spec": {"containers": containers}}},
+            "status": {"replicas": replicas, "readyReplicas": replicas, "availableReplicas": replicas,
+                       "updatedReplicas": replicas, "observedGeneration": 1},
+        }
+        self.deployments[(namespace, name)] = deployment
+        self.record("deployments", namespace, "ADDED", self.add("deployments", namespace, deployment))
+
+        for revision, pod_hash, count in ((1, "old", 0), (2, "cur", replicas)):
+            replica_set_name = f"{name}-{pod_hash}"
+            replica_set_labels = dict(labels, **{"pod-template-hash": pod_hash})
+            self.add("replicasets", namespace, {
+                "apiVersion": "apps/v1", "kind": "ReplicaSet",
+                "metadata": {"name": replica_set_name, "namespace": namespace, "uid": f"uid-{replica_set_name}",
+                             "labels": replica_set_labels,
+                             "annotations": {"deployment.kubernetes.io/revision": str(revision)},
+                             "ownerReferences": [{"apiVersion": "apps/v1", "kind": "Deployment", "name": name,
+                                                  "uid": f"uid-{name}", "controller": True}]},
+                "spec": {"replicas": count, "selector": {"matchLabels": replica_set_labels}},
+                "status": {"replicas": count, "readyReplicas": count, "availableReplicas": count},
+            })
+            for pod_index in range(count):
+                self.add_pod(namespace, replica_set_name, replica_set_labels, containers, pod_index,
+                             f"node-{(index + pod_index) % self.nodes:03d}",
+                             crashing=index % 10 == 0 and pod_index == 0)
+
+    def add_pod(self, namespace: str, replica_set_name: str, labels: dict, containers: list, pod_index: int,
+                node: str, crashing: bool):
+        """Generate a pod with its metrics, and a warning event when it is crashing"""
+        name = f"{replica_set_name}-{pod_index:04d}"
+        state = {"waiting": {"reason": "CrashLoopBackOff"}} if crashing else {
+            "running": {"startedAt": "2024-01-01T00:00:00Z"}}
+        self.add("pods", namespace, {
+            "apiVersion": "v1", "kind": "Pod",
+            "metadata": {"name": name, "namespace": namespace, "uid": f"uid-{name}", "labels": labels,
+                         "creationTimestamp": "2024-01-01T00:00:00Z",
+                         "ownerReferences": [{"apiVersion": "apps/v1", "kind": "ReplicaSet",
+                                              "name": replica_set_name, "uid": f"uid-{replica_set_name}",
+                                              "controller": True}]},
+            "spec": {"nodeName": node, "containers": containers},
+            "status": {"phase": "Running",
+                       "conditions": [{"type": "Ready", "status": "False" if crashing else "True"}],
+                       "containerStatuses": [{"name": "app", "image": containers[0]["image"], "imageID": "",
+                                              "ready": not crashing, "restartCount": 7 if crashing else 0,
+                                              "state": state}]},
+        })
+        self.add("podmetrics", namespace, {
+            "kind": "PodMetrics", "apiVersion": "metrics.k8s.io/v1beta1",
+            "metadata": {"name": name, "namespace": namespace, "labels": labels},
+            "timestamp": "2024-01-01T00:00:00Z", "window": "30s",
+            "containers": [{"name": "app", "usage": {"cpu": f"{50 + pod_index % 200}m",
+                                                     "memory": f"{100 + pod_index % 100}Mi"}}],
+        })
+        if crashing:
+            self.add("events", namespace, {
+                "apiVersion": "v1", "kind": "Event",
+                "metadata": {"name": f"{name}.backoff", "namespace": namespace,
+                             "creationTimestamp": "2024-01-01T00:00:00Z"},
+                "involvedObject": {"kind": "Pod", "name": name, "namespace": namespace},
+                "reason": "BackOff", "type": "Warning", "count": 12,
+                "message": "Back-off restarting failed container app",
+                "lastTimestamp": "2024-01-01T00:10:00Z",
+            }, {"type": "Warning"})
+
+    def select(self, kind: str, namespace: Optional[str], label_selector: Optional[str],
+               field_selector: Optional[str]) -> List[bytes]:
+        """Serialized objects matching a list request"""
+        labels = parse_label_selector(label_selector)
+        fields = parse_selector(field_selector)
+        namespaces = [namespace] if namespace else sorted(self.store[kind], key=lambda ns: ns or "")
+        with self.lock:
+            return [
+                entry.data
+                for ns in namespaces
+                for entry in self.store[kind].get(ns, {}).values()
+                if self.matches(entry, ns, labels, fields)
+            ]
+
+    @staticmethod
+    def matches(entry: Entry, namespace: Optional[str], labels, fields) -> bool:
+        if not selector_matches(labels, entry.labels):
+            return False
+        for key, value in fields:
+            actual = namespace if key == "metadata.namespace" else entry.fields.get(key)
+            if actual != value:
+                return False
+        return True
+
+    def create_deployment(self, index: int, namespace: Optional[str] = None):
+        """Add a deployment to the running cluster, see add_deployment"""
+        with self.lock:
+            self.add_deployment(index, namespace)
+
+    def delete_deployment(self, namespace: str, name: str):
+        """Delete a deployment, leaving its ReplicaSets and pods behind"""
+        with self.lock:
+            deployment = self.deployments.pop((namespace, name))
+            entry = self.add("deployments", namespace, deployment)
+            del self.store["deployments"][namespace][name]
+            self.record("deployments", namespace, "DELETED", entry)
+
+    def scale(self, namespace: str, name: str, replicas: int) -> Optional[dict]:
+        """Set the desired replicas of a deployment and start its rollout
+
+        Like the API server, a patch that does not change the replicas does
+        not change the deployment.
+        """
+        with self.lock:
+            deployment = self.deployments.get((namespace, name))
+            if deployment is None:
+                return None
+            changed = deployment["spec"]["replicas"] != replicas
+            if changed:
+                deployment["spec"]["replicas"] = replicas
+                deployment["metadata"]["generation"] += 1
+                self.update_deployment(deployment)
+            scale = {"apiVersion": "autoscaling/v1", "kind": "Scale",
+                     "metadata": {"name": name, "namespace": namespace,
+                                  "resourceVersion": deployment["metadata"]["resourceVersion"]},
+                     "spec": {"replicas": replicas}, "status": {"replicas": deployment["status"]["replicas"]}}
+        if changed and self.rollout_delay is not None:
+            threading.Timer(self.rollout_delay, self.roll_out, (namespace, name)).start()
+        return scale
+
+    def roll_out(self, namespace: str, name: str):
+        """Fake controller: report every desired replica as ready"""
+        with self.lock:
+            deployment = self.deployments.get((namespace, name))
+            if deployment is None:
+                return
+            replicas = deployment["spec"]["replicas"]
+            deployment["status"].update(replicas=replicas, readyReplicas=replicas, availableReplicas=replicas,
+                                        updatedReplicas=replicas,
+                                        observedGeneration=deployment["metadata"]["generation"])
+            self.update_deployment(deployment)
+
+    def update_deployment(self, deployment: dict):
+        """Store a changed deployment and notify the watches, with the lock held"""
+        namespace = deployment["metadata"]["namespace"]
+        self.record("deployments", namespace, "MODIFIED", self.add("deployments", namespace, deployment))
+
+    def record(self, kind: str, namespace: str, event_type: str, entry: Entry):
+        """Append a change for the watches, with the lock held"""
+        if len(self.history) == self.history.maxlen:
+            self.compacted_version = self.history[0][0]
+        self.history.append((self.resource_version, kind, namespace, event_type, entry))
+        self.lock.notify_all()
+
+    def close_watches(self):
+        """End every open watch, like a server-side timeout"""
+        with self.lock:
+            self.watch_epoch += 1
+            self.lock.notify_all()
+
+    def wait_for_watches(self, count: int, timeout: float = 5.0) -> bool:
+        """Wait until count watch requests were made"""
+        with self.lock:
+            return self.lock.wait_for(lambda: len(self.watch_requests) >= count, timeout)
+
+    def count(self, sent: int):
+        """Record a request and the bytes of its response"""
+        with self.lock:
+            self.requests += 1
+            self.bytes_sent += sent
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Routes the Kubernetes API paths used by the managers"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; Nagle's algorithm would delay the body by a delayed ACK
+    disable_nagle_algorithm = True
+    cluster: FakeCluster = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+        if url.path == "/_stats":
+            return self.send_json({"requests": self.cluster.requests, "bytes": self.cluster.bytes_sent},
+                                  counted=False)
+        if self.cluster.latency:
+            time.sleep(self.cluster.latency)
+
+        if url.path in ("/version", "/version/"):
+            return self.send_json({"major": "1", "minor": "30", "gitVersion": "v1.30.0", "gitCommit": "fake",
+                                   "gitTreeState": "clean", "buildDate": "2024-01-01T00:00:00Z",
+                                   "goVersion": "go1.22.0", "compiler": "gc", "platform": "linux/amd64"})
+        if url.path in ("/readyz", "/livez", "/healthz"):
+            return self.send_body(b"ok", "text/plain")
+        if url.path == "/api/v1/namespaces":
+            names = sorted({ns for ns in self.cluster.store["deployments"]} | {"default"})
+            return self.send_json({"kind": "NamespaceList", "apiVersion": "v1",
+                                   "metadata": {"resourceVersion": str(self.cluster.resource_version)},
+                                   "items": [{"metadata": {"name": name}} for name in names]})
+
+        route = self.route(parts)
+        if route is None:
+            return self.send_status(404, f"no route {url.path}")
+        kind, namespace, name, subresource = route
+        if name:
+            entry = self.cluster.store[kind].get(namespace, {}).get(name)
+            if entry is None:
+                return self.send_status(404, f"{kind} {name} not found")
+            if subresource == "scale":
+                deployment = self.cluster.deployments[(namespace, name)]
+                return self.send_json({"kind": "Scale", "apiVersion": "autoscaling/v1",
+                                       "metadata": {"name": name, "namespace": namespace},
+                                       "spec": {"replicas": deployment["spec"]["replicas"]},
+                                       "status": {"replicas": deployment["status"]["replicas"]}})
+            return self.send_body(entry.data)
+        if namespace is None and kind in self.cluster.forbidden_kinds:
+            return self.send_status(403, f"{kind} is forbidden at the cluster scope")
+        if query.get("watch", "").lower() == "true":
+            return self.watch(kind, namespace, query)
+        return self.list(kind, namespace, query)
+
+    def do_PATCH(self):
+        if self.cluster.latency:
+            time.sleep(self.cluster.latency)
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        route = self.route(urlparse(self.path).path.strip("/").split("/"))
+        if route is None or route[0] != "deployments" or route[3] != "scale":
+            return self.send_status(404, "only the deployment scale subresource can be patched")
+        _, namespace, name, _ = route
+        replicas = body[0]["value"] if isinstance(body, list) else body["spec"]["replicas"]
+        scale = self.cluster.scale(namespace, name, int(replicas))
+        if scale is None:
+            return self.send_status(404, f"deployments {name} not found")
+        return self.send_json(scale)
+
+    def do_POST(self):
+        if self.path == "/_reset":
+            with self.cluster.lock:
+                self.cluster.requests = 0
+                self.cluster.bytes_sent = 0
+            return self.send_json({}, counted=False)
+        return self.send_status(404, "not found")
+
+    @staticmethod
+    def route(parts: List[str]) -> Optional[Tuple[str, Optional[str], Optional[str], Optional[str]]]:
+        """Split an API path into kind, namespace, name and subresource"""
+        if parts[:2] == ["apis", "apps"] and len(parts) > 2:
+            rest = parts[3:]
+        elif parts[:2] == ["api", "v1"]:
+            rest = parts[2:]
+        elif parts[:3] == ["apis", "metrics.k8s.io", "v1beta1"]:
+            rest = parts[3:]
+        else:
+            return None
+        namespace = None
+        if len(rest) >= 2 and rest[0] == "namespaces":
+            namespace, rest = rest[1], rest[2:]
+        if not rest:
+            return None
+        kind = rest[0]
+        if parts[1] == "metrics.k8s.io":
+            kind = {"pods": "podmetrics", "nodes": "nodemetrics"}.get(kind, kind)
+        if kind not in LIST_KINDS:
+            return None
+        name = rest[1] if len(rest) > 1 else None
+        subresource = rest[2] if len(rest) > 2 else None
+        return kind, namespace, name, subresource
+
+    def list(self, kind: str, namespace: Optional[str], query: Dict[str, str]):
+        with self.cluster.lock:
+            self.cluster.list_requests.append({"kind": kind, "namespace": namespace, **query})
+        items = self.cluster.select(kind, namespace, query.get("labelSelector"), query.get("fieldSelector"))
+        metadata = {"resourceVersion": str(self.cluster.resource_version)}
+        limit = int(query.get("limit") or 0)
+        if limit:
+            start = int(query.get("continue") or 0)
+            if start + limit < len(items):
+                metadata["continue"] = str(start + limit)
+                metadata["remainingItemCount"] = len(items) - start - limit
+            items = items[start:start + limit]
+        head = json.dumps({"kind": LIST_KINDS[kind], "apiVersion": "v1", "metadata": metadata})[:-1]
+        self.send_body(head.encode() + b', "items": [' + b",".join(items) + b"]}")
+
+    def watch(self, kind: str, namespace: Optional[str], query: Dict[str, str]):
+        """Stream the changes after resourceVersion until timeoutSeconds"""
+        cluster = self.cluster
+        labels = parse_label_selector(query.get("labelSelector"))
+        fields = parse_selector(query.get("fieldSelector"))
+        bookmarks = query.get("allowWatchBookmarks", "").lower() == "true"
+        deadline = time.monotonic() + int(query.get("timeoutSeconds") or 60)
+        with cluster.lock:
+            version = int(query.get("resourceVersion") or cluster.resource_version)
+            # resourceVersion the client last received, behind version after changes of other objects
+            delivered = version
+            cluster.watch_requests.append({"kind": kind, "namespace": namespace, **query})
+            expired = version < cluster.compacted_version or cluster.expire_watches > 0
+            cluster.expire_watches = max(0, cluster.expire_watches - 1)
+            epoch = cluster.watch_epoch
+            cluster.lock.notify_all()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        # Counted up front: a watch only ends when the client goes away or it times out
+        cluster.count(0)
+        try:
+            if expired:
+                status = {"kind": "Status", "apiVersion": "v1", "status": "Failure", "code": 410,
+                          "reason": "Expired", "message": f"too old resource version: {version}"}
+                self.write_chunk(json.dumps({"type": "ERROR", "object": status}).encode() + b"\n")
+            while not expired and time.monotonic() < deadline:
+                with cluster.lock:
+                    if cluster.watch_epoch != epoch:
+                        break
+                    changes = [change for change in cluster.history if change[0] > version]
+                    bookmark = None
+                    if not changes and bookmarks and cluster.bookmarks and delivered < cluster.resource_version:
+                        version = delivered = cluster.resource_version
+                        bookmark = {"type": "BOOKMARK", "object": {
+                            "kind": "Deployment", "apiVersion": "apps/v1",
+                            "metadata": {"resourceVersion": str(version)}}}
+                    elif not changes:
+                        cluster.lock.wait(min(1.0, max(0.0, deadline - time.monotonic())))
+                        continue
+                if bookmark:
+                    self.write_chunk(json.dumps(bookmark).encode() + b"\n")
+                for change_version, change_kind, change_namespace, event_type, entry in changes:
+                    version = change_version
+                    if change_kind != kind or namespace and change_namespace != namespace:
+                        continue
+                    if cluster.matches(entry, change_namespace, labels, fields):
+                        delivered = change_version
+                        self.write_chunk(f'{{"type": "{event_type}", "object": '.encode() + entry.data + b"}\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def write_chunk(self, data: bytes):
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+        with self.cluster.lock:
+            self.cluster.bytes_sent += len(data)
+
+    def send_status(self, code: int, message: str):
+        self.send_json({"kind": "Status", "apiVersion": "v1", "status": "Failure", "code": code,
+                        "message": message, "reason": STATUS_REASONS.get(code, "BadRequest")}, code)
+
+    def send_json(self, obj, code: int = 200, counted: bool = True):
+        self.send_body(json.dumps(obj).encode(), code=code, counted=counted)
+
+    def send_body(self, body: bytes, content_type: str = "application/json", code: int = 200,
+                  counted: bool = True):
+        compressed = len(body) > GZIP_MIN_BYTES and "gzip" in (self.headers.get("Accept-Encoding") or "")
+        if compressed:
+            body = gzip.compress(body, 1)
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        if counted:
+            self.cluster.count(len(body))
+
+
+def serve(cluster: FakeCluster, port: int = 0) -> ThreadingHTTPServer:
+    """Serve a fake cluster on localhost from a background thread
+
+    Args:
+        cluster: State to serve
+        port: TCP port, any free port by default
+
+    Returns:
+        ThreadingHTTPServer: The running server, see server_address
+    """
+    handler = type("ClusterHandler", (Handler,), {"cluster": cluster})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="fake-api").start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a fake Kubernetes API")
+    parser.add_argument('--port', type=int, default=0, help="Port to listen on, any free port by default")
+    parser.add_argument('--deployments', type=int, default=1000, help="Number of deployments")
+    parser.add_argument('--pods-per-deployment', type=int, default=10, help="Pods of every deployment")
+    parser.add_argument('--namespaces', type=int, default=50, help="Namespaces the deployments are spread over")
+    parser.add_argument('--nodes', type=int, default=100, help="Nodes the pods are spread over")
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Latency added to every request")
+    parser.add_argument('--rollout-ms', type=float, default=50.0, help="Time the fake controller takes to scale")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    cluster = FakeCluster(args.deployments, args.pods_per_deployment, args.namespaces, args.nodes,
+                          args.latency_ms / 1000, args.rollout_ms / 1000)
+    server = serve(cluster, args.port)
+    print(f"Generated {args.deployments} deployments and {args.deployments * args.pods_per_deployment} pods "
+          f"in {time.perf_counter() - start_time:.1f}s", flush=True)
+    print(f"Listening on http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import queue
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterator, Optional, Tuple
+
+logger = logging.getLogger("sre-tool")
+
+
+def async_sdk():
+    """Import the asyncio Kubernetes SDK, which is an optional dependency
+
+    Returns:
+        module: The kubernetes_asyncio package
+
+    Raises:
+        RuntimeError: If kubernetes_asyncio is not installed
+    """
+    try:
+        import kubernetes_asyncio
+        import kubernetes_asyncio.config
+        import kubernetes_asyncio.watch
+    except ImportError as e:
+        raise RuntimeError("The async backend requires kubernetes_asyncio (pip install kubernetes_asyncio)") from e
+    return kubernetes_asyncio
+
+
+class AsyncKubernetesClient:
+    """Kubernetes API clients sharing one aiohttp session on the running event loop
+
+    Every request made through call() holds a slot of a semaphore, which
+    bounds the number of requests in flight however many deployments or
+    namespaces the managers work on at once. Watches hold a connection for
+    minutes and are opened without a slot, so long waits never starve the
+    short requests.
+    """
+
+    def __init__(self, api_client, timeout: int, request_timeout: Tuple[float, float], concurrency: int):
+        """Initialize with a configured ApiClient, see create()
+
+        Args:
+            api_client: kubernetes_asyncio ApiClient
+            timeout: API request timeout in seconds, used as the server-side
+                timeout of lists and watches
+            request_timeout: Default (connect, read) timeouts in seconds
+            concurrency: Maximum number of requests in flight
+        """
+        sdk = async_sdk()
+        self.sdk = sdk
+        self.api_client = api_client
+        self.core_api = sdk.client.CoreV1Api(api_client)
+        self.apps_api = sdk.client.AppsV1Api(api_client)
+        self.custom_api = sdk.client.CustomObjectsApi(api_client)
+        self.timeout = timeout
+        self.request_timeout = request_timeout
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+    @classmethod
+    async def create(cls, timeout: int = 30, pool_size: int = 16, connect_timeout: float = 5.0,
+                     gzip: bool = True, concurrency: int = 100,
+                     context: Optional[str] = None) -> 'AsyncKubernetesClient':
+        """Load the kubeconfig and create the clients on the running event loop
+
+        Args:
+            timeout: API request timeout in seconds
+            pool_size: Minimum number of connections kept open to the API
+                server; the pool grows to the concurrency limit
+            connect_timeout: Timeout to establish a connection in seconds
+            gzip: Ask the API server for compressed responses
+            concurrency: Maximum number of requests in flight
+            context: Optional kubeconfig context, the current one by default
+
+        Returns:
+            AsyncKubernetesClient: Client ready for use, to be closed with close()
+        """
+        sdk = async_sdk()
+        configuration = sdk.client.Configuration()
+        await sdk.config.load_kube_config(context=context, client_configuration=configuration)
+        configuration.connection_pool_maxsize = max(pool_size, concurrency)
+        api_client = sdk.client.ApiClient(configuration)
+        if not gzip:
+            # aiohttp asks for compressed responses unless told otherwise
+            api_client.set_default_header('Accept-Encoding', 'identity')
+        logger.debug(f"Async Kubernetes client initialized (concurrency {concurrency})")
+        return cls(api_client, timeout, (connect_timeout, timeout), concurrency)
+
+    async def call(self, func: Callable[..., Awaitable], *args, **kwargs) -> Any:
+        """Make one API request within the concurrency limit
+
+        Args:
+            func: Coroutine function of one of the APIs
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: Result of the request
+        """
+        async with self.semaphore:
+            return await func(*args, **kwargs)
+
+    def watch(self):
+        """Create a watch on this client's API objects"""
+        return self.sdk.watch.Watch()
+
+    async def close(self):
+        """Close the connections of the client"""
+        await self.api_client.close()
+
+    async def __aenter__(self) -> 'AsyncKubernetesClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+def iterate_async(results: AsyncIterator) -> Iterator:
+    """Stream the items of an async iterator to synchronous code
+
+    The iterator runs on a private event loop in a background thread, so the
+    synchronous renderers print every item as soon as it is produced.
+
+    Args:
+        results: Async iterator to consume
+
+    Yields:
+        Any: Items of the async iterator
+
+    Raises:
+        Exception: Whatever the async iterator raised
+    """
+    items = queue.Queue(maxsize=64)
+    done = object()
+
+    async def pump():
+        try:
+            async for item in results:
+                await asyncio.to_thread(items.put, (item, None))
+        except BaseException as e:
+            items.put((done, e))
+            return
+        items.put((done, None))
+
+    thread = threading.Thread(target=asyncio.run, args=(pump(),), daemon=True, name="sre-tool-async")
+    thread.start()
+    while True:
+        item, error = items.get()
+        if item is done:
+            thread.join()
+            if error is not None:
+                raise error
+            return
+        yield item
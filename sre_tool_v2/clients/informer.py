@@ -0,0 +1,330 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from kubernetes import watch
+from kubernetes.client.exceptions import ApiException
+
+from utils.label_selector import parse_selector, selector_matches
+
+logger = logging.getLogger("sre-tool")
+
+WATCH_TIMEOUT = 300
+RETRY_BACKOFF_MAX = 30
+
+
+class Store:
+    """Thread-safe in-memory store of one resource kind
+
+    Objects are keyed by (namespace, name) and indexed by namespace, name,
+    owner UID and "key=value" label, so the managers' usual queries are
+    dictionary lookups instead of API calls or full scans.
+    """
+
+    def __init__(self):
+        """Initialize an empty store"""
+        self.lock = threading.RLock()
+        self.objects: Dict[Tuple[str, str], Any] = {}
+        self.indexes: Dict[str, Dict[str, Set[Tuple[str, str]]]] = {
+            "namespace": defaultdict(set),
+            "name": defaultdict(set),
+            "owner": defaultdict(set),
+            "label": defaultdict(set),
+        }
+
+    def replace(self, objects: List[Any]):
+        """Replace the whole content of the store after a list
+
+        Args:
+            objects: Objects returned by the list
+        """
+        with self.lock:
+            self.objects.clear()
+            for index in self.indexes.values():
+                index.clear()
+            for obj in objects:
+                self.upsert(obj)
+
+    def upsert(self, obj: Any):
+        """Add or update an object
+
+        Args:
+            obj: Kubernetes model object
+        """
+        key = (obj.metadata.namespace, obj.metadata.name)
+        with self.lock:
+            if key in self.objects:
+                self._unindex(key, self.objects[key])
+            self.objects[key] = obj
+            for index_name, values in self._index_values(obj).items():
+                for value in values:
+                    self.indexes[index_name][value].add(key)
+
+    def delete(self, obj: Any):
+        """Remove an object
+
+        Args:
+            obj: Kubernetes model object
+        """
+        key = (obj.metadata.namespace, obj.metadata.name)
+        with self.lock:
+            existing = self.objects.pop(key, None)
+            if existing is not None:
+                self._unindex(key, existing)
+
+    def get(self, namespace: str, name: str) -> Optional[Any]:
+        """Get an object by namespace and name
+
+        Args:
+            namespace: Namespace of the object
+            name: Name of the object
+
+        Returns:
+            Optional[Any]: The object, None if it is not in the store
+        """
+        with self.lock:
+            return self.objects.get((namespace, name))
+
+    def list(self, namespace: Optional[str] = None, label_selector: Optional[str] = None) -> List[Any]:
+        """List objects sorted by namespace and name
+
+        Args:
+            namespace: Optional namespace to filter objects
+            label_selector: Optional label selector string
+
+        Returns:
+            List[Any]: Matching objects
+        """
+        requirements = parse_selector(label_selector) if label_selector else []
+        with self.lock:
+            keys = set(self.indexes["namespace"].get(namespace, ())) if namespace else set(self.objects)
+            # Narrow the candidates with the label index before checking every requirement
+            for key, operator, values in requirements:
+                if operator == "=":
+                    keys &= self.indexes["label"].get(f"{key}={next(iter(values))}", set())
+            objects = [self.objects[key] for key in sorted(keys)]
+        return [obj for obj in objects if selector_matches(requirements, obj.metadata.labels)]
+
+    def by_name(self, name: str) -> List[Any]:
+        """Get the objects with a name in every namespace
+
+        Args:
+            name: Name of the objects
+
+        Returns:
+            List[Any]: Matching objects sorted by namespace
+        """
+        return self._by_index("name", name)
+
+    def by_owner(self, owner_uid: str) -> List[Any]:
+        """Get the objects owned by an object
+
+        Args:
+            owner_uid: UID of the owner
+
+        Returns:
+            List[Any]: Owned objects sorted by namespace and name
+        """
+        return self._by_index("owner", owner_uid)
+
+    def _by_index(self, index_name: str, value: str) -> List[Any]:
+        with self.lock:
+            return [self.objects[key] for key in sorted(self.indexes[index_name].get(value, ()))]
+
+    def _unindex(self, key: Tuple[str, str], obj: Any):
+        for index_name, values in self._index_values(obj).items():
+            index = self.indexes[index_name]
+            for value in values:
+                index[value].discard(key)
+                if not index[value]:
+                    del index[value]
+
+    @staticmethod
+    def _index_values(obj: Any) -> Dict[str, List[str]]:
+        metadata = obj.metadata
+        return {
+            "namespace": [metadata.namespace],
+            "name": [metadata.name],
+            "owner": [ref.uid for ref in metadata.owner_references or []],
+            "label": [f"{key}={value}" for key, value in (metadata.labels or {}).items()],
+        }
+
+
+class Informer:
+    """Keeps a Store synchronized with the cluster using list and watch
+
+    The initial paginated list fills the store, then a background thread
+    watches from the list's resourceVersion and applies every event. Expired
+    resourceVersions (410 Gone) trigger a relist; other failures are retried
+    with exponential backoff.
+    """
+
+    def __init__(self, kind: str, list_func: Callable, timeout: int, page_size: int = 500,
+                 list_args: Tuple = (), list_kwargs: Optional[Dict[str, Any]] = None,
+                 on_change: Optional[Callable[[], None]] = None):
+        """Initialize an informer
+
+        Args:
+            kind: Resource kind, used in log messages
+            list_func: List function of the Kubernetes API, cluster-wide or
+                namespaced
+            timeout: API request timeout in seconds
+            page_size: Number of objects requested per list call
+            list_args: Positional arguments of every list and watch call,
+                such as the namespace of a namespaced list function
+            list_kwargs: Keyword arguments of every list and watch call,
+                such as a label or field selector
+            on_change: Optional callback run from the informer's threads
+                after every change applied to the store
+        """
+        self.kind = kind
+        self.list_func = list_func
+        self.timeout = timeout
+        self.page_size = page_size
+        self.list_args = list_args
+        self.list_kwargs = list_kwargs or {}
+        self.on_change = on_change
+        self.store = Store()
+        self.resource_version = None
+        self.stopped = threading.Event()
+        self.watcher = None
+        self.thread = None
+
+    def start(self):
+        """List the resources and start watching them in the background"""
+        self._relist()
+        self.thread = threading.Thread(target=self._run, name=f"informer-{self.kind}", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background watch"""
+        self.stopped.set()
+        if self.watcher:
+            self.watcher.stop()
+
+    def _relist(self):
+        """Fill the store from a paginated list and remember its resourceVersion"""
+        start_time = time.monotonic()
+        objects = []
+        continue_token = None
+        while True:
+            result = self.list_func(*self.list_args, limit=self.page_size, _continue=continue_token,
+                                    timeout_seconds=self.timeout, **self.list_kwargs)
+            objects.extend(result.items)
+            continue_token = result.metadata._continue
+            if not continue_token:
+                break
+        self.store.replace(objects)
+        self.resource_version = result.metadata.resource_version
+        if self.on_change:
+            self.on_change()
+        logger.debug(f"Informer for {self.kind} listed {len(objects)} objects in "
+                     f"{time.monotonic() - start_time:.3f}s")
+
+    def _run(self):
+        """Watch loop applying events until stopped"""
+        backoff = 1
+        while not self.stopped.is_set():
+            try:
+                if self.resource_version is None:
+                    self._relist()
+                self._watch()
+                backoff = 1
+            except ApiException as e:
+                if e.status == 410:
+                    logger.debug(f"Informer for {self.kind} resourceVersion expired, relisting")
+                    self.resource_version = None
+                    continue
+                logger.warning(f"Informer for {self.kind} watch failed: {e}")
+                self.stopped.wait(backoff)
+                backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+            except Exception as e:
+                logger.warning(f"Informer for {self.kind} watch failed: {e}")
+                self.stopped.wait(backoff)
+                backoff = min(backoff * 2, RETRY_BACKOFF_MAX)
+
+    def _watch(self):
+        """Apply the events of one watch request"""
+        self.watcher = watch.Watch()
+        for event in self.watcher.stream(self.list_func,
+                                         *self.list_args,
+                                         resource_version=self.resource_version,
+                                         allow_watch_bookmarks=True,
+                                         timeout_seconds=WATCH_TIMEOUT,
+                                         **self.list_kwargs):
+            if event['type'] == 'BOOKMARK':
+                self.resource_version = event['raw_object']['metadata']['resourceVersion']
+                continue
+            obj = event['object']
+            if event['type'] == 'DELETED':
+                self.store.delete(obj)
+            else:
+                self.store.upsert(obj)
+            self.resource_version = obj.metadata.resource_version
+            if self.on_change:
+                self.on_change()
+
+
+class InformerCache:
+    """Informers for deployments, ReplicaSets and pods shared by the managers
+
+    Every informer is started on first access and then kept up to date in the
+    background, so repeated queries in long-running modes cost no API calls.
+    """
+
+    def __init__(self, k8s_client):
+        """Initialize the cache for a Kubernetes client
+
+        Args:
+            k8s_client: Kubernetes client instance
+        """
+        self.lock = threading.Lock()
+        self.informers: Dict[str, Informer] = {}
+        self.list_funcs = {
+            "deployments": k8s_client.apps_api.list_deployment_for_all_namespaces,
+            "replicasets": k8s_client.apps_api.list_replica_set_for_all_namespaces,
+            "pods": k8s_client.core_api.list_pod_for_all_namespaces,
+        }
+        self.timeout = k8s_client.timeout
+
+    @property
+    def deployments(self) -> Store:
+        return self.store("deployments")
+
+    @property
+    def replica_sets(self) -> Store:
+        return self.store("replicasets")
+
+    @property
+    def pods(self) -> Store:
+        return self.store("pods")
+
+    def store(self, kind: str) -> Store:
+        """Get the synchronized store of a kind, starting its informer if needed
+
+        Args:
+            kind: One of "deployments", "replicasets" or "pods"
+
+        Returns:
+            Store: Store of the kind
+        """
+        with self.lock:
+            informer = self.informers.get(kind)
+            if informer is None:
+                informer = Informer(kind, self.list_funcs[kind], self.timeout)
+                informer.start()
+                self.informers[kind] = informer
+        return informer.store
+
+    def start(self):
+        """Start every informer up front"""
+        for kind in self.list_funcs:
+            self.store(kind)
+
+    def stop(self):
+        """Stop every informer"""
+        with self.lock:
+            for informer in self.informers.values():
+                informer.stop()
@@ -1,37 +1,142 @@
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
 from kubernetes import client, config
 from kubernetes.client.exceptions import ApiException
 
+from utils.cache import cache_path
+
 logger = logging.getLogger("sre-tool")
 
+# Serializes updates of the connection check cache shared by every cluster
+CHECK_CACHE_LOCK = threading.Lock()
+
+class TunedApiClient(client.ApiClient):
+    """ApiClient applying default timeouts and compression to every request"""
+
+    def __init__(self, configuration, request_timeout: Tuple[float, float], gzip: bool = True):
+        """Initialize the client
+
+        Args:
+            configuration: Client configuration loaded from the kubeconfig
+            request_timeout: Default (connect, read) timeouts in seconds
+            gzip: Ask the API server for compressed responses
+        """
+        super().__init__(configuration)
+        self.request_timeout = request_timeout
+        self.gzip = gzip
+
+    def request(self, method, url, query_params=None, headers=None, post_params=None, body=None,
+                _preload_content=True, _request_timeout=None):
+        """Fill in the default timeouts and encoding, then make the request
+
+        Watches and followed logs stay open for as long as the server-side
+        timeout allows and may be quiet for a long time, so they only get a
+        connect timeout. Watch streams are read without content decoding by
+        the SDK and are therefore never compressed.
+        """
+        query = dict(query_params or [])
+        streaming = query.get('watch') or query.get('follow')
+        if _request_timeout is None:
+            _request_timeout = (self.request_timeout[0], None) if streaming else self.request_timeout
+        headers = dict(headers or {})
+        headers.setdefault('Accept-Encoding', 'identity' if query.get('watch') or not self.gzip else 'gzip')
+        return super().request(method, url, query_params, headers, post_params, body,
+                               _preload_content, _request_timeout)
+
+
 class KubernetesClient:
-    """Centralized class for Kubernetes API clients"""
+    """Centralized class for Kubernetes API clients
+    
+    Every API group shares one ApiClient, hence one urllib3 connection pool
+    to the API server, with the same timeouts and compression settings.
+    """
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, pool_size: int = 16,
+                 connect_timeout: float = 5.0, gzip: bool = True, context: Optional[str] = None):
         """Initialize Kubernetes API clients
         
         Args:
-            timeout: API request timeout in seconds
+            timeout: API request timeout in seconds, used as the server-side
+                timeout of lists and watches and as the client read timeout
+            pool_size: Maximum number of connections kept open to the API
+                server, enough for the scale and sweep workers by default
+            connect_timeout: Timeout to establish a connection in seconds
+            gzip: Ask the API server for compressed responses
+            context: Optional kubeconfig context, the current one by default
         """
         try:
-            config.load_kube_config()
-            self.core_api = client.CoreV1Api()
-            self.apps_api = client.AppsV1Api()
+            configuration = client.Configuration()
+            config.load_kube_config(context=context, client_configuration=configuration)
+            configuration.connection_pool_maxsize = pool_size
+            if context is None:
+                client.Configuration.set_default(configuration)
+            self.context = context
             self.timeout = timeout
-            logger.debug("Kubernetes client initialized successfully")
+            self.request_timeout = (connect_timeout, timeout)
+            self.api_client = TunedApiClient(configuration, self.request_timeout, gzip)
+            self.core_api = client.CoreV1Api(self.api_client)
+            self.apps_api = client.AppsV1Api(self.api_client)
+            self.custom_api = client.CustomObjectsApi(self.api_client)
+            logger.debug(f"Kubernetes client initialized successfully (pool size {pool_size}, "
+                         f"timeouts {self.request_timeout}, gzip {'on' if gzip else 'off'})")
         except config.ConfigException as e:
             logger.error(f"Failed to load kubeconfig: {e}")
             raise
 
-    def check_connection(self) -> bool:
+    def connection_stats(self) -> Dict[str, int]:
+        """Count the requests and connections of the shared connection pool
+        
+        Returns:
+            Dict[str, int]: Number of requests, of connections opened and of
+                requests served on an already open connection
+        """
+        pools = self.api_client.rest_client.pool_manager.pools
+        stats = {'requests': 0, 'connections': 0}
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is not None:
+                stats['requests'] += pool.num_requests
+                stats['connections'] += pool.num_connections
+        stats['reused'] = max(0, stats['requests'] - stats['connections'])
+        return stats
+
+    def log_connection_stats(self):
+        """Log connection reuse of the shared pool at debug level"""
+        if logger.isEnabledFor(logging.DEBUG):
+            stats = self.connection_stats()
+            logger.debug(f"API connections: {stats['requests']} requests over {stats['connections']} "
+                         f"connections ({stats['reused']} reused)")
+
+    def check_connection(self, cache_ttl: int = 60) -> bool:
         """Verify connection to Kubernetes cluster
         
+        The check calls the lightweight /version endpoint. A successful check
+        is cached locally per cluster and reused for cache_ttl seconds.
+        
+        Args:
+            cache_ttl: Seconds a cached successful check stays valid, 0 to disable
+        
         Returns:
             bool: True if connection is successful, False otherwise
         """
+        host = self.api_client.configuration.host
+        checks = self._read_connection_checks()
+        if cache_ttl and time.time() - checks.get(host, 0) < cache_ttl:
+            logger.debug("Kubernetes cluster is reachable (cached check)")
+            return True
+        
         try:
-            self.core_api.list_namespace(timeout_seconds=self.timeout)
-            logger.info("Kubernetes cluster is reachable")
+            version = client.VersionApi(self.api_client).get_code(
+                _request_timeout=self.request_timeout
+            )
+            logger.info(f"Kubernetes cluster is reachable (version {version.git_version})")
+            self._cache_connection_check(host)
             return True
         except config.ConfigException as e:
             logger.error(f"Kubernetes configuration error: {e}")
@@ -43,4 +148,46 @@ class KubernetesClient:
             return False
         except Exception as e:
             logger.error(f"Unexpected error occurred: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+    @staticmethod
+    def _read_connection_checks() -> Dict[str, float]:
+        """Read the time of the last successful check of every cluster"""
+        try:
+            with open(cache_path("connection_check.json")) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @classmethod
+    def _cache_connection_check(cls, host: str):
+        """Record a successful check atomically
+
+        The clusters of a multi-cluster command are checked concurrently, so
+        the read-modify-write of the shared file is serialized and the file
+        is replaced in one step, never leaving a partial file for readers.
+        """
+        cache_file = cache_path("connection_check.json")
+        directory = os.path.dirname(cache_file)
+        with CHECK_CACHE_LOCK:
+            checks = cls._read_connection_checks()
+            checks[host] = time.time()
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".connection_check.")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(checks, f)
+                os.replace(tmp_path, cache_file)
+            except OSError as e:
+                logger.debug(f"Unable to cache connection check: {e}")
+
+
+def list_contexts() -> List[str]:
+    """List the context names of the kubeconfig
+
+    Returns:
+        List[str]: Names of every context, in kubeconfig order
+    """
+    contexts, _ = config.list_kube_config_contexts()
+    return [context['name'] for context in contexts]
@@ -0,0 +1,304 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from kubernetes.client.exceptions import ApiException
+from kubernetes.watch.watch import iter_resp_lines
+
+from utils.cache import cache_path
+
+logger = logging.getLogger("sre-tool")
+
+DEPLOYMENTS_PATH = '/apis/apps/v1/deployments'
+# Ask the API server for metadata only; plain JSON is the fallback for servers
+# that do not support the partial object metadata transformation
+METADATA_LIST_ACCEPT = 'application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json'
+METADATA_WATCH_ACCEPT = 'application/json;as=PartialObjectMetadata;g=meta.k8s.io;v=v1,application/json'
+# Serializes saves of the index file shared by every cluster
+SAVE_LOCK = threading.Lock()
+
+
+class NamespaceIndex:
+    """Persistent deployment name to namespace index
+
+    The index is stored on local disk per cluster together with the
+    resourceVersion it was last synchronized at. Entries expire after a TTL,
+    unknown names are resolved with a field-selected list and refreshes are
+    applied incrementally with a watch from the stored resourceVersion. A
+    refresh only renews the entries once the watch has caught up with the
+    cluster; otherwise they keep ageing towards the TTL.
+    """
+
+    def __init__(self, k8s_client, path: Optional[str] = None, ttl: int = 600,
+                 refresh: bool = False):
+        """Initialize the index for the cluster of a Kubernetes client
+
+        Args:
+            k8s_client: Kubernetes client instance
+            path: Optional path of the index file
+            ttl: Seconds after which an unconfirmed entry is evicted
+            refresh: Refresh the index from the cluster before the first lookup
+        """
+        self.api_client = k8s_client.api_client
+        self.timeout = k8s_client.timeout
+        self.request_timeout = k8s_client.request_timeout
+        self.cluster = self.api_client.configuration.host
+        self.path = path or cache_path("namespace_index.json")
+        self.ttl = ttl
+        self.refresh_pending = refresh
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.resource_version = None
+        self.deployments: Dict[str, Dict[str, float]] = {}
+
+    def lookup(self, deployment_name: str, stale_namespace: Optional[str] = None) -> Optional[str]:
+        """Find the namespace of a deployment
+
+        Args:
+            deployment_name: Name of the deployment
+            stale_namespace: Optional namespace returned by an earlier lookup
+                where the deployment turned out not to exist; the index is
+                then bypassed and the name is queried from the cluster
+
+        Returns:
+            Optional[str]: Namespace of the deployment, None if it does not exist
+        """
+        with self.lock:
+            self._load()
+            if self.refresh_pending:
+                self.refresh_pending = False
+                self._refresh()
+            namespaces = [] if stale_namespace else self._fresh_namespaces(deployment_name)
+
+        if namespaces:
+            logger.debug(f"Namespace index hit for deployment {deployment_name}")
+            return namespaces[0]
+
+        logger.debug(f"Namespace index miss for deployment {deployment_name}, querying the cluster")
+        items, _, _ = self._list(field_selector=f"metadata.name={deployment_name}")
+        now = time.time()
+        with self.lock:
+            self.deployments.pop(deployment_name, None)
+            for item in items:
+                self._add(item['metadata'], now)
+            namespaces = self._fresh_namespaces(deployment_name)
+            self._save()
+        return namespaces[0] if namespaces else None
+
+    def refresh(self):
+        """Synchronize the index with the cluster and persist it"""
+        with self.lock:
+            self._load()
+            self.refresh_pending = False
+            self._refresh()
+
+    def _refresh(self):
+        """Synchronize the index, incrementally when a resourceVersion is known"""
+        if not self.resource_version or not self._watch_changes():
+            self._rebuild()
+        self._save()
+
+    def _rebuild(self):
+        """Rebuild the index from a full paginated metadata-only list"""
+        start_time = time.monotonic()
+        deployments = self.deployments
+        self.deployments = {}
+        now = time.time()
+        continue_token = None
+        try:
+            while True:
+                items, continue_token, resource_version = self._list(
+                    limit=500,
+                    continue_token=continue_token
+                )
+                for item in items:
+                    self._add(item['metadata'], now)
+                if not continue_token:
+                    break
+        except Exception:
+            self.deployments = deployments
+            raise
+        self.resource_version = resource_version
+        logger.info(f"Namespace index rebuilt with {len(self.deployments)} deployment names "
+                    f"in {time.monotonic() - start_time:.2f}s")
+
+    def _watch_changes(self) -> bool:
+        """Apply changes since the stored resourceVersion with a short watch
+
+        The watch may time out before it delivered every change up to the
+        current state of the cluster. Entries are only confirmed once the
+        watch caught up: the stored resourceVersion is the one of a list
+        made just before the watch, or the server sent a bookmark, which it
+        only does once every earlier event was delivered. resourceVersions
+        are opaque, so they are only compared for equality.
+
+        Returns:
+            bool: False if the resourceVersion expired and a rebuild is needed
+        """
+        _, _, current_version = self._list(limit=1)
+        query_params = [
+            ('watch', True),
+            ('resourceVersion', self.resource_version),
+            ('allowWatchBookmarks', True),
+            ('timeoutSeconds', 1),
+        ]
+        try:
+            response = self._call(query_params, METADATA_WATCH_ACCEPT)
+        except ApiException as e:
+            if e.status != 410:
+                raise
+            logger.debug("Namespace index resourceVersion expired")
+            return False
+        now = time.time()
+        changes = 0
+        caught_up = current_version is not None and self.resource_version == current_version
+        try:
+            for line in iter_resp_lines(response):
+                event = json.loads(line)
+                metadata = event['object'].get('metadata', {})
+                if event['type'] == 'ERROR':
+                    logger.debug(f"Namespace index resourceVersion expired: {event['object'].get('message')}")
+                    return False
+                if metadata.get('resourceVersion'):
+                    self.resource_version = metadata['resourceVersion']
+                if event['type'] == 'DELETED':
+                    self._remove(metadata)
+                    changes += 1
+                elif event['type'] in ('ADDED', 'MODIFIED'):
+                    self._add(metadata, now)
+                    changes += 1
+                if event['type'] == 'BOOKMARK' or self.resource_version == current_version:
+                    caught_up = True
+                    break
+        finally:
+            response.close()
+            response.release_conn()
+
+        if not caught_up:
+            logger.info(f"Namespace index applied {changes} events but did not catch up with the cluster")
+            return True
+        # Every change up to the current state was applied: the remaining entries still exist
+        for namespaces in self.deployments.values():
+            for namespace in namespaces:
+                namespaces[namespace] = now
+        logger.info(f"Namespace index refreshed incrementally with {changes} events")
+        return True
+
+    def _list(self, field_selector: Optional[str] = None, limit: Optional[int] = None,
+              continue_token: Optional[str] = None) -> Tuple[List[dict], Optional[str], Optional[str]]:
+        """List deployment metadata across all namespaces
+
+        Args:
+            field_selector: Optional field selector
+            limit: Optional page size
+            continue_token: Optional continue token of the previous page
+
+        Returns:
+            Tuple: Items, continue token and resourceVersion of the list
+        """
+        query_params = [('timeoutSeconds', self.timeout)]
+        if field_selector:
+            query_params.append(('fieldSelector', field_selector))
+        if limit:
+            query_params.append(('limit', limit))
+        if continue_token:
+            query_params.append(('continue', continue_token))
+
+        response = self._call(query_params, METADATA_LIST_ACCEPT)
+        data = json.loads(response.data)
+        metadata = data.get('metadata') or {}
+        return data.get('items') or [], metadata.get('continue'), metadata.get('resourceVersion')
+
+    def _call(self, query_params: list, accept: str):
+        """Issue a raw request against the deployments collection
+
+        The response is not deserialized into models, which keeps large
+        lists cheap in both time and memory.
+
+        Args:
+            query_params: Query parameters of the request
+            accept: Accept header value
+
+        Returns:
+            urllib3.HTTPResponse: Unread HTTP response
+        """
+        return self.api_client.call_api(
+            DEPLOYMENTS_PATH, 'GET',
+            query_params=query_params,
+            header_params={'Accept': accept},
+            auth_settings=['BearerToken'],
+            _return_http_data_only=True,
+            _preload_content=False,
+            _request_timeout=self.request_timeout
+        )
+
+    def _fresh_namespaces(self, deployment_name: str) -> List[str]:
+        """Return the unexpired namespaces of a deployment name in sorted order"""
+        cutoff = time.time() - self.ttl
+        namespaces = self.deployments.get(deployment_name, {})
+        return sorted(namespace for namespace, seen in namespaces.items() if seen >= cutoff)
+
+    def _add(self, metadata: dict, seen: float):
+        """Record a deployment from its metadata"""
+        self.deployments.setdefault(metadata['name'], {})[metadata['namespace']] = seen
+
+    def _remove(self, metadata: dict):
+        """Forget a deployment from its metadata"""
+        namespaces = self.deployments.get(metadata.get('name'), {})
+        namespaces.pop(metadata.get('namespace'), None)
+        if not namespaces:
+            self.deployments.pop(metadata.get('name'), None)
+
+    def _load(self):
+        """Load the index of the current cluster from disk, evicting expired entries"""
+        if self.loaded:
+            return
+        self.loaded = True
+        try:
+            with open(self.path) as f:
+                cluster_index = json.load(f).get(self.cluster, {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable namespace index {self.path}: {e}")
+            return
+
+        cutoff = time.time() - self.ttl
+        for name, namespaces in cluster_index.get('deployments', {}).items():
+            fresh = {namespace: seen for namespace, seen in namespaces.items() if seen >= cutoff}
+            if fresh:
+                self.deployments[name] = fresh
+        self.resource_version = cluster_index.get('resource_version')
+        logger.debug(f"Loaded namespace index with {len(self.deployments)} deployment names")
+
+    def _save(self):
+        """Persist the index of the current cluster atomically
+        
+        Indexes of several clusters may be saved concurrently by the threads
+        of a multi-cluster command, so the read-modify-write of the shared
+        file is serialized.
+        """
+        with SAVE_LOCK:
+            try:
+                with open(self.path) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+            data[self.cluster] = {
+                'resource_version': self.resource_version,
+                'deployments': self.deployments,
+            }
+
+            directory = os.path.dirname(self.path)
+            try:
+                os.makedirs(directory, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".namespace_index.")
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                logger.warning(f"Unable to save namespace index {self.path}: {e}")
@@ -0,0 +1,649 @@
+import argparse
+import inspect
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from functools import cached_property
+from types import SimpleNamespace
+from typing import Callable, Iterator, List, Optional
+
+from utils.timings import StageTimings
+
+logger = logging.getLogger("sre-tool")
+
+# HTTP client defaults; the pool is large enough for the scale and sweep workers to share it
+DEFAULT_POOL_SIZE = 16
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_REQUEST_TIMEOUT = 30
+DEFAULT_ASYNC_CONCURRENCY = 100
+DEFAULT_INDEX_TTL = 600
+# Managers a Session builds on first use
+SESSION_MANAGERS = ('deployment_manager', 'pod_manager', 'diagnostics_manager', 'sweep_manager',
+                    'utilization_manager')
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser shared by the CLI, the shell and the server
+
+    Returns:
+        argparse.ArgumentParser: Parser for every command
+    """
+    parser = argparse.ArgumentParser(
+        prog='sre_tool',
+        description="A simple CLI tool that helps manage Kubernetes resources without direct kubectl usage"
+    )
+    subparser = parser.add_subparsers(dest="command", help="Available commands")
+
+    # Options tuning the HTTP client, shared by every command that builds a session
+    client_parser = argparse.ArgumentParser(add_help=False)
+    client_parser.add_argument('--pool-size', type=int, default=DEFAULT_POOL_SIZE,
+                               help=f'Connections kept open to the API server (default: {DEFAULT_POOL_SIZE})')
+    client_parser.add_argument('--connect-timeout', type=float, default=DEFAULT_CONNECT_TIMEOUT,
+                               help=f'Seconds to establish a connection (default: {DEFAULT_CONNECT_TIMEOUT:g})')
+    client_parser.add_argument('--request-timeout', type=int, default=DEFAULT_REQUEST_TIMEOUT,
+                               help=f'Seconds to wait for a response (default: {DEFAULT_REQUEST_TIMEOUT})')
+    client_parser.add_argument('--no-gzip', action='store_true',
+                               help='Do not ask the API server for compressed responses')
+
+    # Options shared by every command that talks to the cluster
+    connection_parser = argparse.ArgumentParser(add_help=False, parents=[client_parser])
+    connection_parser.add_argument('--skip-check', action='store_true',
+                                   help='Skip the cluster connection check before running')
+
+    # Output format shared by every command that reports results
+    output_parser = argparse.ArgumentParser(add_help=False)
+    output_parser.add_argument('--output', '-o', choices=['table', 'json', 'jsonl', 'yaml'], default='table',
+                               help='Output format; jsonl streams one record per line (default: table)')
+
+    # Options of the commands that can run on the asyncio backend
+    backend_parser = argparse.ArgumentParser(add_help=False)
+    backend_parser.add_argument('--backend', choices=['sync', 'async'], default='sync',
+                                help='Run on threads (sync) or on one event loop with kubernetes_asyncio (async)')
+    backend_parser.add_argument('--concurrency', type=int, default=DEFAULT_ASYNC_CONCURRENCY,
+                                help=f'Maximum API requests in flight with --backend async '
+                                     f'(default: {DEFAULT_ASYNC_CONCURRENCY})')
+
+    # Options of the read-only commands that can run across several clusters
+    contexts_parser = argparse.ArgumentParser(add_help=False)
+    contexts_target = contexts_parser.add_mutually_exclusive_group()
+    contexts_target.add_argument('--contexts', type=str,
+                                 help='Run on these comma-separated kubeconfig contexts concurrently')
+    contexts_target.add_argument('--all-contexts', action='store_true',
+                                 help='Run on every kubeconfig context concurrently')
+    contexts_parser.add_argument('--cluster-timeout', type=int, default=60,
+                                 help='Seconds to wait for each cluster with --contexts/--all-contexts (default: 60)')
+
+    # Options shared by commands that locate a deployment when --namespace is omitted
+    index_parser = argparse.ArgumentParser(add_help=False)
+    index_parser.add_argument('--refresh-index', action='store_true',
+                              help='Refresh the local deployment namespace index before running (sync backend)')
+    index_parser.add_argument('--index-ttl', type=int,
+                              help=f'Seconds a namespace index entry stays valid '
+                                   f'(default: {DEFAULT_INDEX_TTL}, sync backend)')
+
+    # List command
+    list_parser = subparser.add_parser("list", help="List deployments in a cluster",
+                                        parents=[connection_parser, output_parser, contexts_parser])
+    list_parser.add_argument("--namespace", help="Optional namespace to filter results")
+    list_parser.add_argument("--page-size", type=int, default=500,
+                             help="Number of deployments fetched per API call (default: 500)")
+
+    # Scale command
+    scale_parser = subparser.add_parser("scale", help="Scale deployments in a cluster",
+                                         parents=[connection_parser, index_parser, output_parser, backend_parser])
+    scale_parser.add_argument('--replicas', required=True, type=int, help="Number of replicas to scale to")
+    scale_target = scale_parser.add_mutually_exclusive_group(required=True)
+    scale_target.add_argument('--deployment', type=str, help='Name of deployment to scale')
+    scale_target.add_argument('--selector', type=str, help='Scale every deployment matching this label selector')
+    scale_target.add_argument('--from-file', type=str,
+                              help='Scale every deployment listed in this file, one "namespace/name" or "name" per line')
+    scale_parser.add_argument('--namespace', type=str, help='Scale the deployment in the specified namespace')
+    scale_parser.add_argument('--wait-mode', choices=['watch', 'poll'], default='watch',
+                              help='Wait for completion with a watch on the deployment or by polling with adaptive backoff')
+    scale_parser.add_argument('--workers', type=int, default=10,
+                              help='Maximum number of deployments scaled concurrently with --selector/--from-file '
+                                   '(sync backend)')
+
+    # Info command
+    info_parser = subparser.add_parser("info", help="Shows information regarding a deployment in the cluster",
+                                        parents=[connection_parser, index_parser, output_parser, contexts_parser])
+    info_parser.add_argument('--deployment', required=True, type=str, help="Name of deployment")
+    info_parser.add_argument('--namespace', type=str,
+                             help='Namespace of the deployment, located in the cluster when omitted')
+
+    # Diagnostic command
+    diag_parser = subparser.add_parser("diagnostic", help="Show diagnose of a deployment and its resources (rs, pods)",
+                                        parents=[connection_parser, index_parser, output_parser, backend_parser,
+                                                 contexts_parser])
+    diag_parser.add_argument('--deployment', required=True, type=str, help="Name of deployment")
+    diag_parser.add_argument('--namespace', type=str, help='Namespace of the deployment')
+    diag_parser.add_argument('--pod', type=str, help='Name of a pod to include pod-level diagnostics')
+    diag_parser.add_argument('--no-metrics', action='store_true', help='Skip fetching usage from metrics.k8s.io')
+    diag_parser.add_argument('--node-metrics', action='store_true',
+                             help='Include usage of the nodes hosting the pods')
+    diag_parser.add_argument('--no-events', action='store_true',
+                             help='Skip the warning events of the deployment, its ReplicaSets and its pods')
+    diag_parser.add_argument('--timings', action='store_true', help='Report the latency of every diagnostic stage')
+    diag_parser.add_argument('--watch', action='store_true',
+                             help='Keep watching the deployment and print the pods that change (sync backend)')
+    diag_parser.add_argument('--metrics-interval', type=float, default=30,
+                             help='Seconds between metrics refreshes with --watch (default: 30)')
+    diag_parser.add_argument('--watch-timeout', type=int,
+                             help='Stop watching after this many seconds (default: until interrupted)')
+
+    # Logs command
+    logs_parser = subparser.add_parser("logs", help="Scan the logs of every pod of a deployment for a pattern",
+                                        parents=[connection_parser, index_parser, output_parser])
+    logs_parser.add_argument('--deployment', required=True, type=str, help='Name of the deployment')
+    logs_parser.add_argument('--namespace', type=str, help='Namespace of the deployment')
+    logs_parser.add_argument('--pattern', '-e', required=True, action='append',
+                             help='Regular expression to match; repeat to match any of several patterns')
+    logs_parser.add_argument('--fixed-strings', '-F', action='store_true',
+                             help='Match the patterns as plain substrings')
+    logs_parser.add_argument('--ignore-case', '-i', action='store_true', help='Match regardless of case')
+    logs_parser.add_argument('--context', '-C', type=int, default=2,
+                             help='Lines shown before and after every match (default: 2)')
+    logs_parser.add_argument('--no-previous', action='store_true',
+                             help='Skip the logs of the previous instance of restarted containers')
+    logs_parser.add_argument('--since', type=int, help='Only scan logs newer than this many seconds')
+    logs_parser.add_argument('--tail', type=int, help='Only scan this many lines at the end of every log')
+    logs_parser.add_argument('--workers', type=int, default=16,
+                             help='Maximum number of logs streamed concurrently (default: 16)')
+
+    # Rollout status command
+    rollout_parser = subparser.add_parser("rollout-status", help="Follow a deployment rollout until it completes",
+                                           parents=[connection_parser, index_parser, output_parser])
+    rollout_parser.add_argument('--deployment', type=str, required=True, help='Name of the deployment to follow')
+    rollout_parser.add_argument('--namespace', type=str, help='Namespace of the deployment')
+    rollout_parser.add_argument('--timeout', type=int, default=600,
+                                help='Maximum time to wait for the rollout in seconds (default: 600)')
+    rollout_parser.add_argument('--wait-mode', choices=['watch', 'poll'], default='watch',
+                                help='Follow the deployment with a watch, or by polling with adaptive backoff '
+                                     '(default: watch)')
+
+    # Sweep command
+    sweep_parser = subparser.add_parser("sweep", help="Report every unhealthy deployment of the cluster",
+                                         parents=[connection_parser, output_parser])
+    sweep_parser.add_argument('--namespace', type=str, help='Restrict the sweep to one namespace')
+    sweep_parser.add_argument('--workers', type=int, default=8,
+                              help='Maximum number of namespaces swept concurrently (default: 8)')
+    sweep_parser.add_argument('--page-size', type=int, default=500,
+                              help='Number of objects fetched per API call (default: 500)')
+
+    # Utilization command
+    util_parser = subparser.add_parser("utilization",
+                                       help="Report requests, limits and usage per deployment, namespace and node",
+                                       parents=[connection_parser, output_parser])
+    util_parser.add_argument('--namespace', type=str, help='Restrict the report to one namespace')
+    util_parser.add_argument('--page-size', type=int, default=500,
+                             help='Number of objects fetched per API call (default: 500)')
+    util_parser.add_argument('--low', type=float, default=20.0,
+                             help='Report deployments using less than this percentage of their requests '
+                                  'as over-provisioned (default: 20)')
+    util_parser.add_argument('--high', type=float, default=100.0,
+                             help='Report deployments using more than this percentage of their requests '
+                                  'as under-provisioned (default: 100)')
+
+    # Options of the long-running modes
+    session_parser = argparse.ArgumentParser(add_help=False, parents=[client_parser])
+    session_parser.add_argument('--no-informers', action='store_true',
+                                help='Read the cluster with API calls instead of watching every deployment, '
+                                     'ReplicaSet and pod of the cluster in memory')
+
+    # Shell command
+    subparser.add_parser("shell", help="Start an interactive shell that reuses one cluster connection",
+                         parents=[session_parser])
+
+    # Serve command
+    serve_parser = subparser.add_parser("serve", help="Serve commands from thin clients over a Unix socket",
+                                        parents=[session_parser])
+    serve_parser.add_argument('--socket', type=str, help='Path of the Unix socket (default: in the cache directory)')
+
+    # Debug command
+    debug_parser = subparser.add_parser("debug", help="Set log level for debugging")
+    debug_parser.add_argument('--level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                             default='INFO', help='Set logging level')
+
+    return parser
+
+
+class Session:
+    """Kubernetes client and managers shared by the commands of one process
+
+    The Kubernetes SDK and every manager are imported on first use, so
+    commands that never reach the cluster (--help, debug) start without
+    paying for them.
+    """
+
+    def __init__(self, timeout: int = DEFAULT_REQUEST_TIMEOUT, use_informers: bool = False,
+                 pool_size: int = DEFAULT_POOL_SIZE, connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 gzip: bool = True, concurrency: int = DEFAULT_ASYNC_CONCURRENCY,
+                 context: Optional[str] = None):
+        """Initialize the session
+
+        Args:
+            timeout: API request timeout in seconds
+            use_informers: Serve reads from watched in-memory stores, which
+                pays off when the session runs many commands
+            pool_size: Connections kept open to the API server
+            connect_timeout: Timeout to establish a connection in seconds
+            gzip: Ask the API server for compressed responses
+            concurrency: Maximum API requests in flight on the async backend
+            context: Optional kubeconfig context, the current one by default
+        """
+        self.timeout = timeout
+        self.use_informers = use_informers
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.gzip = gzip
+        self.concurrency = concurrency
+        self.context = context
+        self.index_ttl = DEFAULT_INDEX_TTL
+        self.refresh_index = False
+        self.context_sessions = {}
+        self.context_lock = threading.Lock()
+
+    @classmethod
+    def from_args(cls, args: argparse.Namespace, use_informers: bool = False) -> 'Session':
+        """Create a session with the client options of the command line"""
+        return cls(
+            timeout=getattr(args, 'request_timeout', DEFAULT_REQUEST_TIMEOUT),
+            use_informers=use_informers,
+            pool_size=getattr(args, 'pool_size', DEFAULT_POOL_SIZE),
+            connect_timeout=getattr(args, 'connect_timeout', DEFAULT_CONNECT_TIMEOUT),
+            gzip=not getattr(args, 'no_gzip', False),
+            concurrency=getattr(args, 'concurrency', DEFAULT_ASYNC_CONCURRENCY)
+        )
+
+    @cached_property
+    def k8s_client(self):
+        from clients.kubernetes_client import KubernetesClient
+
+        return KubernetesClient(timeout=self.timeout, pool_size=self.pool_size,
+                                connect_timeout=self.connect_timeout, gzip=self.gzip, context=self.context)
+
+    @cached_property
+    def namespace_index(self):
+        from clients.namespace_index import NamespaceIndex
+
+        refresh, self.refresh_index = self.refresh_index, False
+        return NamespaceIndex(self.k8s_client, ttl=self.index_ttl, refresh=refresh)
+
+    def configure_index(self, ttl: Optional[int], refresh: bool):
+        """Apply the namespace index options of a command
+
+        The index is only loaded when a command looks a deployment up, so
+        the options are kept until then, or applied to an index that an
+        earlier command of a long-running session already loaded.
+
+        Args:
+            ttl: Seconds an index entry stays valid, the default when None
+            refresh: Refresh the index before its next lookup
+        """
+        self.index_ttl = DEFAULT_INDEX_TTL if ttl is None else ttl
+        self.refresh_index = self.refresh_index or refresh
+        index = vars(self).get('namespace_index')
+        if index is not None:
+            index.ttl = self.index_ttl
+            index.refresh_pending = index.refresh_pending or self.refresh_index
+            self.refresh_index = False
+
+    @cached_property
+    def informers(self):
+        if not self.use_informers:
+            return None
+        from clients.informer import InformerCache
+
+        return InformerCache(self.k8s_client)
+
+    def start_informers(self) -> bool:
+        """Start the informers of the session, if it uses them
+
+        Informers list and watch the whole cluster, so when RBAC only grants
+        access to some namespaces the session falls back to API calls.
+
+        Returns:
+            bool: True if the managers read from the informers
+        """
+        if self.informers is None:
+            return False
+        from kubernetes.client.exceptions import ApiException
+
+        try:
+            self.informers.start()
+        except ApiException as e:
+            if e.status != 403:
+                raise
+            logger.warning(f"Cannot watch the cluster, reading it with API calls instead: {e.reason}")
+            self.informers.stop()
+            self.use_informers = False
+            self.informers = None
+            # Managers built before the fallback would keep reading the stopped informers
+            for manager in SESSION_MANAGERS:
+                vars(self).pop(manager, None)
+            return False
+        return True
+
+    @cached_property
+    def deployment_manager(self):
+        from managers.deployment_manager import DeploymentManager
+
+        return DeploymentManager(self.k8s_client, self.namespace_index, self.informers)
+
+    @cached_property
+    def pod_manager(self):
+        from managers.pod_manager import PodManager
+
+        return PodManager(self.k8s_client, self.informers)
+
+    @cached_property
+    def diagnostics_manager(self):
+        from managers.diagnostics_manager import DiagnosticsManager
+
+        return DiagnosticsManager(self.k8s_client, self.deployment_manager, self.pod_manager)
+
+    @cached_property
+    def sweep_manager(self):
+        from managers.sweep_manager import SweepManager
+
+        return SweepManager(self.k8s_client, self.informers)
+
+    @cached_property
+    def utilization_manager(self):
+        from managers.utilization_manager import UtilizationManager
+
+        return UtilizationManager(self.k8s_client, self.informers)
+
+    def warm_up(self):
+        """Build every manager up front
+
+        Cached properties are not thread-safe, so a session shared by
+        concurrent command handlers builds its managers before serving.
+        """
+        for manager in SESSION_MANAGERS:
+            getattr(self, manager)
+
+    def for_context(self, context: str) -> 'Session':
+        """Get the session of another kubeconfig context
+
+        Sessions are kept per context, so the shell and the server reuse
+        the connections of every cluster across commands.
+
+        Args:
+            context: Name of the kubeconfig context
+
+        Returns:
+            Session: Session with the same client options on that context
+        """
+        with self.context_lock:
+            if context not in self.context_sessions:
+                self.context_sessions[context] = Session(self.timeout, False, self.pool_size, self.connect_timeout,
+                                                         self.gzip, self.concurrency, context)
+            return self.context_sessions[context]
+
+    def run_async(self, operation: Callable) -> Iterator:
+        """Run an operation of the async managers on a private event loop
+
+        The async client and managers live for the duration of the
+        operation. The sync commands stay a thin wrapper: the results are
+        streamed back to the calling thread as they are produced.
+
+        Args:
+            operation: Called with the async managers (deployment_manager,
+                pod_manager and diagnostics_manager attributes); returns a
+                coroutine or an async generator
+
+        Yields:
+            Result: The result of the coroutine, or every item of the async
+                generator
+        """
+        from clients.async_kubernetes_client import AsyncKubernetesClient, async_sdk, iterate_async
+
+        async_sdk()
+        from managers.async_deployment_manager import AsyncDeploymentManager
+        from managers.async_diagnostics_manager import AsyncDiagnosticsManager
+        from managers.async_pod_manager import AsyncPodManager
+
+        async def results():
+            async with await AsyncKubernetesClient.create(self.timeout, self.pool_size, self.connect_timeout,
+                                                          self.gzip, self.concurrency,
+                                                          self.context) as k8s_client:
+                deployment_manager = AsyncDeploymentManager(k8s_client)
+                pod_manager = AsyncPodManager(k8s_client)
+                managers = SimpleNamespace(
+                    deployment_manager=deployment_manager,
+                    pod_manager=pod_manager,
+                    diagnostics_manager=AsyncDiagnosticsManager(k8s_client, deployment_manager, pod_manager)
+                )
+                result = operation(managers)
+                if inspect.isasyncgen(result):
+                    async for item in result:
+                        yield item
+                else:
+                    yield await result
+
+        return iterate_async(results())
+
+
+def set_log_level(level: str, out=None):
+    """Set the log level of the process
+
+    Args:
+        level: Name of the log level
+        out: Optional stream for the confirmation, stdout by default
+    """
+    logging.getLogger().setLevel(getattr(logging, level))
+    print(f"Log level set to {level}", file=out or sys.stdout)
+
+
+def run_command(args: argparse.Namespace, session: Session, out=None,
+                connection_future: Optional[Future] = None,
+                timings: Optional[StageTimings] = None):
+    """Execute a parsed cluster command and write its output
+
+    Args:
+        args: Parsed command line arguments
+        session: Session holding the client and managers
+        out: Optional output stream, stdout by default
+        connection_future: Optional pending connection check; the read-only
+            diagnostic overlaps it with its own API calls
+        timings: Optional StageTimings recording per-stage latency
+    """
+    out = out or sys.stdout
+    timings = timings or StageTimings()
+
+    if args.command == "debug":
+        set_log_level(args.level, out)
+        return
+
+    from utils.render import render, yaml_module
+
+    if args.output == 'yaml':
+        # Fail before running a command that changes the cluster, such as scale
+        yaml_module()
+
+    if wants_fan_out(args):
+        if getattr(args, 'watch', False):
+            logger.error("--watch follows a single cluster and cannot be combined with --contexts/--all-contexts")
+            return
+        # Every cluster checks its own connection
+        try:
+            contexts = resolve_contexts(args)
+        except Exception as e:
+            logger.error(f"Unable to read kubeconfig contexts: {e}")
+            return
+        if render('clusters', run_across_contexts(args, session, contexts), args.output, out):
+            logger.error(f"Failed to run command: {args.command}")
+        return
+
+    if connection_future is not None and args.command != 'diagnostic' and not connection_future.result():
+        logger.error("Failed to connect to Kubernetes cluster")
+        return
+
+    result = dispatch(args, session, timings)
+    if result is None:
+        logger.error(f"Unknown command: {args.command}")
+        build_parser().print_help(out)
+        return
+    if args.command == 'diagnostic' and connection_future is not None and not connection_future.result():
+        logger.error("Failed to connect to Kubernetes cluster")
+        return
+
+    if render(args.command, result, args.output, out):
+        logger.error(f"Failed to run command: {args.command}")
+    if 'k8s_client' in vars(session):
+        session.k8s_client.log_connection_stats()
+
+    if args.command == 'diagnostic' and args.timings:
+        if args.output == 'table':
+            print(timings.report(), file=out)
+        else:
+            # Keep machine-readable output parseable
+            logger.info(timings.report())
+
+
+def dispatch(args: argparse.Namespace, session: Session, timings: StageTimings):
+    """Call the manager operation of a parsed cluster command
+
+    Args:
+        args: Parsed command line arguments
+        session: Session holding the client and managers
+        timings: StageTimings recording per-stage latency
+
+    Returns:
+        Union[Result, Iterator[Result], None]: Result or lazy results of the
+            command, None for an unknown command
+    """
+    backend = getattr(args, 'backend', 'sync')
+    if hasattr(args, 'index_ttl'):
+        if backend == 'async' and (args.refresh_index or args.index_ttl is not None):
+            from utils.results import ErrorResult
+
+            # The async backend locates deployments with a field-selected list instead of the index
+            return ErrorResult("--refresh-index and --index-ttl only apply to --backend sync")
+        session.configure_index(args.index_ttl, args.refresh_index)
+
+    if args.command == 'diagnostic' and args.watch:
+        if args.output in ('json', 'yaml'):
+            from utils.results import ErrorResult
+
+            return ErrorResult("--watch never ends, use --output table or jsonl")
+        return session.diagnostics_manager.watch_diagnostics(args.deployment, args.namespace, args.pod,
+                                                             not args.no_metrics, args.node_metrics,
+                                                             args.metrics_interval, args.watch_timeout)
+
+    if args.command == 'scale' and backend == 'async' and args.deployment:
+        result, = session.run_async(lambda managers: managers.deployment_manager.scale_deployment(
+            args.deployment, args.replicas, args.namespace, args.wait_mode))
+        return result
+    if args.command == 'scale' and backend == 'async':
+        return session.run_async(lambda managers: managers.deployment_manager.scale_deployments(
+            args.replicas, args.namespace, args.selector, args.from_file, args.wait_mode))
+    if args.command == 'diagnostic' and backend == 'async':
+        result, = session.run_async(lambda managers: managers.diagnostics_manager.deployment_diagnostics(
+            args.deployment, args.namespace, args.pod, not args.no_metrics, args.node_metrics, timings,
+            not args.no_events))
+        return result
+    if args.command == "list":
+        # Rows are rendered page by page as they arrive instead of buffering the whole list
+        return session.deployment_manager.stream_deployments(args.namespace, args.page_size)
+    if args.command == 'scale' and args.deployment:
+        return session.deployment_manager.scale_deployment(args.deployment, args.replicas, args.namespace,
+                                                           args.wait_mode)
+    if args.command == 'scale':
+        return session.deployment_manager.scale_deployments(args.replicas, args.namespace,
+                                                            args.selector, args.from_file,
+                                                            args.wait_mode, args.workers)
+    if args.command == 'info':
+        return session.deployment_manager.retrieve_deployment_info(args.deployment, args.namespace)
+    if args.command == 'diagnostic':
+        return session.diagnostics_manager.deployment_diagnostics(args.deployment, args.namespace, args.pod,
+                                                                  not args.no_metrics, args.node_metrics,
+                                                                  timings, not args.no_events)
+    if args.command == 'rollout-status':
+        return session.diagnostics_manager.rollout_status(args.deployment, args.namespace, args.timeout,
+                                                          args.wait_mode)
+    if args.command == 'logs':
+        return session.diagnostics_manager.deployment_logs(
+            args.deployment, args.pattern, args.namespace,
+            fixed_strings=args.fixed_strings, ignore_case=args.ignore_case, context=max(0, args.context),
+            previous=not args.no_previous, since_seconds=args.since, tail_lines=args.tail,
+            max_workers=args.workers
+        )
+    if args.command == 'sweep':
+        return session.sweep_manager.cluster_sweep(args.namespace, args.workers, args.page_size)
+    if args.command == 'utilization':
+        return session.utilization_manager.cluster_utilization(args.namespace, args.page_size,
+                                                               args.low, args.high)
+    return None
+
+
+def wants_fan_out(args: argparse.Namespace) -> bool:
+    """Check whether a command runs across several kubeconfig contexts"""
+    return bool(getattr(args, 'contexts', None) or getattr(args, 'all_contexts', False))
+
+
+def resolve_contexts(args: argparse.Namespace) -> List[str]:
+    """Name the kubeconfig contexts selected by --contexts or --all-contexts"""
+    if args.all_contexts:
+        from clients.kubernetes_client import list_contexts
+
+        return list_contexts()
+    return [context.strip() for context in args.contexts.split(',') if context.strip()]
+
+
+def run_across_contexts(args: argparse.Namespace, session: Session, contexts: List[str]) -> Iterator:
+    """Run a command on every context concurrently and merge the results
+
+    Each cluster runs on its own thread with its own client, so a slow or
+    unreachable cluster only delays its own results: the results of every
+    cluster are yielded as soon as it finishes, and clusters still running
+    after --cluster-timeout are reported as failed.
+
+    Args:
+        args: Parsed command line arguments
+        session: Session whose options the per-context sessions share
+        contexts: Names of the kubeconfig contexts
+
+    Yields:
+        ClusterResult: Results of every cluster, tagged with its context
+    """
+    from utils.results import ClusterResult, ErrorResult, Result
+
+    def run(context: str):
+        try:
+            context_session = session.for_context(context)
+            if not args.skip_check and not context_session.k8s_client.check_connection():
+                finished.put((context, [ErrorResult("Failed to connect to Kubernetes cluster")]))
+                return
+            result = dispatch(args, context_session, StageTimings())
+            finished.put((context, [result] if isinstance(result, Result) else list(result)))
+        except Exception as e:
+            logger.error(f"Cluster {context} failed: {e}")
+            finished.put((context, [ErrorResult(f"{e}")]))
+
+    if not contexts:
+        yield ClusterResult('-', ErrorResult("No kubeconfig context selected"))
+        return
+
+    logger.info(f"Running {args.command} on {len(contexts)} clusters")
+    deadline = time.monotonic() + args.cluster_timeout
+    finished = queue.Queue()
+    pending = set(contexts)
+    # Daemon threads: a cluster that never answers must not hold the process at exit either
+    for context in pending:
+        threading.Thread(target=run, args=(context,), daemon=True, name=f"sre-tool-{context}").start()
+    while pending:
+        try:
+            context, results = finished.get(timeout=max(0, deadline - time.monotonic()))
+        except queue.Empty:
+            break
+        pending.discard(context)
+        for result in results:
+            yield ClusterResult(context, result)
+    for context in sorted(pending):
+        logger.error(f"Cluster {context} did not answer within {args.cluster_timeout} seconds")
+        yield ClusterResult(context, ErrorResult(f"No answer within {args.cluster_timeout} seconds"))
@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+
+from kubernetes_asyncio.client.exceptions import ApiException
+
+from managers.deployment_manager import POLL_MAX_INTERVAL, POLL_MIN_INTERVAL, DeploymentManager
+from utils.results import BulkScaleSummary, ErrorResult, Result, ScaleResult
+
+logger = logging.getLogger("sre-tool")
+
+
+class AsyncDeploymentManager:
+    """Manages Kubernetes deployment operations on an event loop
+
+    The asyncio counterpart of DeploymentManager: the same operations and
+    results, with the API calls awaited through AsyncKubernetesClient so that
+    many deployments are handled concurrently by one thread.
+    """
+
+    def __init__(self, k8s_client):
+        """Initialize with an async Kubernetes client
+
+        Args:
+            k8s_client: AsyncKubernetesClient instance
+        """
+        self.k8s_client = k8s_client
+        self.apps_api = k8s_client.apps_api
+        self.timeout = k8s_client.timeout
+        self.request_timeout = k8s_client.request_timeout
+
+    async def locate_deployment_namespace(self, deployment_name: str) -> str:
+        """Find the namespace for a given deployment
+
+        Args:
+            deployment_name: Name of the deployment
+
+        Returns:
+            str: Namespace of the deployment or error message
+        """
+        try:
+            deployments = await self.k8s_client.call(
+                self.apps_api.list_deployment_for_all_namespaces,
+                field_selector=f"metadata.name={deployment_name}",
+                timeout_seconds=self.timeout
+            )
+            if deployments.items:
+                namespace = deployments.items[0].metadata.namespace
+                logger.info(f"Found deployment {deployment_name} in namespace: {namespace}")
+                return namespace
+            error_msg = f"Requested deployment: {deployment_name} not found"
+            logger.warning(error_msg)
+            return error_msg
+        except Exception as e:
+            error_msg = f"Exception when retrieving deployments: {e}"
+            logger.error(error_msg)
+            return error_msg
+
+    async def read_deployment(self, deployment_name: str, namespace: str):
+        """Read a deployment
+
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Namespace of the deployment
+
+        Returns:
+            V1Deployment: The deployment
+        """
+        return await self.k8s_client.call(
+            self.apps_api.read_namespaced_deployment,
+            deployment_name,
+            namespace,
+            _request_timeout=self.request_timeout
+        )
+
+    async def scale_deployment(self, deployment_name: str, scale_number: int,
+                               namespace: Optional[str] = None,
+                               wait_mode: str = "watch") -> ScaleResult:
+        """Scale a deployment to specified number of replicas
+
+        Args:
+            deployment_name: Name of the deployment to scale
+            scale_number: Target number of replicas
+            namespace: Optional namespace of the deployment
+            wait_mode: How to wait for completion, "watch" or "poll"
+
+        Returns:
+            ScaleResult: Outcome of the scale and how long it took
+        """
+        start_time = time.monotonic()
+
+        def result(status: str, message: str) -> ScaleResult:
+            return ScaleResult(namespace, deployment_name, scale_number, status, message,
+                               time.monotonic() - start_time)
+
+        try:
+            if not namespace:
+                located = await self.locate_deployment_namespace(deployment_name)
+                if "not found" in located or "Exception" in located:
+                    return result("Failed", located)
+                namespace = located
+
+            await self.k8s_client.call(
+                self.apps_api.patch_namespaced_deployment_scale,
+                deployment_name,
+                namespace,
+                {'spec': {'replicas': scale_number}},
+                _request_timeout=self.request_timeout
+            )
+            logger.info(f"Scaling {deployment_name} in namespace {namespace} to {scale_number} replicas")
+
+            max_wait_time = 120
+            # The watch reads the deployment first, so a no-op patch completes at once
+            async for deployment in self.watch_deployment(deployment_name, namespace,
+                                                          start_time + max_wait_time, wait_mode=wait_mode):
+                if DeploymentManager.scale_reached(deployment, scale_number):
+                    logger.info(f"Successfully scaled {deployment_name} to {scale_number} replicas")
+                    return result("Scaled", f"Successfully scaled {deployment_name} to {scale_number} replicas")
+                logger.debug(
+                    f"Current replicas: {deployment.status.replicas}, "
+                    f"ready: {deployment.status.ready_replicas}, target: {scale_number}"
+                )
+
+            warning_msg = f"Scaling operation timed out after {max_wait_time} seconds"
+            logger.warning(warning_msg)
+            return result("Timeout", f"Partially scaled {deployment_name}. {warning_msg}")
+
+        except Exception as e:
+            error_msg = f"Error when scaling deployment: {e}"
+            logger.error(error_msg)
+            return result("Failed", error_msg)
+
+    async def scale_deployments(self, scale_number: int, namespace: Optional[str] = None,
+                                label_selector: Optional[str] = None,
+                                file_path: Optional[str] = None,
+                                wait_mode: str = "watch") -> AsyncIterator[Result]:
+        """Scale many deployments concurrently and wait for all of them
+
+        Every deployment is scaled by its own task. The number of requests in
+        flight is bounded by the client's concurrency limit rather than by a
+        number of worker threads.
+
+        Args:
+            scale_number: Target number of replicas
+            namespace: Optional namespace to restrict or resolve deployments
+            label_selector: Label selector matching the deployments to scale
+            file_path: Path to a file listing the deployments to scale
+            wait_mode: How to wait for completion, "watch" or "poll"
+
+        Yields:
+            Result: ScaleResult per deployment as it completes, then a
+                BulkScaleSummary, or a single ErrorResult
+        """
+        try:
+            if label_selector:
+                targets = await self._deployments_by_selector(label_selector, namespace)
+            else:
+                targets = DeploymentManager.deployments_from_file(file_path, namespace)
+        except Exception as e:
+            error_msg = f"Error when resolving deployments to scale: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+            return
+
+        if not targets:
+            logger.warning("No deployments matched the requested selection")
+            yield BulkScaleSummary(scale_number, 0, 0, 0.0, 0.0)
+            return
+
+        logger.info(f"Scaling {len(targets)} deployments to {scale_number} replicas "
+                    f"with up to {self.k8s_client.concurrency} requests in flight")
+        start_time = time.monotonic()
+        results = []
+        tasks = [
+            asyncio.create_task(self.scale_deployment(name, scale_number, target_namespace, wait_mode))
+            for target_namespace, name in targets
+        ]
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            results.append(result)
+            yield result
+
+        yield BulkScaleSummary(
+            scale_number,
+            sum(1 for result in results if result.status == "Scaled"),
+            len(results),
+            time.monotonic() - start_time,
+            max(result.elapsed for result in results)
+        )
+
+    async def _deployments_by_selector(self, label_selector: str,
+                                       namespace: Optional[str] = None) -> List[Tuple[str, str]]:
+        """List deployments matching a label selector, see DeploymentManager"""
+        if namespace:
+            deployments = await self.k8s_client.call(
+                self.apps_api.list_namespaced_deployment,
+                namespace,
+                label_selector=label_selector,
+                timeout_seconds=self.timeout
+            )
+        else:
+            deployments = await self.k8s_client.call(
+                self.apps_api.list_deployment_for_all_namespaces,
+                label_selector=label_selector,
+                timeout_seconds=self.timeout
+            )
+        return [(d.metadata.namespace, d.metadata.name) for d in deployments.items]
+
+    async def watch_deployment(self, deployment_name: str, namespace: str, deadline: float,
+                               resource_version: Optional[str] = None,
+                               wait_mode: str = "watch") -> AsyncIterator:
+        """Yield a deployment every time it changes, until the deadline
+
+        Behaves like DeploymentManager.watch_deployment: a resumable watch
+        that falls back to polling with an adaptive backoff.
+
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Namespace of the deployment
+            deadline: time.monotonic() value after which to stop
+            resource_version: Optional resourceVersion to watch from
+            wait_mode: "watch" or "poll"
+
+        Yields:
+            V1Deployment: The deployment after each change
+
+        Raises:
+            RuntimeError: If the deployment is deleted
+        """
+        if wait_mode == "watch":
+            try:
+                async for deployment in self._watch_deployment_stream(deployment_name, namespace,
+                                                                      deadline, resource_version):
+                    yield deployment
+                return
+            except ApiException as e:
+                if e.status == 404:
+                    raise
+                logger.warning(f"Watch on {deployment_name} failed, polling instead: {e}")
+
+        interval = POLL_MIN_INTERVAL
+        while time.monotonic() < deadline:
+            deployment = await self.read_deployment(deployment_name, namespace)
+            if deployment.metadata.resource_version != resource_version:
+                resource_version = deployment.metadata.resource_version
+                interval = POLL_MIN_INTERVAL
+                yield deployment
+            else:
+                interval = min(interval * 2, POLL_MAX_INTERVAL)
+            await asyncio.sleep(max(0, min(interval, deadline - time.monotonic())))
+
+    async def _watch_deployment_stream(self, deployment_name: str, namespace: str, deadline: float,
+                                       resource_version: Optional[str]) -> AsyncIterator:
+        """Watch one deployment, resuming closed and expired streams"""
+        field_selector = f"metadata.name={deployment_name}"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+
+            if resource_version is None:
+                deployments = await self.k8s_client.call(
+                    self.apps_api.list_namespaced_deployment,
+                    namespace,
+                    field_selector=field_selector,
+                    timeout_seconds=self.timeout
+                )
+                resource_version = deployments.metadata.resource_version
+                if not deployments.items:
+                    raise RuntimeError(f"Deployment {deployment_name} not found in namespace {namespace}")
+                for deployment in deployments.items:
+                    yield deployment
+
+            try:
+                async with self.k8s_client.watch().stream(
+                    self.apps_api.list_namespaced_deployment,
+                    namespace,
+                    field_selector=field_selector,
+                    resource_version=resource_version,
+                    allow_watch_bookmarks=True,
+                    timeout_seconds=max(1, int(remaining))
+                ) as stream:
+                    async for event in stream:
+                        if event['type'] == 'BOOKMARK':
+                            resource_version = event['raw_object']['metadata']['resourceVersion']
+                            continue
+
+                        deployment = event['object']
+                        resource_version = deployment.metadata.resource_version
+
+                        if event['type'] == 'DELETED':
+                            raise RuntimeError(f"Deployment {deployment_name} was deleted")
+
+                        yield deployment
+            except ApiException as e:
+                if e.status != 410:
+                    raise
+                logger.debug(f"Watch resourceVersion {resource_version} expired, relisting")
+                resource_version = None
+
+            logger.debug(f"Watch on {deployment_name} closed, resuming from resourceVersion {resource_version}")
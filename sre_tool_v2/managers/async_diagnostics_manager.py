@@ -0,0 +1,197 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, List, Optional, Tuple, Union
+
+from managers.deployment_manager import DeploymentManager
+from managers.diagnostics_manager import DiagnosticsManager
+from utils.label_selector import selector_to_string
+from utils.results import DeploymentDiagnostic, ErrorResult
+from utils.timings import StageTimings
+
+logger = logging.getLogger("sre-tool")
+
+
+class AsyncDiagnosticsManager:
+    """Handles diagnostic operations for Kubernetes resources on an event loop
+
+    The asyncio counterpart of DiagnosticsManager. Diagnosing many
+    deployments runs one task per deployment, all sharing the client's
+    concurrency limit.
+    """
+
+    def __init__(self, k8s_client, deployment_manager, pod_manager):
+        """Initialize with required manager instances
+
+        Args:
+            k8s_client: AsyncKubernetesClient instance
+            deployment_manager: AsyncDeploymentManager instance
+            pod_manager: AsyncPodManager instance
+        """
+        self.k8s_client = k8s_client
+        self.apps_api = k8s_client.apps_api
+        self.deployment_manager = deployment_manager
+        self.pod_manager = pod_manager
+        self.timeout = k8s_client.timeout
+
+    async def deployment_diagnostics(self, deployment_name: str,
+                                     namespace: Optional[str] = None,
+                                     pod_name: Optional[str] = None,
+                                     include_metrics: bool = True,
+                                     include_node_metrics: bool = False,
+                                     timings: Optional[StageTimings] = None,
+                                     include_events: bool = True
+                                     ) -> Union[DeploymentDiagnostic, ErrorResult]:
+        """Perform diagnostics on a deployment
+
+        Same stages and result as DiagnosticsManager.deployment_diagnostics:
+        the warning events are read while the ReplicaSets are listed and
+        then the pods of the live ReplicaSets with their metrics.
+
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Optional namespace of the deployment
+            pod_name: Optional specific pod to diagnose
+            include_metrics: Include pod usage from metrics.k8s.io
+            include_node_metrics: Include usage of the nodes hosting the pods
+            timings: Optional StageTimings recording per-stage latency
+            include_events: Include the warning events of the deployment,
+                its ReplicaSets and its pods
+
+        Returns:
+            Union[DeploymentDiagnostic, ErrorResult]: Diagnostic information or the failure
+        """
+        timings = timings or StageTimings()
+        try:
+            if not namespace:
+                namespace = await timings.timed_async(
+                    "locate namespace",
+                    self.deployment_manager.locate_deployment_namespace(deployment_name)
+                )
+                if "not found" in namespace or "Exception" in namespace:
+                    return ErrorResult(f"Error: {namespace}")
+
+            deployment = await timings.timed_async(
+                "read deployment",
+                self.deployment_manager.read_deployment(deployment_name, namespace)
+            )
+            diagnostic = DeploymentDiagnostic(DeploymentManager.deployment_info(deployment))
+            label_selector = selector_to_string(deployment.spec.selector)
+
+            events_task = asyncio.ensure_future(
+                timings.timed_async("list events", self.list_warning_events(namespace)) if include_events
+                else asyncio.sleep(0, [])
+            )
+            try:
+                try:
+                    replica_sets = await timings.timed_async(
+                        "list replicasets", self.live_replica_sets(deployment, label_selector)
+                    )
+                except Exception as e:
+                    logger.error(f"Error finding ReplicaSet: {e}")
+                    diagnostic.error = f"Error finding ReplicaSet: {e}"
+                    return diagnostic
+                if not replica_sets:
+                    diagnostic.error = f"Error: No ReplicaSet found for deployment {deployment_name}"
+                    return diagnostic
+
+                live_names = {rs.metadata.name for rs in replica_sets}
+                pod_results = await self.pod_manager.get_pods_status(
+                    namespace,
+                    list(live_names),
+                    pod_name,
+                    label_selector=DiagnosticsManager.pod_selector(label_selector, replica_sets),
+                    include_metrics=include_metrics,
+                    include_node_metrics=include_node_metrics,
+                    timings=timings
+                )
+                events = await events_task
+            finally:
+                events_task.cancel()
+            diagnostic.replica_sets = DiagnosticsManager.replica_set_statuses(replica_sets)
+            diagnostic.events = DiagnosticsManager.event_summaries(events, deployment_name, live_names, pod_name)
+            for pod in pod_results:
+                if isinstance(pod, ErrorResult):
+                    diagnostic.pod_errors.append(pod.message)
+                elif pod.replicaset in live_names:
+                    diagnostic.pods.append(pod)
+
+            return diagnostic
+
+        except Exception as e:
+            error_msg = f"Error performing diagnostics: {e}"
+            logger.error(error_msg)
+            return ErrorResult(error_msg)
+
+    async def diagnose_deployments(self, targets: List[Tuple[Optional[str], str]],
+                                   include_metrics: bool = True
+                                   ) -> AsyncIterator[Union[DeploymentDiagnostic, ErrorResult]]:
+        """Diagnose many deployments concurrently
+
+        Args:
+            targets: (namespace, name) pairs, the namespace being located
+                when it is None
+            include_metrics: Include pod usage from metrics.k8s.io
+
+        Yields:
+            Union[DeploymentDiagnostic, ErrorResult]: One result per
+                deployment as it completes
+        """
+        tasks = [
+            asyncio.create_task(self.deployment_diagnostics(name, namespace, include_metrics=include_metrics))
+            for namespace, name in targets
+        ]
+        for task in asyncio.as_completed(tasks):
+            yield await task
+
+    async def list_warning_events(self, namespace: str, page_size: int = 500) -> List[dict]:
+        """List the warning events of a namespace, see DiagnosticsManager.list_warning_events
+
+        Args:
+            namespace: Namespace of the events
+            page_size: Number of events requested per API call
+
+        Returns:
+            List[dict]: Raw Event objects, empty if events are unavailable
+        """
+        try:
+            events = []
+            continue_token = None
+            while True:
+                response = await self.k8s_client.call(
+                    self.pod_manager.core_api.list_namespaced_event,
+                    namespace,
+                    field_selector="type=Warning",
+                    limit=page_size,
+                    _continue=continue_token,
+                    timeout_seconds=self.timeout,
+                    _preload_content=False
+                )
+                result = json.loads(await response.read())
+                events.extend(result.get('items') or [])
+                continue_token = result.get('metadata', {}).get('continue')
+                if not continue_token:
+                    return events
+        except Exception as e:
+            logger.warning(f"Unable to get events: {e}")
+            return []
+
+    async def live_replica_sets(self, deployment, label_selector: str) -> List:
+        """Find the live ReplicaSets of a deployment, newest revision first
+
+        Args:
+            deployment: V1Deployment object
+            label_selector: Label selector of the deployment
+
+        Returns:
+            List: V1ReplicaSet objects sorted by revision, newest first
+        """
+        replica_sets_list = await self.k8s_client.call(
+            self.apps_api.list_namespaced_replica_set,
+            deployment.metadata.namespace,
+            label_selector=label_selector,
+            timeout_seconds=self.timeout
+        )
+        return DiagnosticsManager.select_live_replica_sets(
+            DiagnosticsManager.owned_replica_sets(deployment, replica_sets_list.items)
+        )
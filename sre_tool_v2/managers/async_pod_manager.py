@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+
+from managers.pod_manager import PodManager
+from utils.resource_converter import parse_cpu, parse_memory
+from utils.results import ErrorResult, NodeUsage, PodStatus
+from utils.timings import StageTimings
+
+logger = logging.getLogger("sre-tool")
+
+
+class AsyncPodManager:
+    """Manages Kubernetes pod operations on an event loop
+
+    The asyncio counterpart of PodManager; the pod records are built by the
+    same PodManager helpers.
+    """
+
+    def __init__(self, k8s_client):
+        """Initialize with an async Kubernetes client
+
+        Args:
+            k8s_client: AsyncKubernetesClient instance
+        """
+        self.k8s_client = k8s_client
+        self.core_api = k8s_client.core_api
+        self.metrics_api = k8s_client.custom_api
+        self.timeout = k8s_client.timeout
+        self.request_timeout = k8s_client.request_timeout
+
+    async def get_pods_status(self, namespace: str, replicaset_name: Union[str, List[str], None],
+                              pod_name: Optional[str] = None,
+                              label_selector: Optional[str] = None,
+                              include_metrics: bool = True,
+                              include_node_metrics: bool = False,
+                              timings: Optional[StageTimings] = None) -> List[Union[PodStatus, ErrorResult]]:
+        """Get detailed status of pods belonging to one or more ReplicaSets
+
+        The pod list and the pod metrics request are awaited together, then
+        the usage of every node hosting the pods is fetched concurrently.
+
+        Args:
+            namespace: Namespace of the pods
+            replicaset_name: Name or list of names of the parent ReplicaSets,
+                None for pods of any ReplicaSet
+            pod_name: Optional specific pod name to filter
+            label_selector: Optional label selector applied by the API server
+            include_metrics: Fetch pod usage from metrics.k8s.io
+            include_node_metrics: Fetch usage of the nodes hosting the pods
+            timings: Optional StageTimings recording per-stage latency
+
+        Returns:
+            List[Union[PodStatus, ErrorResult]]: Detailed pod information, or a
+                single ErrorResult on failure
+        """
+        timings = timings or StageTimings()
+        try:
+            pods_task = timings.timed_async("list pods", self.list_pods(namespace, pod_name, label_selector))
+            if include_metrics:
+                pods, metrics_index = await asyncio.gather(
+                    pods_task,
+                    timings.timed_async("pod metrics", self.fetch_pod_metrics(namespace, pod_name, label_selector))
+                )
+            else:
+                pods, metrics_index = await pods_task, {}
+            pods_data = PodManager.pod_statuses(pods, metrics_index, replicaset_name, pod_name)
+
+            if include_node_metrics:
+                node_usage = await timings.timed_async(
+                    "node metrics",
+                    self.fetch_node_usage({pod.node for pod in pods_data if pod.node})
+                )
+                for pod in pods_data:
+                    if pod.node in node_usage:
+                        pod.node_usage = node_usage[pod.node]
+
+            return pods_data
+
+        except Exception as e:
+            logger.error(f"Error getting pod status: {e}")
+            return [ErrorResult(f"Error: {e}")]
+
+    async def list_pods(self, namespace: str, pod_name: Optional[str] = None,
+                        label_selector: Optional[str] = None) -> List:
+        """List the pods of a namespace
+
+        Args:
+            namespace: Namespace of the pods
+            pod_name: Optional specific pod name to filter
+            label_selector: Optional label selector
+
+        Returns:
+            List: V1Pod objects
+        """
+        pods = await self.k8s_client.call(
+            self.core_api.list_namespaced_pod,
+            namespace,
+            label_selector=label_selector,
+            field_selector=f"metadata.name={pod_name}" if pod_name else None,
+            timeout_seconds=self.timeout
+        )
+        return pods.items
+
+    async def fetch_pod_metrics(self, namespace: str, pod_name: Optional[str] = None,
+                                label_selector: Optional[str] = None) -> Dict[Tuple[str, str], Tuple]:
+        """Fetch and index pod metrics of the selected pods only
+
+        Args:
+            namespace: Namespace of the pods
+            pod_name: Optional specific pod name
+            label_selector: Optional label selector of the pods
+
+        Returns:
+            Dict: Index built by PodManager.index_pod_metrics, empty if
+                metrics are unavailable
+        """
+        try:
+            if pod_name:
+                pod_metric = await self.k8s_client.call(
+                    self.metrics_api.get_namespaced_custom_object,
+                    "metrics.k8s.io", "v1beta1", namespace, "pods", pod_name,
+                    _request_timeout=self.request_timeout
+                )
+                pod_metrics = {'items': [pod_metric]}
+            else:
+                pod_metrics = await self.k8s_client.call(
+                    self.metrics_api.list_namespaced_custom_object,
+                    "metrics.k8s.io", "v1beta1", namespace, "pods",
+                    label_selector=label_selector,
+                    timeout_seconds=self.timeout
+                )
+            return PodManager.index_pod_metrics(pod_metrics)
+        except Exception as e:
+            logger.warning(f"Unable to get metrics: {e}")
+            return {}
+
+    async def fetch_node_usage(self, node_names) -> Dict[str, NodeUsage]:
+        """Fetch usage of the given nodes concurrently
+
+        Args:
+            node_names: Names of the nodes
+
+        Returns:
+            Dict[str, NodeUsage]: Node name -> parsed usage of the node
+        """
+        async def fetch(node_name):
+            try:
+                node_metric = await self.k8s_client.call(
+                    self.metrics_api.get_cluster_custom_object,
+                    "metrics.k8s.io", "v1beta1", "nodes", node_name,
+                    _request_timeout=self.request_timeout
+                )
+                usage = node_metric['usage']
+                return node_name, NodeUsage(parse_cpu(usage.get('cpu')), parse_memory(usage.get('memory')))
+            except Exception as e:
+                logger.warning(f"Unable to get metrics for node {node_name}: {e}")
+                return node_name, None
+
+        usages = await asyncio.gather(*(fetch(node_name) for node_name in node_names))
+        return {node_name: usage for node_name, usage in usages if usage}
@@ -1,35 +1,72 @@
 import logging
 import time
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
 
+from kubernetes import watch
 from kubernetes.client.exceptions import ApiException
 
+from utils.resource_converter import parse_cpu, parse_memory
+from utils.results import (BulkScaleSummary, ContainerSpec, DeploymentInfo, DeploymentSummary,
+                           ErrorResult, Result, ScaleResult)
+from utils.timings import StageTimings
+
 logger = logging.getLogger("sre-tool")
 
+# Bounds of the adaptive interval used when polling a deployment
+POLL_MIN_INTERVAL = 0.5
+POLL_MAX_INTERVAL = 8.0
+
 class DeploymentManager:
     """Manages Kubernetes deployment operations"""
     
-    def __init__(self, k8s_client):
+    def __init__(self, k8s_client, namespace_index=None, informers=None):
         """Initialize with a Kubernetes client
         
         Args:
             k8s_client: Kubernetes client instance
+            namespace_index: Optional NamespaceIndex used to locate deployments
+            informers: Optional InformerCache serving reads from memory
         """
         self.k8s_client = k8s_client
+        self.namespace_index = namespace_index
+        self.informers = informers
         self.apps_api = k8s_client.apps_api
         self.core_api = k8s_client.core_api
         self.timeout = k8s_client.timeout
+        self.request_timeout = k8s_client.request_timeout
 
-    def locate_deployment_namespace(self, deployment_name: str) -> str:
+    def locate_deployment_namespace(self, deployment_name: str, stale_namespace: Optional[str] = None) -> str:
         """Find the namespace for a given deployment
         
         Args:
             deployment_name: Name of the deployment
+            stale_namespace: Optional namespace where an earlier lookup found
+                the deployment but it no longer exists
             
         Returns:
             str: Namespace of the deployment or error message
         """
         try:
+            if self.informers:
+                deployments = self.informers.deployments.by_name(deployment_name)
+                if deployments:
+                    namespace = deployments[0].metadata.namespace
+                    logger.info(f"Found deployment {deployment_name} in namespace: {namespace}")
+                    return namespace
+                error_msg = f"Requested deployment: {deployment_name} not found"
+                logger.warning(error_msg)
+                return error_msg
+
+            if self.namespace_index:
+                namespace = self.namespace_index.lookup(deployment_name, stale_namespace)
+                if namespace:
+                    logger.info(f"Found deployment {deployment_name} in namespace: {namespace}")
+                    return namespace
+                error_msg = f"Requested deployment: {deployment_name} not found"
+                logger.warning(error_msg)
+                return error_msg
+                
             deployments = self.apps_api.list_deployment_for_all_namespaces(
                 timeout_seconds=self.timeout
             )
@@ -45,146 +82,598 @@ class DeploymentManager:
             logger.error(error_msg)
             return error_msg
 
-    def list_deployments(self, namespace: Optional[str] = None) -> str:
+    def call_in_namespace(self, deployment_name: str, namespace: Optional[str], func: Callable[[str], Any],
+                          timings: Optional[StageTimings] = None) -> Tuple[str, Any]:
+        """Call an API function with the namespace of a deployment
+        
+        The namespace is located when it is not given. A namespace from the
+        namespace index may be out of date, so when the call then reports the
+        deployment as not found, the namespace is located again from the
+        cluster and the call is retried once.
+        
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Optional namespace of the deployment
+            func: Function called with the namespace
+            timings: Optional StageTimings recording the lookups
+            
+        Returns:
+            Tuple[str, Any]: Namespace of the deployment and return value of func
+            
+        Raises:
+            LookupError: The deployment could not be located
+        """
+        located = not namespace
+        if located:
+            namespace = self._locate(deployment_name, timings)
+        try:
+            return namespace, func(namespace)
+        except ApiException as e:
+            if e.status != 404 or not located or self.informers or not self.namespace_index:
+                raise
+        logger.info(f"Deployment {deployment_name} no longer in namespace {namespace}, locating it again")
+        namespace = self._locate(deployment_name, timings, stale_namespace=namespace)
+        return namespace, func(namespace)
+
+    def _locate(self, deployment_name: str, timings: Optional[StageTimings] = None,
+                stale_namespace: Optional[str] = None) -> str:
+        """Locate the namespace of a deployment, raising LookupError when it fails"""
+        timings = timings or StageTimings()
+        located = timings.timed("locate namespace", self.locate_deployment_namespace,
+                                deployment_name, stale_namespace)
+        if "not found" in located or "Exception" in located:
+            raise LookupError(located)
+        return located
+
+    def list_deployments(self, namespace: Optional[str] = None, page_size: int = 500) -> List[Result]:
         """List all deployments, optionally filtered by namespace
         
         Args:
             namespace: Optional namespace to filter deployments
+            page_size: Number of deployments requested per API call
             
         Returns:
-            str: Formatted list of deployments
+            List[Result]: DeploymentSummary per deployment, or an ErrorResult last
         """
+        return list(self.stream_deployments(namespace, page_size))
+
+    def stream_deployments(self, namespace: Optional[str] = None,
+                           page_size: int = 500) -> Iterator[Result]:
+        """Stream the deployment list one page at a time
+        
+        Every page is fetched with the continue token of the previous one, so
+        large clusters are listed completely while only one page is held in
+        memory. On failure an ErrorResult is yielded last.
+        
+        Args:
+            namespace: Optional namespace to filter deployments
+            page_size: Number of deployments requested per API call
+            
+        Yields:
+            Result: DeploymentSummary per deployment as its page arrives
+        """
+        start_time = time.monotonic()
+        first_row_time = None
+        count = 0
+        pages = 0
         try:
-            output = "Deployments list:\n"
+            if namespace:
+                logger.info(f"Listing deployments in namespace: {namespace}")
+            else:
+                logger.info("Listing deployments across all namespaces")
+            
+            for page in self.iter_deployment_pages(namespace, page_size):
+                pages += 1
+                if not page:
+                    continue
+                if first_row_time is None:
+                    first_row_time = time.monotonic() - start_time
+                count += len(page)
+                yield from page
+            
+            logger.info(
+                f"Listed {count} deployments in {pages} pages in {time.monotonic() - start_time:.3f}s "
+                f"(first row after {first_row_time or 0:.3f}s)"
+            )
+        except Exception as e:
+            error_msg = f"Error when retrieving deployments: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+
+    def iter_deployment_pages(self, namespace: Optional[str] = None,
+                              page_size: int = 500) -> Iterator[List[DeploymentSummary]]:
+        """Walk every page of the deployment list using continue tokens
+        
+        Args:
+            namespace: Optional namespace to filter deployments
+            page_size: Number of deployments requested per API call
+            
+        Yields:
+            List[DeploymentSummary]: Deployments of one page
+        """
+        if self.informers:
+            deployments = self.informers.deployments.list(namespace)
+            for start in range(0, len(deployments), page_size):
+                yield [self._deployment_summary(deployment) for deployment in deployments[start:start + page_size]]
+            return
+
+        continue_token = None
+        while True:
             if namespace:
                 deployments = self.apps_api.list_namespaced_deployment(
                     namespace, 
+                    limit=page_size,
+                    _continue=continue_token,
                     timeout_seconds=self.timeout
                 )
-                logger.info(f"Listing deployments in namespace: {namespace}")
             else:
                 deployments = self.apps_api.list_deployment_for_all_namespaces(
-                    timeout_seconds=self.timeout,
-                    limit= 30
+                    limit=page_size,
+                    _continue=continue_token,
+                    timeout_seconds=self.timeout
                 )
-                logger.info("Listing deployments across all namespaces")
-                
-            for deployment in deployments.items:
-                output += f"Namespace: {deployment.metadata.namespace}, Name: {deployment.metadata.name}, Replicas: {deployment.spec.replicas}\n"
-            return output
-        except Exception as e:
-            error_msg = f"Error when retrieving deployments: {e}"
-            logger.error(error_msg)
-            return error_msg
+            
+            yield [self._deployment_summary(deployment) for deployment in deployments.items]
+            
+            continue_token = deployments.metadata._continue
+            if not continue_token:
+                break
+
+    @staticmethod
+    def _deployment_summary(deployment) -> DeploymentSummary:
+        """Build one row of the deployment list"""
+        return DeploymentSummary(deployment.metadata.namespace, deployment.metadata.name,
+                                 deployment.spec.replicas)
 
     def scale_deployment(self, deployment_name: str, scale_number: int, 
-                         namespace: Optional[str] = None) -> str:
+                         namespace: Optional[str] = None,
+                         wait_mode: str = "watch") -> ScaleResult:
         """Scale a deployment to specified number of replicas
         
         Args:
             deployment_name: Name of the deployment to scale
             scale_number: Target number of replicas
             namespace: Optional namespace of the deployment
+            wait_mode: How to wait for completion, "watch" or "poll"
             
         Returns:
-            str: Result message
+            ScaleResult: Outcome of the scale and how long it took
         """
+        start_time = time.monotonic()
+        
+        def result(status: str, message: str) -> ScaleResult:
+            return ScaleResult(namespace, deployment_name, scale_number, status, message,
+                               time.monotonic() - start_time)
+        
         try:
-            if not namespace:
-                namespace = self.locate_deployment_namespace(deployment_name)
-                if "not found" in namespace or "Exception" in namespace:
-                    return namespace
-                
             scale_body = {'spec': {'replicas': scale_number}}
             
-            self.apps_api.patch_namespaced_deployment_scale(
-                deployment_name, 
-                namespace, 
-                scale_body,
-            )
+            try:
+                namespace, scale_response = self.call_in_namespace(
+                    deployment_name,
+                    namespace,
+                    lambda located: self.apps_api.patch_namespaced_deployment_scale(
+                        deployment_name,
+                        located,
+                        scale_body,
+                        _request_timeout=self.request_timeout
+                    )
+                )
+            except LookupError as e:
+                return result("Failed", f"{e}")
             logger.info(f"Scaling {deployment_name} in namespace {namespace} to {scale_number} replicas")
             
             max_wait_time = 120 
-            start_time = time.time()
             
-            while True:
-                if time.time() - start_time > max_wait_time:
-                    warning_msg = f"Scaling operation timed out after {max_wait_time} seconds"
-                    logger.warning(warning_msg)
-                    return f"Partially scaled {deployment_name}. {warning_msg}"
-                
-                read_scale_request = self.apps_api.read_namespaced_deployment_scale(
+            if wait_mode == "watch":
+                completed = self._wait_for_scale_watch(
                     deployment_name,
                     namespace,
+                    scale_number,
+                    scale_response,
+                    max_wait_time
                 )
-                current_replicas = read_scale_request.status.replicas
-                
-                if current_replicas == scale_number:
-                    logger.info(f"Successfully scaled {deployment_name} to {current_replicas} replicas")
-                    break
-                    
-                logger.debug(f"Current replicas: {current_replicas}, target: {scale_number}")
-                time.sleep(2) 
+            else:
+                completed = self._wait_for_scale_poll(
+                    deployment_name,
+                    namespace,
+                    scale_number,
+                    max_wait_time
+                )
+            
+            if not completed:
+                warning_msg = f"Scaling operation timed out after {max_wait_time} seconds"
+                logger.warning(warning_msg)
+                return result("Timeout", f"Partially scaled {deployment_name}. {warning_msg}")
             
-            return f"Successfully scaled {deployment_name} to {scale_number} replicas"
+            return result("Scaled", f"Successfully scaled {deployment_name} to {scale_number} replicas")
             
         except Exception as e:
             error_msg = f"Error when scaling deployment: {e}"
             logger.error(error_msg)
-            return error_msg
+            return result("Failed", error_msg)
 
-    def retrieve_deployment_info(self, deployment_name: str, namespace: Optional[str] = None) -> str:
-        """Get detailed information about a deployment
+    def scale_deployments(self, scale_number: int, namespace: Optional[str] = None,
+                          label_selector: Optional[str] = None,
+                          file_path: Optional[str] = None,
+                          wait_mode: str = "watch", max_workers: int = 10) -> Iterator[Result]:
+        """Scale many deployments concurrently and wait for all of them
+        
+        Deployments are selected either by label selector or from a file with
+        one "namespace/name" or "name" entry per line. Each deployment is
+        scaled with scale_deployment on a bounded thread pool, so the total
+        time is close to the slowest single rollout.
+        
+        Args:
+            scale_number: Target number of replicas
+            namespace: Optional namespace to restrict or resolve deployments
+            label_selector: Label selector matching the deployments to scale
+            file_path: Path to a file listing the deployments to scale
+            wait_mode: How to wait for completion, "watch" or "poll"
+            max_workers: Maximum number of deployments scaled at once
+            
+        Yields:
+            Result: ScaleResult per deployment as it completes, then a
+                BulkScaleSummary, or a single ErrorResult
+        """
+        try:
+            if label_selector:
+                targets = self._deployments_by_selector(label_selector, namespace)
+            else:
+                targets = self.deployments_from_file(file_path, namespace)
+        except Exception as e:
+            error_msg = f"Error when resolving deployments to scale: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+            return
+        
+        if not targets:
+            logger.warning("No deployments matched the requested selection")
+            yield BulkScaleSummary(scale_number, 0, 0, 0.0, 0.0)
+            return
+        
+        logger.info(f"Scaling {len(targets)} deployments to {scale_number} replicas with {max_workers} workers")
+        start_time = time.monotonic()
+        results = []
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+            futures = [
+                executor.submit(self.scale_deployment, name, scale_number, target_namespace, wait_mode)
+                for target_namespace, name in targets
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results.append(result)
+                yield result
+        
+        yield BulkScaleSummary(
+            scale_number,
+            sum(1 for result in results if result.status == "Scaled"),
+            len(results),
+            time.monotonic() - start_time,
+            max(result.elapsed for result in results)
+        )
+
+    def _deployments_by_selector(self, label_selector: str,
+                                 namespace: Optional[str] = None) -> List[Tuple[str, str]]:
+        """List deployments matching a label selector
+        
+        Args:
+            label_selector: Kubernetes label selector
+            namespace: Optional namespace to restrict the search
+            
+        Returns:
+            List[Tuple[str, str]]: (namespace, name) pairs
+        """
+        if namespace:
+            deployments = self.apps_api.list_namespaced_deployment(
+                namespace,
+                label_selector=label_selector,
+                timeout_seconds=self.timeout
+            )
+        else:
+            deployments = self.apps_api.list_deployment_for_all_namespaces(
+                label_selector=label_selector,
+                timeout_seconds=self.timeout
+            )
+        return [(d.metadata.namespace, d.metadata.name) for d in deployments.items]
+
+    @staticmethod
+    def deployments_from_file(file_path: str,
+                               namespace: Optional[str] = None) -> List[Tuple[Optional[str], str]]:
+        """Read deployments to scale from a file
+        
+        Each non-empty line holds "namespace/name" or just "name"; lines
+        starting with "#" are ignored. Entries without a namespace use the
+        given namespace, or are located in the cluster when it is omitted.
+        
+        Args:
+            file_path: Path to the deployments file
+            namespace: Optional default namespace
+            
+        Returns:
+            List[Tuple[Optional[str], str]]: (namespace, name) pairs
+        """
+        targets = []
+        with open(file_path) as f:
+            for line in f:
+                entry = line.strip()
+                if not entry or entry.startswith("#"):
+                    continue
+                if "/" in entry:
+                    entry_namespace, name = entry.split("/", 1)
+                    targets.append((entry_namespace, name))
+                else:
+                    targets.append((namespace, entry))
+        return targets
+
+    def _wait_for_scale_poll(self, deployment_name: str, namespace: str,
+                             scale_number: int, max_wait_time: int) -> bool:
+        """Wait for a scale operation by polling the deployment
         
         Args:
             deployment_name: Name of the deployment
-            namespace: Optional namespace of the deployment
+            namespace: Namespace of the deployment
+            scale_number: Target number of replicas
+            max_wait_time: Maximum time to wait in seconds
             
         Returns:
-            str: Formatted deployment information
+            bool: True if the target was reached, False on timeout
         """
-        try:
-            if namespace:
-                deployment = self.apps_api.read_namespaced_deployment(
-                    deployment_name,
-                    namespace,
+        deadline = time.monotonic() + max_wait_time
+        for deployment in self.watch_deployment(deployment_name, namespace, deadline, wait_mode="poll"):
+            if self.scale_reached(deployment, scale_number):
+                logger.info(f"Successfully scaled {deployment_name} to {scale_number} replicas")
+                return True
+            logger.debug(
+                f"Current replicas: {deployment.status.replicas}, "
+                f"ready: {deployment.status.ready_replicas}, target: {scale_number}"
+            )
+        return False
+
+    def _wait_for_scale_watch(self, deployment_name: str, namespace: str,
+                              scale_number: int, scale_response,
+                              max_wait_time: int) -> bool:
+        """Wait for a scale operation by watching the deployment
         
-                )
-                logger.info(f"Retrieving info for deployment {deployment_name} in namespace {namespace}")
+        The watch starts from the resourceVersion of the patch response, so no
+        update made after the patch can be missed.
+        
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Namespace of the deployment
+            scale_number: Target number of replicas
+            scale_response: V1Scale returned by the scale patch
+            max_wait_time: Maximum time to wait in seconds
+            
+        Returns:
+            bool: True if the target was reached, False on timeout
+        """
+        deadline = time.monotonic() + max_wait_time
+        resource_version = scale_response.metadata.resource_version
+        
+        # A no-op patch does not produce a watch event, so check the current
+        # state once when the scale subresource already reports the target
+        if scale_response.status.replicas == scale_number:
+            deployment = self.apps_api.read_namespaced_deployment_status(
+                deployment_name,
+                namespace,
+                _request_timeout=self.request_timeout
+            )
+            if self.scale_reached(deployment, scale_number):
+                logger.info(f"Successfully scaled {deployment_name} to {scale_number} replicas")
+                return True
+            resource_version = deployment.metadata.resource_version
+        
+        for deployment in self.watch_deployment(deployment_name, namespace, deadline, resource_version):
+            if self.scale_reached(deployment, scale_number):
+                logger.info(f"Successfully scaled {deployment_name} to {scale_number} replicas")
+                return True
+            logger.debug(
+                f"Current replicas: {deployment.status.replicas}, "
+                f"ready: {deployment.status.ready_replicas}, target: {scale_number}"
+            )
+        return False
+
+    def watch_deployment(self, deployment_name: str, namespace: str, deadline: float,
+                         resource_version: Optional[str] = None,
+                         wait_mode: str = "watch") -> Iterator:
+        """Yield a deployment every time it changes, until the deadline
+        
+        In watch mode the deployment is watched from resource_version, or
+        read once first when it is None. Bookmarks keep the resume point
+        fresh, a closed stream is resumed from the last seen version and an
+        expired version (410 Gone) falls back to a fresh single-object list.
+        If the watch itself fails, or in poll mode, the deployment is polled
+        with an adaptive backoff: the interval doubles up to
+        POLL_MAX_INTERVAL while nothing changes and drops back to
+        POLL_MIN_INTERVAL after every change.
+        
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Namespace of the deployment
+            deadline: time.monotonic() value after which to stop
+            resource_version: Optional resourceVersion to watch from
+            wait_mode: "watch" or "poll"
+            
+        Yields:
+            V1Deployment: The deployment after each change
+            
+        Raises:
+            RuntimeError: If the deployment is deleted
+        """
+        if wait_mode == "watch":
+            try:
+                yield from self._watch_deployment_stream(deployment_name, namespace, deadline, resource_version)
+                return
+            except ApiException as e:
+                if e.status == 404:
+                    raise
+                logger.warning(f"Watch on {deployment_name} failed, polling instead: {e}")
+        
+        interval = POLL_MIN_INTERVAL
+        while time.monotonic() < deadline:
+            deployment = self.apps_api.read_namespaced_deployment(
+                deployment_name,
+                namespace,
+                _request_timeout=self.request_timeout
+            )
+            if deployment.metadata.resource_version != resource_version:
+                resource_version = deployment.metadata.resource_version
+                interval = POLL_MIN_INTERVAL
+                yield deployment
             else:
-                # Display the first deployment if namespace and name not provided
-                # This behavior is as specified in the requirements comment
-                result = self.apps_api.list_deployment_for_all_namespaces(
-                    limit=1,
+                interval = min(interval * 2, POLL_MAX_INTERVAL)
+            time.sleep(max(0, min(interval, deadline - time.monotonic())))
+
+    def _watch_deployment_stream(self, deployment_name: str, namespace: str, deadline: float,
+                                 resource_version: Optional[str]) -> Iterator:
+        """Watch one deployment, resuming closed and expired streams"""
+        field_selector = f"metadata.name={deployment_name}"
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            
+            if resource_version is None:
+                deployments = self.apps_api.list_namespaced_deployment(
+                    namespace,
+                    field_selector=field_selector,
                     timeout_seconds=self.timeout
                 )
-                if not result.items:
-                    return "No deployments found in the cluster"
-                deployment = result.items[0]
-                logger.info(f"No specific deployment requested, showing first found: {deployment.metadata.name}")
+                resource_version = deployments.metadata.resource_version
+                if not deployments.items:
+                    raise RuntimeError(f"Deployment {deployment_name} not found in namespace {namespace}")
+                yield from deployments.items
             
+            watcher = watch.Watch()
+            try:
+                for event in watcher.stream(
+                    self.apps_api.list_namespaced_deployment,
+                    namespace,
+                    field_selector=field_selector,
+                    resource_version=resource_version,
+                    allow_watch_bookmarks=True,
+                    timeout_seconds=max(1, int(remaining))
+                ):
+                    if event['type'] == 'BOOKMARK':
+                        resource_version = event['raw_object']['metadata']['resourceVersion']
+                        continue
+                    
+                    deployment = event['object']
+                    resource_version = deployment.metadata.resource_version
+                    
+                    if event['type'] == 'DELETED':
+                        watcher.stop()
+                        raise RuntimeError(f"Deployment {deployment_name} was deleted")
+                    
+                    yield deployment
+            except ApiException as e:
+                if e.status != 410:
+                    raise
+                logger.debug(f"Watch resourceVersion {resource_version} expired, relisting")
+                resource_version = None
+            finally:
+                watcher.stop()
+            
+            logger.debug(f"Watch on {deployment_name} closed, resuming from resourceVersion {resource_version}")
 
-            output = "Deployment Info:\n"
-            output += f"Name: {deployment.metadata.name}, Namespace: {deployment.metadata.namespace}\n"
-            output += f"Replicas: Desired={deployment.spec.replicas}, "
-            output += f"Ready={deployment.status.ready_replicas if deployment.status.ready_replicas is not None else 0}, "
-            output += f"Available={deployment.status.available_replicas if deployment.status.available_replicas is not None else 0}\n"
+    @staticmethod
+    def scale_reached(deployment, scale_number: int) -> bool:
+        """Check whether a deployment status reflects the requested scale
+        
+        Args:
+            deployment: V1Deployment object
+            scale_number: Target number of replicas
             
+        Returns:
+            bool: True if total and ready replicas match the target
+        """
+        status = deployment.status
+        if (status.observed_generation or 0) < (deployment.metadata.generation or 0):
+            return False
+        return ((status.replicas or 0) == scale_number and
+                (status.ready_replicas or 0) == scale_number)
 
-            output += "Containers:\n"
-            for container in deployment.spec.template.spec.containers:
-                output += f"  {container.name} ({container.image})\n"
-                
-                requests = container.resources.requests or {}
-                limits = container.resources.limits or {}
-                
-                output += f"    Requests: CPU={requests.get('cpu', 'N/A')}, Memory={requests.get('memory', 'N/A')}\n"
-                output += f"    Limits: CPU={limits.get('cpu', 'N/A')}, Memory={limits.get('memory', 'N/A')}\n"
-                
-            output += "-" * 50 + "\n"
-            return output
+    def retrieve_deployment_info(self, deployment_name: str,
+                                 namespace: Optional[str] = None) -> Union[DeploymentInfo, ErrorResult]:
+        """Get detailed information about a deployment
+        
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Optional namespace of the deployment, located through
+                the namespace index when omitted
+            
+        Returns:
+            Union[DeploymentInfo, ErrorResult]: Deployment information or the failure
+        """
+        try:
+            try:
+                namespace, deployment = self.call_in_namespace(
+                    deployment_name,
+                    namespace,
+                    lambda located: self.read_deployment(deployment_name, located)
+                )
+            except LookupError as e:
+                return ErrorResult(f"Error: {e}")
+            logger.info(f"Retrieving info for deployment {deployment_name} in namespace {namespace}")
+            return self.deployment_info(deployment)
             
         except Exception as e:
             error_msg = f"Error retrieving deployment info: {e}"
             logger.error(error_msg)
-            return error_msg
\ No newline at end of file
+            return ErrorResult(error_msg)
+
+    def read_deployment(self, deployment_name: str, namespace: str):
+        """Read a deployment, from the informer cache when available
+        
+        Objects missing from the cache are read from the API, which also
+        reports the usual not found error.
+        
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Namespace of the deployment
+            
+        Returns:
+            V1Deployment: The deployment
+        """
+        if self.informers:
+            deployment = self.informers.deployments.get(namespace, deployment_name)
+            if deployment is not None:
+                return deployment
+        return self.apps_api.read_namespaced_deployment(
+            deployment_name,
+            namespace,
+            _request_timeout=self.request_timeout
+        )
+
+    @staticmethod
+    def deployment_info(deployment) -> DeploymentInfo:
+        """Extract the details of a deployment
+        
+        Args:
+            deployment: V1Deployment object
+            
+        Returns:
+            DeploymentInfo: Replica counts and containers of the deployment
+        """
+        containers = []
+        for container in deployment.spec.template.spec.containers:
+            requests = container.resources.requests or {}
+            limits = container.resources.limits or {}
+            containers.append(ContainerSpec(
+                container.name,
+                container.image,
+                parse_cpu(requests.get('cpu')),
+                parse_memory(requests.get('memory')),
+                parse_cpu(limits.get('cpu')),
+                parse_memory(limits.get('memory'))
+            ))
+        
+        return DeploymentInfo(
+            deployment.metadata.name,
+            deployment.metadata.namespace,
+            deployment.spec.replicas,
+            deployment.status.ready_replicas if deployment.status.ready_replicas is not None else 0,
+            deployment.status.available_replicas if deployment.status.available_replicas is not None else 0,
+            containers
+        )
@@ -1,8 +1,21 @@
+import json
 import logging
-from typing import Optional
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple, Union
+
+from clients.informer import Informer
+from utils.label_selector import selector_to_string
+from utils.results import (DeploymentDiagnostic, DiagnosticUpdate, ErrorResult, EventSummary, ReplicaSetStatus,
+                           Result, RolloutProgress, RolloutResult)
+from utils.timings import StageTimings
 
 logger = logging.getLogger("sre-tool")
 
+# Seconds to wait for the rest of a burst of watch events before reporting them
+WATCH_DEBOUNCE = 0.2
+
 class DiagnosticsManager:
     """Handles diagnostic operations for Kubernetes resources"""
     
@@ -18,121 +31,585 @@ class DiagnosticsManager:
         self.apps_api = k8s_client.apps_api
         self.deployment_manager = deployment_manager
         self.pod_manager = pod_manager
+        self.informers = deployment_manager.informers
         self.timeout = k8s_client.timeout
         
     def deployment_diagnostics(self, deployment_name: str, 
                               namespace: Optional[str] = None,
-                              pod_name: Optional[str] = None) -> str:
+                              pod_name: Optional[str] = None,
+                              include_metrics: bool = True,
+                              include_node_metrics: bool = False,
+                              timings: Optional[StageTimings] = None,
+                              include_events: bool = True) -> Union[DeploymentDiagnostic, ErrorResult]:
         """Perform diagnostics on a deployment
         
+        The API calls form a small dependency graph: the namespace lookup and
+        the deployment read come first, then the ReplicaSet list and the
+        namespace's warning events run concurrently. The pod list and the pod
+        metrics wait for the ReplicaSets so that the API server only returns
+        the pods of the live ones (see pod_selector), and run while the
+        events are still being read. Node metrics depend on the pods and run
+        last.
+        
         Args:
             deployment_name: Name of the deployment
             namespace: Optional namespace of the deployment
             pod_name: Optional specific pod to diagnose
+            include_metrics: Include pod usage from metrics.k8s.io
+            include_node_metrics: Include usage of the nodes hosting the pods
+            timings: Optional StageTimings recording per-stage latency
+            include_events: Include the warning events of the deployment,
+                its ReplicaSets and its pods
             
         Returns:
-            str: Formatted diagnostic information
+            Union[DeploymentDiagnostic, ErrorResult]: Diagnostic information or the failure
         """
+        timings = timings or StageTimings()
         try:
-            deployment_output = self.deployment_manager.retrieve_deployment_info(
-                deployment_name, namespace
-            )
-            
-            if not namespace:
-                namespace = self.deployment_manager.locate_deployment_namespace(deployment_name)
-                if "not found" in namespace or "Exception" in namespace:
-                    return f"{deployment_output}\nError: {namespace}"
-
             try:
-                replica_sets_list = self.apps_api.list_namespaced_replica_set(
+                namespace, deployment = self.deployment_manager.call_in_namespace(
+                    deployment_name,
                     namespace,
-                    timeout_seconds=self.timeout
+                    lambda located: timings.timed(
+                        "read deployment",
+                        self.deployment_manager.read_deployment,
+                        deployment_name,
+                        located
+                    ),
+                    timings
                 )
+            except LookupError as e:
+                return ErrorResult(f"Error: {e}")
+            diagnostic = DeploymentDiagnostic(self.deployment_manager.deployment_info(deployment))
+            label_selector = selector_to_string(deployment.spec.selector)
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                events_future = None
+                if include_events:
+                    events_future = executor.submit(timings.timed, "list events", self.list_warning_events, namespace)
                 
-                replica_set_name = None
-                for rs in replica_sets_list.items:
-                    if (rs.metadata.owner_references and
-                        rs.metadata.owner_references[0].kind == 'Deployment' and 
-                        rs.metadata.owner_references[0].name == deployment_name):
-                        replica_set_name = rs.metadata.name
-                        break
+                try:
+                    replica_sets = timings.timed(
+                        "list replicasets",
+                        self.live_replica_sets, deployment, label_selector
+                    )
+                    if not replica_sets:
+                        diagnostic.error = f"Error: No ReplicaSet found for deployment {deployment_name}"
+                        return diagnostic
                         
-                if not replica_set_name:
-                    return f"{deployment_output}\nError: No ReplicaSet found for deployment {deployment_name}"
-                    
-            except Exception as e:
-                logger.error(f"Error finding ReplicaSet: {e}")
-                return f"{deployment_output}\nError finding ReplicaSet: {e}"
-            
-            pod_status = self.pod_manager.get_pods_status(namespace, replica_set_name, pod_name)
-            
-            all_pod_outputs = []
-            for pod in pod_status:
-                if "error" in pod:
-                    all_pod_outputs.append(f"Pod Info Error: {pod['error']}")
-                    continue
-                    
-                container_info = []
-                for c in pod['containers']:
-                    container_image = f"{c['name']}({c['image']})"
-                    container_str = f"[CPU request: {c.get('cpu_request', 'N/A')}, "
-                    container_str += f"CPU limit: {c.get('cpu_limit', 'N/A')}, "
-                    
-                    if c.get('cpu_usage') != 'N/A':
-                        container_str += f"CPU usage: {c.get('cpu_usage', 'N/A')}"
-                        if c.get('cpu_usage_percentage') != 'N/A':
-                            container_str += f" ({c.get('cpu_usage_percentage', 'N/A')}), "
-                        else:
-                            container_str += ", "
-                    
-                    container_str += f"Memory request: {c.get('memory_request', 'N/A')}, "
-                    container_str += f"Memory limit: {c.get('memory_limit', 'N/A')}"
-                    
-                    if c.get('memory_usage') != 'N/A':
-                        container_str += f", Memory usage: {c.get('memory_usage', 'N/A')}"
-                        if c.get('memory_usage_percentage') != 'N/A':
-                            container_str += f" ({c.get('memory_usage_percentage', 'N/A')})"
-                    
-                    container_str += "]"
-                    container_info.append(container_str)
-                
-                conditions_str = ", ".join([
-                    f"{cond['type']}:{cond['status']}" for cond in pod['conditions']
-                ])
-                
-                pod_output = "Pod Info:\n"
-                pod_output += f"Name: {pod['name']}, Namespace: {pod['namespace']}\n"
-                pod_output += f"Node: {pod.get('node', 'N/A')}\n"
-                pod_output += f"Phase: {pod['phase']}, Reason: {pod.get('reason', 'N/A')}\n"
-                pod_output += f"Conditions: {conditions_str}\n"
+                except Exception as e:
+                    logger.error(f"Error finding ReplicaSet: {e}")
+                    diagnostic.error = f"Error finding ReplicaSet: {e}"
+                    return diagnostic
                 
-                if pod.get('container_reasons'):
-                    pod_output += f"Container Issues: {', '.join(pod['container_reasons'])}\n"
-                
-                for idx, c in enumerate(pod['containers']):
-                    pod_output += f"Container {idx+1}: {c['name']} ({c['image']})\n"
-                    pod_output += f"  Resource Requests: CPU={c.get('cpu_request', 'N/A')}, Memory={c.get('memory_request', 'N/A')}\n"
-                    pod_output += f"  Resource Limits: CPU={c.get('cpu_limit', 'N/A')}, Memory={c.get('memory_limit', 'N/A')}\n"
-                    
-                    if c.get('cpu_usage') != 'N/A' or c.get('memory_usage') != 'N/A':
-                        pod_output += f"  Current Usage: CPU={c.get('cpu_usage', 'N/A')}"
-                        if c.get('cpu_usage_percentage') != 'N/A':
-                            pod_output += f" ({c.get('cpu_usage_percentage', 'N/A')})"
-                        pod_output += f", Memory={c.get('memory_usage', 'N/A')}"
-                        if c.get('memory_usage_percentage') != 'N/A':
-                            pod_output += f" ({c.get('memory_usage_percentage', 'N/A')})"
-                        pod_output += "\n"
-                
-                pod_output += "-" * 50 + "\n"
-                all_pod_outputs.append(pod_output)
+                live_names = {rs.metadata.name for rs in replica_sets}
+                pod_results = self.pod_manager.get_pods_status(
+                    namespace,
+                    list(live_names),
+                    pod_name,
+                    label_selector=self.pod_selector(label_selector, replica_sets),
+                    include_metrics=include_metrics,
+                    include_node_metrics=include_node_metrics,
+                    timings=timings
+                )
+                events = events_future.result() if events_future else []
             
-            output = deployment_output
-            for pod_output in all_pod_outputs:
-                output += pod_output
+            diagnostic.replica_sets = self.replica_set_statuses(replica_sets)
+            diagnostic.events = self.event_summaries(events, deployment_name, live_names, pod_name)
+            for pod in pod_results:
+                if isinstance(pod, ErrorResult):
+                    diagnostic.pod_errors.append(pod.message)
+                elif pod.replicaset in live_names:
+                    diagnostic.pods.append(pod)
                 
-            return output
+            return diagnostic
             
         except Exception as e:
             error_msg = f"Error performing diagnostics: {e}"
             logger.error(error_msg)
-            return error_msg
\ No newline at end of file
+            return ErrorResult(error_msg)
+
+    def rollout_status(self, deployment_name: str, namespace: Optional[str] = None,
+                       timeout: int = 600, wait_mode: str = "watch") -> Iterator[Result]:
+        """Follow a deployment rollout until it completes, fails or times out
+        
+        The rollout is complete once the controller has observed the latest
+        spec and every desired replica is updated and available with no old
+        replica left, like kubectl rollout status. It fails as soon as the
+        Progressing condition reports ProgressDeadlineExceeded. The
+        deployment is watched (or polled with an adaptive backoff, see
+        DeploymentManager.watch_deployment) and its live ReplicaSets are only
+        listed when the deployment changes.
+        
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Optional namespace of the deployment
+            timeout: Maximum time to wait in seconds
+            wait_mode: How to follow the deployment, "watch" or "poll"
+            
+        Yields:
+            Result: RolloutProgress every time the rollout changes, then a
+                RolloutResult
+        """
+        start_time = time.monotonic()
+        
+        def result(status: str, message: str) -> RolloutResult:
+            return RolloutResult(namespace, deployment_name, status, message, time.monotonic() - start_time)
+        
+        try:
+            if not namespace:
+                located = self.deployment_manager.locate_deployment_namespace(deployment_name)
+                if "not found" in located or "Exception" in located:
+                    yield result("Failed", located)
+                    return
+                namespace = located
+            
+            last_progress = None
+            for deployment in self.deployment_manager.watch_deployment(
+                deployment_name, namespace, start_time + timeout, wait_mode=wait_mode
+            ):
+                state, message = self.rollout_state(deployment)
+                status = deployment.status
+                progress = RolloutProgress(
+                    namespace,
+                    deployment_name,
+                    deployment.spec.replicas if deployment.spec.replicas is not None else 1,
+                    status.updated_replicas or 0,
+                    status.ready_replicas or 0,
+                    status.available_replicas or 0,
+                    self.replica_set_statuses(
+                        self.live_replica_sets(deployment, selector_to_string(deployment.spec.selector))
+                    ),
+                    message,
+                    time.monotonic() - start_time
+                )
+                # Only report changes, not every resync of the same state
+                progress_key = dict(progress.to_dict(), elapsed=None)
+                if progress_key != last_progress:
+                    last_progress = progress_key
+                    yield progress
+                
+                if state == "Complete":
+                    logger.info(message)
+                    yield result("Complete", message)
+                    return
+                if state == "Failed":
+                    logger.error(message)
+                    yield result("Failed", message)
+                    return
+            
+            warning_msg = f"Rollout of {deployment_name} did not complete within {timeout} seconds"
+            logger.warning(warning_msg)
+            yield result("Timeout", warning_msg)
+            
+        except Exception as e:
+            error_msg = f"Error when following rollout: {e}"
+            logger.error(error_msg)
+            yield result("Failed", error_msg)
+
+    def watch_diagnostics(self, deployment_name: str, namespace: Optional[str] = None,
+                          pod_name: Optional[str] = None,
+                          include_metrics: bool = True,
+                          include_node_metrics: bool = False,
+                          metrics_interval: float = 30,
+                          timeout: Optional[float] = None) -> Iterator[Result]:
+        """Diagnose a deployment, then report its changes as they happen
+
+        The deployment, its ReplicaSets and its pods are listed once into
+        namespaced informers whose watches apply every later change in
+        memory. The diagnostic is rebuilt from the stores when they change
+        and only the differences are reported, so nothing but the watches
+        and the periodic metrics refresh reaches the API server between
+        changes.
+
+        Args:
+            deployment_name: Name of the deployment
+            namespace: Optional namespace of the deployment
+            pod_name: Optional specific pod to diagnose
+            include_metrics: Include pod usage, refreshed every metrics_interval
+            include_node_metrics: Include usage of the nodes hosting the pods
+            metrics_interval: Seconds between two refreshes of the metrics
+            timeout: Optional time to watch in seconds, until interrupted by default
+
+        Yields:
+            Result: A DeploymentDiagnostic, then a DiagnosticUpdate every time
+                the deployment, its ReplicaSets or its pods change, or an
+                ErrorResult
+        """
+        start_time = time.monotonic()
+        changes = queue.Queue()
+        informers = []
+
+        def informer(kind: str, list_func, **list_kwargs) -> Informer:
+            watched = Informer(kind, list_func, self.timeout, list_args=(namespace,), list_kwargs=list_kwargs,
+                               on_change=lambda: changes.put(kind))
+            informers.append(watched)
+            return watched
+
+        try:
+            if not namespace:
+                namespace = self.deployment_manager.locate_deployment_namespace(deployment_name)
+                if "not found" in namespace or "Exception" in namespace:
+                    yield ErrorResult(f"Error: {namespace}")
+                    return
+
+            deployments = informer("deployment", self.apps_api.list_namespaced_deployment,
+                                   field_selector=f"metadata.name={deployment_name}")
+            deployments.start()
+            deployment = deployments.store.get(namespace, deployment_name)
+            if deployment is None:
+                yield ErrorResult(f"Error: Deployment {deployment_name} not found in namespace {namespace}")
+                return
+            label_selector = selector_to_string(deployment.spec.selector)
+            replica_sets = informer("replicasets", self.apps_api.list_namespaced_replica_set,
+                                    label_selector=label_selector)
+            pods = informer("pods", self.pod_manager.core_api.list_namespaced_pod, label_selector=label_selector,
+                            field_selector=f"metadata.name={pod_name}" if pod_name else None)
+
+            def fetch_metrics():
+                metrics_index = self.pod_manager.fetch_pod_metrics(namespace, pod_name, label_selector)
+                node_usage = {}
+                if include_node_metrics:
+                    node_usage = self.pod_manager.fetch_node_usage(
+                        {pod.spec.node_name for pod in pods.store.list() if pod.spec.node_name}
+                    )
+                return metrics_index, node_usage
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                pods_started = executor.submit(pods.start)
+                replica_sets.start()
+                pods_started.result()
+            refresh_metrics = include_metrics or include_node_metrics
+            metrics = fetch_metrics() if refresh_metrics else ({}, {})
+            next_metrics = time.monotonic() + metrics_interval if refresh_metrics else None
+            deadline = start_time + timeout if timeout else None
+
+            diagnostic = self._stored_diagnostic(deployments.store, replica_sets.store, pods.store, *metrics)
+            if diagnostic is None:
+                yield ErrorResult(f"Error: Deployment {deployment_name} was deleted")
+                return
+            yield diagnostic
+
+            while deadline is None or time.monotonic() < deadline:
+                wake_up = min((t for t in (next_metrics, deadline) if t is not None), default=None)
+                try:
+                    changes.get(timeout=max(0, wake_up - time.monotonic()) if wake_up else None)
+                    # Events of one transition arrive in a burst, report them together
+                    time.sleep(WATCH_DEBOUNCE)
+                    while not changes.empty():
+                        changes.get_nowait()
+                except queue.Empty:
+                    pass
+                if next_metrics and time.monotonic() >= next_metrics:
+                    metrics = fetch_metrics()
+                    next_metrics = time.monotonic() + metrics_interval
+
+                current = self._stored_diagnostic(deployments.store, replica_sets.store, pods.store, *metrics)
+                if current is None:
+                    yield ErrorResult(f"Error: Deployment {deployment_name} was deleted")
+                    return
+                update = self._diagnostic_update(diagnostic, current, time.monotonic() - start_time)
+                diagnostic = current
+                if update is not None:
+                    yield update
+
+        except Exception as e:
+            error_msg = f"Error when watching diagnostics: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+        finally:
+            for watched in informers:
+                watched.stop()
+
+    def deployment_logs(self, deployment_name: str, patterns: List[str],
+                        namespace: Optional[str] = None, **scan_options) -> Iterator[Result]:
+        """Scan the logs of every pod of a deployment for the lines explaining its failures
+
+        Args:
+            deployment_name: Name of the deployment
+            patterns: Patterns to match, see PodManager.scan_logs
+            namespace: Optional namespace of the deployment
+            **scan_options: Matching and streaming options of PodManager.scan_logs
+
+        Yields:
+            Result: LogMatch for every matching line, then a LogScanSummary,
+                or a single ErrorResult
+        """
+        try:
+            try:
+                namespace, deployment = self.deployment_manager.call_in_namespace(
+                    deployment_name,
+                    namespace,
+                    lambda located: self.deployment_manager.read_deployment(deployment_name, located)
+                )
+            except LookupError as e:
+                yield ErrorResult(f"Error: {e}")
+                return
+            label_selector = selector_to_string(deployment.spec.selector)
+        except Exception as e:
+            error_msg = f"Error when reading deployment: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+            return
+
+        yield from self.pod_manager.scan_logs(namespace, label_selector, patterns, **scan_options)
+
+    def _stored_diagnostic(self, deployments, replica_sets, pods, metrics_index,
+                           node_usage) -> Optional[DeploymentDiagnostic]:
+        """Build a diagnostic from the informer stores of watch_diagnostics"""
+        deployment = next(iter(deployments.list()), None)
+        if deployment is None:
+            return None
+        live = self.select_live_replica_sets(self.owned_replica_sets(deployment, replica_sets.list()))
+        live_names = {rs.metadata.name for rs in live}
+        diagnostic = DeploymentDiagnostic(self.deployment_manager.deployment_info(deployment),
+                                          self.replica_set_statuses(live))
+        for pod in self.pod_manager.pod_statuses(pods.list(), metrics_index):
+            if pod.replicaset in live_names:
+                pod.node_usage = node_usage.get(pod.node)
+                diagnostic.pods.append(pod)
+        return diagnostic
+
+    @staticmethod
+    def _diagnostic_update(previous: DeploymentDiagnostic, current: DeploymentDiagnostic,
+                           elapsed: float) -> Optional[DiagnosticUpdate]:
+        """Compare two diagnostics, None when nothing changed"""
+        previous_pods = {pod.name: pod.to_dict() for pod in previous.pods}
+        current_names = {pod.name for pod in current.pods}
+        update = DiagnosticUpdate(
+            current.deployment.namespace,
+            current.deployment.name,
+            elapsed,
+            current.deployment if current.deployment != previous.deployment else None,
+            current.replica_sets if current.replica_sets != previous.replica_sets else None,
+            [pod for pod in current.pods if previous_pods.get(pod.name) != pod.to_dict()],
+            sorted(name for name in previous_pods if name not in current_names)
+        )
+        if update.deployment or update.replica_sets is not None or update.pods or update.removed_pods:
+            return update
+        return None
+
+    @staticmethod
+    def rollout_state(deployment) -> Tuple[str, str]:
+        """Classify the rollout of a deployment
+        
+        Args:
+            deployment: V1Deployment object
+            
+        Returns:
+            Tuple[str, str]: "Progressing", "Complete" or "Failed", and a
+                message describing what the rollout is waiting for
+        """
+        name = deployment.metadata.name
+        status = deployment.status
+        if (status.observed_generation or 0) < (deployment.metadata.generation or 0):
+            return "Progressing", f"Waiting for deployment {name} spec update to be observed"
+        
+        for condition in status.conditions or []:
+            if condition.type == "Progressing" and condition.reason == "ProgressDeadlineExceeded":
+                return "Failed", f"Deployment {name} exceeded its progress deadline: {condition.message}"
+        
+        desired = deployment.spec.replicas if deployment.spec.replicas is not None else 1
+        updated = status.updated_replicas or 0
+        available = status.available_replicas or 0
+        if updated < desired:
+            return "Progressing", f"{updated} out of {desired} new replicas have been updated"
+        if (status.replicas or 0) > updated:
+            return "Progressing", f"{(status.replicas or 0) - updated} old replicas are pending termination"
+        if available < updated:
+            return "Progressing", f"{available} of {updated} updated replicas are available"
+        return "Complete", f"Deployment {name} successfully rolled out"
+
+    def list_warning_events(self, namespace: str, page_size: int = 500) -> List[dict]:
+        """List the warning events of a namespace
+        
+        One namespace-scoped list, field-selected on the event type, covers
+        the deployment, its ReplicaSets and every pod at once, so it can
+        start before the pod names are known. Events are read as raw JSON
+        like the sweep's lists.
+        
+        Args:
+            namespace: Namespace of the events
+            page_size: Number of events requested per API call
+            
+        Returns:
+            List[dict]: Raw Event objects, empty if events are unavailable
+        """
+        try:
+            events = []
+            continue_token = None
+            while True:
+                response = self.pod_manager.core_api.list_namespaced_event(
+                    namespace,
+                    field_selector="type=Warning",
+                    limit=page_size,
+                    _continue=continue_token,
+                    timeout_seconds=self.timeout,
+                    _preload_content=False
+                )
+                result = json.loads(response.data)
+                events.extend(result.get('items') or [])
+                continue_token = result.get('metadata', {}).get('continue')
+                if not continue_token:
+                    return events
+        except Exception as e:
+            logger.warning(f"Unable to get events: {e}")
+            return []
+
+    @staticmethod
+    def event_summaries(events: List[dict], deployment_name: str, replica_set_names,
+                        pod_name: Optional[str] = None) -> List[EventSummary]:
+        """Group the events of a deployment's objects by reason
+        
+        Events are kept when they were reported on the deployment, on one
+        of the given ReplicaSets or on a pod of those ReplicaSets (or on
+        pod_name only when it is set), including pods that were already
+        replaced. Repeated events are deduplicated by summing their counts.
+        
+        Args:
+            events: Raw Event objects of the deployment's namespace
+            deployment_name: Name of the deployment
+            replica_set_names: Names of the deployment's ReplicaSets
+            pod_name: Optional specific pod whose events are kept
+            
+        Returns:
+            List[EventSummary]: One summary per reason, most recent first
+        """
+        pod_prefixes = tuple(f"{name}-" for name in replica_set_names)
+        summaries = {}
+        for event in events:
+            involved = event.get('involvedObject') or {}
+            kind, name = involved.get('kind'), involved.get('name') or ''
+            if kind == 'Pod':
+                relevant = name == pod_name if pod_name else name.startswith(pod_prefixes)
+            else:
+                relevant = (kind == 'Deployment' and name == deployment_name
+                            or kind == 'ReplicaSet' and name in replica_set_names)
+            if not relevant:
+                continue
+            
+            series = event.get('series') or {}
+            count = series.get('count') or event.get('count') or 1
+            last_seen = (series.get('lastObservedTime') or event.get('lastTimestamp') or event.get('eventTime')
+                         or event.get('metadata', {}).get('creationTimestamp'))
+            reason = event.get('reason') or 'Unknown'
+            summary = summaries.get(reason)
+            if summary is None:
+                summary = summaries[reason] = EventSummary(reason, 0, last_seen, event.get('message') or '')
+            summary.count += count
+            # RFC 3339 timestamps sort as strings
+            if last_seen and (summary.last_seen is None or last_seen >= summary.last_seen):
+                summary.last_seen = last_seen
+                summary.message = event.get('message') or ''
+            involved_object = f"{kind}/{name}"
+            if involved_object not in summary.objects:
+                summary.objects.append(involved_object)
+        
+        for summary in summaries.values():
+            summary.objects.sort()
+        return sorted(summaries.values(), key=lambda summary: summary.last_seen or '', reverse=True)
+
+    @classmethod
+    def replica_set_statuses(cls, replica_sets: List) -> List[ReplicaSetStatus]:
+        """Summarize live ReplicaSets, the first one being the current revision"""
+        return [
+            ReplicaSetStatus(
+                rs.metadata.name,
+                cls._revision(rs),
+                idx == 0,
+                rs.spec.replicas,
+                rs.status.ready_replicas or 0,
+                rs.status.available_replicas or 0
+            ) for idx, rs in enumerate(replica_sets)
+        ]
+
+    def live_replica_sets(self, deployment, label_selector: str) -> List:
+        """Find the live ReplicaSets of a deployment, newest revision first
+        
+        ReplicaSets are listed with the deployment's label selector and matched
+        by owner UID, or read from the informer cache's owner index. A ReplicaSet is live when it still has desired or running
+        replicas; the current revision is always included.
+        
+        Args:
+            deployment: V1Deployment object
+            label_selector: Label selector of the deployment
+            
+        Returns:
+            List: V1ReplicaSet objects sorted by revision, newest first
+        """
+        if self.informers:
+            owned = self.informers.replica_sets.by_owner(deployment.metadata.uid)
+        else:
+            replica_sets_list = self.apps_api.list_namespaced_replica_set(
+                deployment.metadata.namespace,
+                label_selector=label_selector,
+                timeout_seconds=self.timeout
+            )
+            owned = self.owned_replica_sets(deployment, replica_sets_list.items)
+        return self.select_live_replica_sets(owned)
+
+    @staticmethod
+    def pod_selector(label_selector: str, replica_sets: List) -> str:
+        """Restrict a deployment's label selector to the pods of its live ReplicaSets
+        
+        Pods of old revisions and of other controllers matching the
+        deployment's selector are then filtered out by the API server
+        instead of being transferred and dropped.
+        
+        Args:
+            label_selector: Label selector of the deployment
+            replica_sets: Live V1ReplicaSet objects of the deployment
+            
+        Returns:
+            str: Label selector with a pod-template-hash set requirement
+        """
+        template_hashes = sorted(
+            rs.metadata.labels['pod-template-hash'] for rs in replica_sets
+            if rs.metadata.labels and 'pod-template-hash' in rs.metadata.labels
+        )
+        if not template_hashes:
+            return label_selector
+        hash_selector = f"pod-template-hash in ({','.join(template_hashes)})"
+        return f"{label_selector},{hash_selector}" if label_selector else hash_selector
+
+    @staticmethod
+    def owned_replica_sets(deployment, replica_sets: List) -> List:
+        """Keep the ReplicaSets owned by a deployment
+        
+        Args:
+            deployment: V1Deployment object
+            replica_sets: V1ReplicaSet objects matching its label selector
+            
+        Returns:
+            List: V1ReplicaSet objects whose owner is the deployment
+        """
+        return [
+            rs for rs in replica_sets
+            if any(ref.uid == deployment.metadata.uid for ref in rs.metadata.owner_references or [])
+        ]
+
+    @classmethod
+    def select_live_replica_sets(cls, owned: List) -> List:
+        """Sort owned ReplicaSets newest first and keep the live ones
+        
+        Args:
+            owned: V1ReplicaSet objects owned by one deployment
+            
+        Returns:
+            List: The current revision and every ReplicaSet that still has
+                desired or running replicas
+        """
+        owned = sorted(owned, key=cls._revision, reverse=True)
+        return [
+            rs for idx, rs in enumerate(owned)
+            if idx == 0 or rs.spec.replicas or rs.status.replicas
+        ]
+
+    @staticmethod
+    def _revision(replica_set) -> int:
+        """Return the deployment revision recorded on a ReplicaSet"""
+        annotations = replica_set.metadata.annotations or {}
+        try:
+            return int(annotations.get('deployment.kubernetes.io/revision', 0))
+        except ValueError:
+            return 0
@@ -1,155 +1,564 @@
 import logging
-from typing import List, Dict, Any, Optional
-from kubernetes import client
+import queue
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
 
-from utils.resource_converter import convert_cpu_to_cores, convert_memory_to_bytes
+from utils.resource_converter import from_column, parse_cpu, parse_memory, to_column, utilization_percent
+from utils.results import (ContainerStatus, ErrorResult, LogMatch, LogScanSummary, NodeUsage, PodCondition,
+                           PodStatus, Result)
+from utils.timings import StageTimings
 
 logger = logging.getLogger("sre-tool")
 
+# Log streams are read and matched in chunks of this size
+LOG_CHUNK_SIZE = 64 * 1024
+# Longer log lines are truncated, so one runaway line cannot grow the buffer
+MAX_LOG_LINE_BYTES = 64 * 1024
+# Matches waiting to be rendered before the streams are paused
+LOG_QUEUE_SIZE = 1000
+
 class PodManager:
     """Manages Kubernetes pod operations"""
     
-    def __init__(self, k8s_client):
+    def __init__(self, k8s_client, informers=None):
         """Initialize with a Kubernetes client
         
         Args:
             k8s_client: Kubernetes client instance
+            informers: Optional InformerCache serving reads from memory
         """
         self.k8s_client = k8s_client
+        self.informers = informers
         self.core_api = k8s_client.core_api
+        self.metrics_api = k8s_client.custom_api
         self.timeout = k8s_client.timeout
+        self.request_timeout = k8s_client.request_timeout
+        
+    def get_pods_status(self, namespace: str, replicaset_name: Union[str, List[str], None], 
+                       pod_name: Optional[str] = None,
+                       label_selector: Optional[str] = None,
+                       include_metrics: bool = True,
+                       include_node_metrics: bool = False,
+                       timings: Optional[StageTimings] = None) -> List[Union[PodStatus, ErrorResult]]:
+        """Get detailed status of pods belonging to one or more ReplicaSets
         
-    def get_pods_status(self, namespace: str, replicaset_name: str, 
-                       pod_name: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get detailed status of pods belonging to a ReplicaSet
+        The pod list and the pod metrics request are issued concurrently.
         
         Args:
             namespace: Namespace of the pods
-            replicaset_name: Name of the parent ReplicaSet
+            replicaset_name: Name or list of names of the parent ReplicaSets,
+                None for pods of any ReplicaSet
             pod_name: Optional specific pod name to filter
+            label_selector: Optional label selector applied by the API server
+            include_metrics: Fetch pod usage from metrics.k8s.io
+            include_node_metrics: Fetch usage of the nodes hosting the pods
+            timings: Optional StageTimings recording per-stage latency
             
         Returns:
-            List[Dict]: Detailed pod information
+            List[Union[PodStatus, ErrorResult]]: Detailed pod information, or a
+                single ErrorResult on failure
         """
+        timings = timings or StageTimings()
         try:
-            pods_list = self.core_api.list_namespaced_pod(
-                namespace,
-                timeout_seconds=self.timeout
-            )
-            pods_data = []
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                pods_future = executor.submit(
+                    timings.timed, "list pods",
+                    self.list_pods, namespace, pod_name, label_selector
+                )
+                metrics_future = None
+                if include_metrics:
+                    metrics_future = executor.submit(
+                        timings.timed, "pod metrics",
+                        self.fetch_pod_metrics, namespace, pod_name, label_selector
+                    )
+                pods = pods_future.result()
+                metrics_index = metrics_future.result() if metrics_future else {}
+            pods_data = self.pod_statuses(pods, metrics_index, replicaset_name, pod_name)
+            
+            if include_node_metrics:
+                node_usage = timings.timed(
+                    "node metrics",
+                    self.fetch_node_usage,
+                    {pod.node for pod in pods_data if pod.node}
+                )
+                for pod in pods_data:
+                    if pod.node in node_usage:
+                        pod.node_usage = node_usage[pod.node]
+                    
+            return pods_data
+            
+        except Exception as e:
+            logger.error(f"Error getting pod status: {e}")
+            return [ErrorResult(f"Error: {e}")]
 
-            try:
-                metrics_api = client.CustomObjectsApi()
-                node_metrics = metrics_api.list_cluster_custom_object(
-                    "metrics.k8s.io", "v1beta1", "nodes", 
-                    timeout_seconds=self.timeout
+    @staticmethod
+    def container_reason(state) -> Optional[str]:
+        """Reason of a container that is not running
+        
+        The waiting reason, else the terminated reason. Shared by the
+        diagnostic, which reads SDK models, and the sweep, which reads raw
+        pods.
+        
+        Args:
+            state: V1ContainerState or the state of a raw container status
+            
+        Returns:
+            Optional[str]: Reason, None for a running container
+        """
+        if isinstance(state, dict):
+            waiting, terminated = state.get('waiting'), state.get('terminated')
+            if waiting:
+                return waiting.get('reason')
+            return terminated.get('reason') if terminated else None
+        if state is None:
+            return None
+        if state.waiting:
+            return state.waiting.reason
+        return state.terminated.reason if state.terminated else None
+
+    @classmethod
+    def pod_statuses(cls, pods: List, metrics_index: Dict[Tuple[str, str], Tuple],
+                     replicaset_name: Union[str, List[str], None] = None,
+                     pod_name: Optional[str] = None) -> List[PodStatus]:
+        """Build the status records of the pods owned by the given ReplicaSets
+        
+        Args:
+            pods: V1Pod objects
+            metrics_index: Index built by index_pod_metrics, empty without metrics
+            replicaset_name: Name or list of names of the parent ReplicaSets,
+                None for pods of any ReplicaSet
+            pod_name: Optional specific pod name to filter
+            
+        Returns:
+            List[PodStatus]: Status of every matching pod
+        """
+        if replicaset_name is None:
+            replicaset_names = None
+        elif isinstance(replicaset_name, str):
+            replicaset_names = {replicaset_name}
+        else:
+            replicaset_names = set(replicaset_name)
+        pods_data = []
+        for pod in pods:
+            if not pod.metadata.owner_references:
+                continue
+
+            if (pod.metadata.owner_references[0].kind == 'ReplicaSet' and 
+                (replicaset_names is None or
+                 pod.metadata.owner_references[0].name in replicaset_names)):
+
+                if pod_name and pod_name != pod.metadata.name:
+                    continue
+
+                container_statuses = pod.status.container_statuses or []
+                conditions = pod.status.conditions or []
+
+                container_reasons = []
+                for container_status in container_statuses:
+                    reason = cls.container_reason(container_status.state)
+                    if reason is not None:
+                        container_reasons.append(reason)
+
+                container_resources = []
+                for container in pod.spec.containers:
+                    requests = container.resources.requests or {}
+                    limits = container.resources.limits or {}
+
+                    container_resources.append(ContainerStatus(
+                        container.name,
+                        container.image,
+                        parse_cpu(requests.get("cpu")),
+                        parse_memory(requests.get("memory")),
+                        parse_cpu(limits.get("cpu")),
+                        parse_memory(limits.get("memory")),
+                        *cls.container_usage(metrics_index, pod.metadata.name, container.name)
+                    ))
+
+                pod_data = PodStatus(
+                    name=pod.metadata.name,
+                    namespace=pod.metadata.namespace,
+                    replicaset=pod.metadata.owner_references[0].name,
+                    phase=pod.status.phase,
+                    reason=pod.status.reason,
+                    node=pod.spec.node_name,
+                    start_time=pod.metadata.creation_timestamp.isoformat()
+                               if pod.metadata.creation_timestamp else None,
+                    conditions=[
+                        PodCondition(c.type, c.status, c.reason, c.message)
+                        for c in conditions
+                    ],
+                    container_reasons=container_reasons,
+                    containers=container_resources
                 )
-                pod_metrics = metrics_api.list_namespaced_custom_object(
+
+                pods_data.append(pod_data)
+
+        if metrics_index:
+            cls.fill_usage_percentages([c for pod in pods_data for c in pod.containers])
+        
+        return pods_data
+
+    def list_pods(self, namespace: str, pod_name: Optional[str] = None,
+                  label_selector: Optional[str] = None) -> List:
+        """List the pods of a namespace, from the informer cache when available
+        
+        Args:
+            namespace: Namespace of the pods
+            pod_name: Optional specific pod name to filter
+            label_selector: Optional label selector
+            
+        Returns:
+            List: V1Pod objects
+        """
+        if self.informers:
+            pods = self.informers.pods.list(namespace, label_selector)
+            return [pod for pod in pods if not pod_name or pod.metadata.name == pod_name]
+        
+        return self.core_api.list_namespaced_pod(
+            namespace,
+            label_selector=label_selector,
+            field_selector=f"metadata.name={pod_name}" if pod_name else None,
+            timeout_seconds=self.timeout
+        ).items
+
+    def fetch_pod_metrics(self, namespace: str, pod_name: Optional[str] = None,
+                          label_selector: Optional[str] = None) -> Dict[Tuple[str, str], Tuple]:
+        """Fetch and index pod metrics of the selected pods only
+        
+        Args:
+            namespace: Namespace of the pods
+            pod_name: Optional specific pod name
+            label_selector: Optional label selector of the pods
+            
+        Returns:
+            Dict: Index built by index_pod_metrics, empty if metrics are unavailable
+        """
+        try:
+            if pod_name:
+                pod_metric = self.metrics_api.get_namespaced_custom_object(
+                    "metrics.k8s.io", "v1beta1", namespace, "pods", pod_name,
+                    _request_timeout=self.request_timeout
+                )
+                pod_metrics = {'items': [pod_metric]}
+            else:
+                pod_metrics = self.metrics_api.list_namespaced_custom_object(
                     "metrics.k8s.io", "v1beta1", namespace, "pods",
+                    label_selector=label_selector,
                     timeout_seconds=self.timeout
                 )
-                metrics_available = True
+            return self.index_pod_metrics(pod_metrics)
+        except Exception as e:
+            logger.warning(f"Unable to get metrics: {e}")
+            return {}
+
+    def fetch_node_usage(self, node_names) -> Dict[str, NodeUsage]:
+        """Fetch usage of the given nodes concurrently
+        
+        Args:
+            node_names: Names of the nodes
+            
+        Returns:
+            Dict[str, NodeUsage]: Node name -> parsed usage of the node
+        """
+        def fetch(node_name):
+            try:
+                node_metric = self.metrics_api.get_cluster_custom_object(
+                    "metrics.k8s.io", "v1beta1", "nodes", node_name,
+                    _request_timeout=self.request_timeout
+                )
+                usage = node_metric['usage']
+                return node_name, NodeUsage(parse_cpu(usage.get('cpu')), parse_memory(usage.get('memory')))
             except Exception as e:
-                logger.warning(f"Unable to get metrics: {e}")
-                metrics_available = False
-                
-            for pod in pods_list.items:
+                logger.warning(f"Unable to get metrics for node {node_name}: {e}")
+                return node_name, None
+        
+        if not node_names:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(node_names), 8)) as executor:
+            return {
+                node_name: usage for node_name, usage in executor.map(fetch, node_names)
+                if usage
+            }
+
+    def scan_logs(self, namespace: str, label_selector: str, patterns: List[str],
+                  fixed_strings: bool = False, ignore_case: bool = False, context: int = 2,
+                  previous: bool = True, since_seconds: Optional[int] = None,
+                  tail_lines: Optional[int] = None, max_workers: int = 16) -> Iterator[Result]:
+        """Stream the logs of every container of the selected pods and report the matching lines
 
-                if not pod.metadata.owner_references:
+        Every container's log is streamed on a bounded thread pool and
+        matched chunk by chunk: chunks without a match only update the line
+        count and the ring buffer of context lines, so lines are split and
+        decoded only around matches. Memory stays bounded by the chunk size,
+        the context and the queue of matches waiting to be rendered,
+        however large the logs are.
+
+        Args:
+            namespace: Namespace of the pods
+            label_selector: Label selector of the pods
+            patterns: Regular expressions, or substrings with fixed_strings;
+                a line matches when any of them does
+            fixed_strings: Match the patterns as plain substrings
+            ignore_case: Match regardless of case
+            context: Number of lines reported before and after every match
+            previous: Also scan the logs of the previous instance of
+                restarted containers
+            since_seconds: Only scan logs newer than this many seconds
+            tail_lines: Only scan this many lines at the end of every log
+            max_workers: Maximum number of logs streamed at once
+
+        Yields:
+            Result: LogMatch as soon as its after-context is read, then a
+                LogScanSummary, or a single ErrorResult
+        """
+        start_time = time.monotonic()
+        try:
+            matcher = self.log_matcher(patterns, fixed_strings, ignore_case)
+            pods = self.list_pods(namespace, label_selector=label_selector)
+        except Exception as e:
+            error_msg = f"Error when preparing the log scan: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+            return
+
+        streams = []
+        for pod in pods:
+            statuses = {status.name: status for status in pod.status.container_statuses or []}
+            for container in pod.spec.containers:
+                status = statuses.get(container.name)
+                restarts = status.restart_count if status else 0
+                if status and (status.state.running or status.state.terminated or restarts):
+                    streams.append((pod.metadata.name, container.name, False))
+                if previous and restarts:
+                    streams.append((pod.metadata.name, container.name, True))
+
+        logger.info(f"Scanning {len(streams)} logs of {len(pods)} pods with {max_workers} workers")
+        found = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        stopped = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            # The queue is bounded: a slow consumer pauses the streams instead of buffering matches
+            while not stopped.is_set():
+                try:
+                    found.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
                     continue
-                    
-                if (pod.metadata.owner_references[0].kind == 'ReplicaSet' and 
-                    pod.metadata.owner_references[0].name == replicaset_name):
-                    
-                    if pod_name and pod_name != pod.metadata.name:
+            return False
+
+        def scan(stream: Tuple[str, str, bool]):
+            try:
+                counts = self._scan_log_stream(namespace, *stream, matcher, context, since_seconds, tail_lines,
+                                               put, stopped)
+                put((done, stream, counts, None))
+            except Exception as e:
+                put((done, stream, (0, 0), e))
+
+        lines = size = matches = 0
+        failed_streams = {}
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(streams))))
+        try:
+            for stream in streams:
+                executor.submit(scan, stream)
+            remaining = len(streams)
+            while remaining:
+                item = found.get()
+                if isinstance(item, LogMatch):
+                    matches += 1
+                    yield item
+                    continue
+                _, (pod_name, container, is_previous), (stream_lines, stream_bytes), error = item
+                remaining -= 1
+                lines += stream_lines
+                size += stream_bytes
+                if error is not None:
+                    key = f"{pod_name}/{container}" + (" (previous)" if is_previous else "")
+                    logger.warning(f"Unable to read logs of {key}: {error}")
+                    failed_streams[key] = f"{error}"
+        finally:
+            stopped.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        yield LogScanSummary(len(pods), len(streams), lines, size, matches,
+                             time.monotonic() - start_time, failed_streams)
+
+    def _scan_log_stream(self, namespace: str, pod_name: str, container: str, previous: bool,
+                         matcher: Callable[[bytes], bool], context: int,
+                         since_seconds: Optional[int], tail_lines: Optional[int],
+                         emit: Callable[[LogMatch], bool], stopped: threading.Event) -> Tuple[int, int]:
+        """Match one container log chunk by chunk, see scan_logs
+
+        Returns:
+            Tuple[int, int]: Number of lines and bytes read
+        """
+        response = self.core_api.read_namespaced_pod_log(
+            pod_name, namespace,
+            container=container,
+            previous=previous,
+            since_seconds=since_seconds,
+            tail_lines=tail_lines,
+            _preload_content=False,
+            _request_timeout=self.request_timeout
+        )
+        before = deque(maxlen=context)
+        # Matches still collecting their after-context, oldest first
+        pending = deque()
+        line_number = size = 0
+
+        def decode(line: bytes) -> str:
+            return line.decode("utf-8", "replace").rstrip("\r")
+
+        def scan_block(block: bytes):
+            nonlocal line_number
+            if not pending and not matcher(block):
+                # No match anywhere in the block: only keep its last lines as context
+                line_number += block.count(b"\n")
+                if context:
+                    before.extend(block.rsplit(b"\n", context + 1)[-context - 1:-1])
+                return
+            for line in block.split(b"\n")[:-1]:
+                line_number += 1
+                if pending:
+                    text = decode(line)
+                    for match in pending:
+                        match.after.append(text)
+                    while pending and len(pending[0].after) >= context:
+                        emit(pending.popleft())
+                if matcher(line):
+                    match = LogMatch(namespace, pod_name, container, previous, line_number, decode(line),
+                                     [decode(previous_line) for previous_line in before])
+                    if context:
+                        pending.append(match)
+                    else:
+                        emit(match)
+                before.append(line)
+
+        try:
+            remainder = b""
+            overlong = False
+            for chunk in response.stream(LOG_CHUNK_SIZE):
+                if stopped.is_set():
+                    break
+                size += len(chunk)
+                if overlong:
+                    # Drop the rest of a truncated line
+                    end = chunk.find(b"\n")
+                    if end < 0:
                         continue
-                    
-                    container_statuses = pod.status.container_statuses or []
-                    conditions = pod.status.conditions or []
-                    
-                    container_reasons = []
-                    for container_status in container_statuses:
-                        if container_status.state.waiting:
-                            container_reasons.append(container_status.state.waiting.reason)
-                        elif container_status.state.terminated:
-                            container_reasons.append(container_status.state.terminated.reason)
-                    
-                    container_resources = []
-                    for container in pod.spec.containers:
-                        requests = container.resources.requests or {}
-                        limits = container.resources.limits or {}
-                        
-                        resource_data = {
-                            "name": container.name,
-                            "image": container.image,
-                            "cpu_request": requests.get("cpu", "N/A"),
-                            "memory_request": requests.get("memory", "N/A"),
-                            "cpu_limit": limits.get("cpu", "N/A"),
-                            "memory_limit": limits.get("memory", "N/A"),
-                            "cpu_usage": "N/A",
-                            "memory_usage": "N/A",
-                            "cpu_usage_percentage": "N/A",
-                            "memory_usage_percentage": "N/A"
-                        }
-                        
-                        if metrics_available:
-                            try:
-                                for item in pod_metrics.get('items', []):
-                                    if item['metadata']['name'] == pod.metadata.name:
-                                        for container_metric in item['containers']:
-                                            if container_metric['name'] == container.name:
-                                                cpu_usage = container_metric['usage']['cpu']
-                                                memory_usage = container_metric['usage']['memory']
-                                                
-                                                if 'cpu' in requests and requests['cpu'] != "N/A":
-                                                    try:
-                                                        request_cpu = convert_cpu_to_cores(requests['cpu'])
-                                                        usage_cpu = convert_cpu_to_cores(cpu_usage)
-                                                        cpu_percentage = (usage_cpu / request_cpu) * 100
-                                                        resource_data["cpu_usage_percentage"] = f"{cpu_percentage:.1f}%"
-                                                    except:
-                                                        pass
-                                                
-                                                if 'memory' in requests and requests['memory'] != "N/A":
-                                                    try:
-                                                        request_mem = convert_memory_to_bytes(requests['memory'])
-                                                        usage_mem = convert_memory_to_bytes(memory_usage)
-                                                        mem_percentage = (usage_mem / request_mem) * 100
-                                                        resource_data["memory_usage_percentage"] = f"{mem_percentage:.1f}%"
-                                                    except:
-                                                        pass
-                                                        
-                                                resource_data["cpu_usage"] = cpu_usage
-                                                resource_data["memory_usage"] = memory_usage
-                            except Exception as e:
-                                logger.debug(f"Error calculating resource usage: {e}")
-                        
-                        container_resources.append(resource_data)
-                    
-                    pod_data = {
-                        "name": pod.metadata.name,
-                        "namespace": pod.metadata.namespace,
-                        "phase": pod.status.phase,
-                        "reason": pod.status.reason,
-                        "conditions": [
-                            {
-                                "type": c.type, 
-                                "status": c.status, 
-                                "reason": c.reason, 
-                                "message": c.message
-                            } for c in conditions
-                        ],
-                        "container_reasons": container_reasons,
-                        "containers": container_resources,
-                        "start_time": pod.metadata.creation_timestamp.isoformat() 
-                                     if pod.metadata.creation_timestamp else None,
-                        "node": pod.spec.node_name
-                    }
-                    
-                    pods_data.append(pod_data)
-                    
-            return pods_data
+                    chunk = chunk[end:]
+                    overlong = False
+                data = remainder + chunk
+                end = data.rfind(b"\n") + 1
+                remainder = data[end:]
+                if len(remainder) > MAX_LOG_LINE_BYTES:
+                    remainder = remainder[:MAX_LOG_LINE_BYTES]
+                    overlong = True
+                if end:
+                    scan_block(data[:end])
+            if remainder and not stopped.is_set():
+                scan_block(remainder + b"\n")
+            while pending:
+                emit(pending.popleft())
+        finally:
+            response.release_conn()
+        return line_number, size
+
+    @staticmethod
+    def log_matcher(patterns: List[str], fixed_strings: bool = False,
+                    ignore_case: bool = False) -> Callable[[bytes], bool]:
+        """Compile log patterns once into a matcher of raw log bytes
+
+        The matcher works on a single line as well as on a block of lines,
+        where a match on any of its lines is a match of the block.
+
+        Args:
+            patterns: Regular expressions, or substrings with fixed_strings
+            fixed_strings: Match the patterns as plain substrings
+            ignore_case: Match regardless of case
+
+        Returns:
+            Callable[[bytes], bool]: True when the bytes contain a match
+
+        Raises:
+            ValueError: If no pattern is given or a pattern is invalid
+        """
+        if not patterns:
+            raise ValueError("At least one pattern is required")
+        encoded = [pattern.encode("utf-8") for pattern in patterns]
+        if fixed_strings and not ignore_case:
+            return lambda data: any(substring in data for substring in encoded)
+
+        if fixed_strings:
+            encoded = [re.escape(pattern) for pattern in encoded]
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        try:
+            regex = re.compile(b"|".join(b"(?:" + pattern + b")" for pattern in encoded), flags)
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}") from e
+        return lambda data: regex.search(data) is not None
+
+    @staticmethod
+    def index_pod_metrics(pod_metrics: Dict[str, Any]) -> Dict[Tuple[str, str], Tuple]:
+        """Index a PodMetricsList by pod and container name
+        
+        Usage values are parsed once here so that joining them with pod specs
+        is a dictionary lookup per container.
+        
+        Args:
+            pod_metrics: PodMetricsList response from metrics.k8s.io
             
-        except Exception as e:
-            logger.error(f"Error getting pod status: {e}")
-            return [{"error": f"Error: {e}"}]
\ No newline at end of file
+        Returns:
+            Dict: (pod name, container name) -> (cpu usage in cores or None,
+                  memory usage in bytes or None)
+        """
+        metrics_index = {}
+        for item in pod_metrics.get('items', []):
+            pod_name = item['metadata']['name']
+            for container_metric in item.get('containers', []):
+                usage = container_metric['usage']
+                metrics_index[(pod_name, container_metric['name'])] = (
+                    parse_cpu(usage.get('cpu')), parse_memory(usage.get('memory'))
+                )
+        return metrics_index
+
+    @staticmethod
+    def container_usage(metrics_index: Dict[Tuple[str, str], Tuple], pod_name: str,
+                        container_name: str) -> Tuple[Optional[float], Optional[int]]:
+        """Look up a container's usage
+        
+        Args:
+            metrics_index: Index built by index_pod_metrics
+            pod_name: Name of the pod
+            container_name: Name of the container
+            
+        Returns:
+            Tuple: CPU usage in cores and memory usage in bytes, None when unknown
+        """
+        return metrics_index.get((pod_name, container_name), (None, None))
+
+    @staticmethod
+    def fill_usage_percentages(containers: List[ContainerStatus]):
+        """Set the usage of every container as a percentage of its requests
+        
+        The percentages of all the containers are computed in one columnar
+        step rather than one division per container.
+        
+        Args:
+            containers: Containers whose usage and requests are set
+        """
+        cpu_percent = from_column(utilization_percent(
+            to_column(c.cpu_usage_cores for c in containers),
+            to_column(c.cpu_request_cores for c in containers)
+        ))
+        memory_percent = from_column(utilization_percent(
+            to_column(c.memory_usage_bytes for c in containers),
+            to_column(c.memory_request_bytes for c in containers)
+        ))
+        for container, cpu, memory in zip(containers, cpu_percent, memory_percent):
+            container.cpu_usage_percent = cpu
+            container.memory_usage_percent = memory
@@ -0,0 +1,206 @@
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from managers.pod_manager import PodManager
+from utils.results import ErrorResult, PodIssue, Result, SweepSummary, UnhealthyDeployment
+
+logger = logging.getLogger("sre-tool")
+
+# Container reasons that make a deployment unhealthy in a sweep
+UNHEALTHY_REASONS = {
+    "CrashLoopBackOff", "OOMKilled", "Error", "ImagePullBackOff", "ErrImagePull",
+    "CreateContainerConfigError", "CreateContainerError", "RunContainerError",
+}
+# A running container's last OOM kill is reported for this many seconds after it
+RECENT_OOM_SECONDS = 3600
+
+
+class SweepManager:
+    """Checks the health of every deployment of the cluster in one pass"""
+
+    def __init__(self, k8s_client, informers=None):
+        """Initialize with a Kubernetes client
+
+        Args:
+            k8s_client: Kubernetes client instance
+            informers: Optional InformerCache serving reads from memory
+        """
+        self.k8s_client = k8s_client
+        self.apps_api = k8s_client.apps_api
+        self.core_api = k8s_client.core_api
+        self.informers = informers
+        self.timeout = k8s_client.timeout
+
+    def cluster_sweep(self, namespace: Optional[str] = None, max_workers: int = 8,
+                      page_size: int = 500) -> Iterator[Result]:
+        """Report every unhealthy deployment of the cluster
+
+        Each namespace costs one paginated list of deployments, ReplicaSets
+        and pods; namespaces are swept concurrently and the objects are
+        joined in memory by owner UID. A deployment is unhealthy when fewer
+        replicas are ready than desired or when one of its pods has a
+        container in CrashLoopBackOff, OOMKilled or another failure state.
+
+        The lists are read as raw JSON: deserializing every pod into SDK
+        models costs about a millisecond each and would dominate the sweep.
+
+        Args:
+            namespace: Optional namespace to restrict the sweep
+            max_workers: Maximum number of namespaces swept at once
+            page_size: Number of objects requested per API call
+
+        Yields:
+            Result: UnhealthyDeployment as soon as its namespace is swept,
+                then a SweepSummary, or a single ErrorResult
+        """
+        start_time = time.monotonic()
+        try:
+            if namespace:
+                namespaces = [namespace]
+            else:
+                namespaces = [ns['metadata']['name'] for ns in self._list_all(self.core_api.list_namespace, page_size)]
+        except Exception as e:
+            error_msg = f"Error when listing namespaces: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+            return
+
+        logger.info(f"Sweeping {len(namespaces)} namespaces with {max_workers} workers")
+        totals = Counter()
+        unhealthy_count = 0
+        failures = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(namespaces)))) as executor:
+            futures = {executor.submit(self._sweep_namespace, ns, page_size): ns for ns in namespaces}
+            for future in as_completed(futures):
+                result = future.result()
+                if isinstance(result, str):
+                    failures[futures[future]] = result
+                    continue
+                counts, unhealthy = result
+                totals.update(counts)
+                unhealthy_count += len(unhealthy)
+                yield from unhealthy
+
+        yield SweepSummary(
+            len(namespaces),
+            totals['deployments'],
+            totals['replicasets'],
+            totals['pods'],
+            unhealthy_count,
+            time.monotonic() - start_time,
+            failures
+        )
+
+    def _sweep_namespace(self, namespace: str, page_size: int):
+        """List and join the workloads of one namespace
+
+        Args:
+            namespace: Namespace to sweep
+            page_size: Number of objects requested per API call
+
+        Returns:
+            Tuple of object counts and UnhealthyDeployment results, or an
+            error message
+        """
+        try:
+            deployments = self._namespaced("deployments", self.apps_api.list_namespaced_deployment,
+                                           namespace, page_size)
+            if not deployments:
+                return Counter(), []
+            replica_sets = self._namespaced("replicasets", self.apps_api.list_namespaced_replica_set,
+                                            namespace, page_size)
+            pods = self._namespaced("pods", self.core_api.list_namespaced_pod, namespace, page_size)
+        except Exception as e:
+            logger.error(f"Error sweeping namespace {namespace}: {e}")
+            return f"{e}"
+
+        deployment_of_rs = {}
+        for rs in replica_sets:
+            for ref in rs['metadata'].get('ownerReferences') or []:
+                if ref['kind'] == 'Deployment':
+                    deployment_of_rs[rs['metadata']['uid']] = ref['uid']
+        pods_by_deployment: Dict[str, List[dict]] = defaultdict(list)
+        for pod in pods:
+            for ref in pod['metadata'].get('ownerReferences') or []:
+                if ref['uid'] in deployment_of_rs:
+                    pods_by_deployment[deployment_of_rs[ref['uid']]].append(pod)
+
+        unhealthy = []
+        for deployment in deployments:
+            replicas = deployment.get('spec', {}).get('replicas')
+            desired = replicas if replicas is not None else 1
+            ready = deployment.get('status', {}).get('readyReplicas') or 0
+            pod_issues = []
+            for pod in pods_by_deployment.get(deployment['metadata']['uid'], []):
+                reasons = self.pod_issues(pod)
+                if reasons:
+                    pod_issues.append(PodIssue(pod['metadata']['name'], reasons))
+            if ready < desired or pod_issues:
+                unhealthy.append(UnhealthyDeployment(namespace, deployment['metadata']['name'],
+                                                     ready, desired, pod_issues))
+
+        counts = Counter(deployments=len(deployments), replicasets=len(replica_sets), pods=len(pods))
+        return counts, unhealthy
+
+    @classmethod
+    def pod_issues(cls, pod: dict, now: Optional[float] = None) -> List[str]:
+        """Find the failure reasons of a pod's containers
+
+        Applies the diagnostic's container reason (PodManager.container_reason)
+        to the raw pod. A container restarted after being OOMKilled is
+        reported as well while it is not running again, or for
+        RECENT_OOM_SECONDS after the kill: the last state is kept until the
+        next restart, so an old kill of a healthy container is ignored.
+
+        Args:
+            pod: Pod as returned by the API
+            now: Optional current time as a Unix timestamp
+
+        Returns:
+            List[str]: Failure reasons, empty for a healthy pod
+        """
+        now = time.time() if now is None else now
+        reasons = []
+        for container_status in pod.get('status', {}).get('containerStatuses') or []:
+            reason = PodManager.container_reason(container_status.get('state') or {})
+            if reason in UNHEALTHY_REASONS:
+                reasons.append(reason)
+            last_terminated = (container_status.get('lastState') or {}).get('terminated') or {}
+            if (last_terminated.get('reason') == 'OOMKilled' and 'OOMKilled' not in reasons
+                    and (reason is not None or cls._finished_since(last_terminated, now) < RECENT_OOM_SECONDS)):
+                reasons.append('OOMKilled')
+        return reasons
+
+    @staticmethod
+    def _finished_since(terminated: dict, now: float) -> float:
+        """Seconds since a terminated container finished, infinite when unknown"""
+        try:
+            finished = datetime.fromisoformat(terminated['finishedAt'])
+        except (KeyError, TypeError, ValueError):
+            return float('inf')
+        return now - finished.timestamp()
+
+    def _namespaced(self, kind: str, list_func: Callable, namespace: str, page_size: int) -> List[dict]:
+        """List the objects of a namespace from the informer cache or the API"""
+        if self.informers:
+            serialize = self.core_api.api_client.sanitize_for_serialization
+            return [serialize(obj) for obj in self.informers.store(kind).list(namespace)]
+        return self._list_all(list_func, page_size, namespace)
+
+    def _list_all(self, list_func: Callable, page_size: int, *args) -> List[dict]:
+        """Walk every page of a list call using continue tokens"""
+        items = []
+        continue_token = None
+        while True:
+            response = list_func(*args, limit=page_size, _continue=continue_token,
+                                 timeout_seconds=self.timeout, _preload_content=False)
+            result = json.loads(response.data)
+            items.extend(result.get('items') or [])
+            continue_token = result.get('metadata', {}).get('continue')
+            if not continue_token:
+                return items
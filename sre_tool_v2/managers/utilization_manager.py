@@ -0,0 +1,297 @@
+import json
+import logging
+import math
+import time
+from array import array
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from utils.aggregate import find_row, group_percentiles, group_sums, sort_keys
+from utils.resource_converter import parse_quantities, parse_quantity, utilization_percent
+from utils.results import ErrorResult, ProvisioningOutlier, Result, UtilizationGroup, UtilizationSummary
+
+logger = logging.getLogger("sre-tool")
+
+# Percentiles of the per-container usage percentage reported for every group
+PERCENTILES = (50, 95)
+
+
+class UtilizationManager:
+    """Aggregates resource requests, limits and usage across the cluster"""
+
+    def __init__(self, k8s_client, informers=None):
+        """Initialize with a Kubernetes client
+
+        Args:
+            k8s_client: Kubernetes client instance
+            informers: Optional InformerCache serving the pod list from memory
+        """
+        self.k8s_client = k8s_client
+        self.core_api = k8s_client.core_api
+        self.informers = informers
+        self.metrics_api = k8s_client.custom_api
+        self.timeout = k8s_client.timeout
+
+    def cluster_utilization(self, namespace: Optional[str] = None, page_size: int = 500,
+                            low_percent: float = 20.0, high_percent: float = 100.0) -> Iterator[Result]:
+        """Report requests, limits and usage per deployment, namespace and node
+
+        Pods and pod metrics are each read with one paginated list. Every
+        page is folded into flat numeric columns (one row per container) and
+        dropped, so memory depends on the page size and on compact rows
+        rather than on the size of the pod objects. Metrics are joined to
+        the rows through a sorted column of 64-bit hashes of the namespace,
+        pod and container names, so no per-container Python object is kept
+        either. Group-by sums and percentiles are then computed over the
+        columns.
+
+        Args:
+            namespace: Optional namespace to restrict the report
+            page_size: Number of objects requested per API call
+            low_percent: Deployments using less than this percentage of their
+                requests are reported as over-provisioned
+            high_percent: Deployments using more than this percentage of their
+                requests are reported as under-provisioned
+
+        Yields:
+            Result: UtilizationGroup for every deployment, namespace and node
+                and for the cluster, then ProvisioningOutlier for every
+                outlier deployment, then a UtilizationSummary; or a single
+                ErrorResult
+        """
+        start_time = time.monotonic()
+        columns = {name: array('d') for name in (
+            'pod_start', 'cpu_request', 'cpu_limit', 'memory_request', 'memory_limit'
+        )}
+        group_ids = {'deployment': array('q'), 'namespace': array('q'), 'node': array('q')}
+        group_keys = {'deployment': {}, 'namespace': {}, 'node': {}}
+        row_keys = array('q')
+
+        try:
+            for page in self._pod_pages(namespace, page_size):
+                self._add_pods(page, columns, group_ids, group_keys, row_keys)
+        except Exception as e:
+            error_msg = f"Error when listing pods: {e}"
+            logger.error(error_msg)
+            yield ErrorResult(error_msg)
+            return
+
+        row_count = len(columns['cpu_request'])
+        cpu_usage = array('d', [math.nan]) * row_count
+        memory_usage = array('d', [math.nan]) * row_count
+        metrics_error = None
+        rows = sort_keys(row_keys)
+        del row_keys
+        try:
+            for page in self._metrics_pages(namespace, page_size):
+                self._add_metrics(page, rows, cpu_usage, memory_usage)
+        except Exception as e:
+            metrics_error = f"{e}"
+            logger.warning(f"Unable to get metrics: {e}")
+        del rows
+
+        cpu_percent = utilization_percent(cpu_usage, columns['cpu_request'])
+        memory_percent = utilization_percent(memory_usage, columns['memory_request'])
+        # Requests of the containers that report usage, the denominator of the group percentages
+        cpu_request_measured = [math.nan if math.isnan(used) else requested
+                                for used, requested in zip(cpu_usage, columns['cpu_request'])]
+        memory_request_measured = [math.nan if math.isnan(used) else requested
+                                   for used, requested in zip(memory_usage, columns['memory_request'])]
+        values = dict(columns, containers=array('d', [1.0]) * row_count,
+                      measured=[0.0 if math.isnan(used) else 1.0 for used in cpu_usage],
+                      cpu_usage=cpu_usage, memory_usage=memory_usage,
+                      cpu_request_measured=cpu_request_measured,
+                      memory_request_measured=memory_request_measured)
+        group_ids['cluster'] = array('q', [0]) * row_count
+        group_keys['cluster'] = {None: 0}
+
+        outliers = []
+        for group in ('deployment', 'namespace', 'node', 'cluster'):
+            keys = group_keys[group]
+            ids = group_ids[group]
+            sums = {name: group_sums(ids, column, len(keys)) for name, column in values.items()}
+            cpu_percentiles = group_percentiles(ids, cpu_percent, len(keys), PERCENTILES)
+            memory_percentiles = group_percentiles(ids, memory_percent, len(keys), PERCENTILES)
+            results = []
+            for key, index in keys.items():
+                if group == 'deployment':
+                    group_namespace, name = key
+                else:
+                    group_namespace = key if group == 'namespace' else None
+                    name = key if key is not None else 'cluster'
+                measured = sums['measured'][index]
+                result = UtilizationGroup(
+                    group,
+                    name,
+                    group_namespace,
+                    int(sums['pod_start'][index]),
+                    int(sums['containers'][index]),
+                    sums['cpu_request'][index],
+                    sums['cpu_limit'][index],
+                    sums['cpu_usage'][index] if measured else None,
+                    math.ceil(sums['memory_request'][index]),
+                    math.ceil(sums['memory_limit'][index]),
+                    math.ceil(sums['memory_usage'][index]) if measured else None,
+                    self.percent(sums['cpu_usage'][index], sums['cpu_request_measured'][index]),
+                    self.percent(sums['memory_usage'][index], sums['memory_request_measured'][index]),
+                    *cpu_percentiles[index],
+                    *memory_percentiles[index]
+                )
+                results.append(result)
+                if group == 'deployment':
+                    outliers.extend(self.outliers(result, low_percent, high_percent))
+            results.sort(key=lambda result: (result.namespace or '', result.name))
+            yield from results
+
+        yield from sorted(outliers, key=lambda outlier: (outlier.namespace, outlier.name, outlier.resource))
+        yield UtilizationSummary(
+            len(group_keys['namespace']),
+            len(group_keys['deployment']),
+            len(group_keys['node']),
+            int(sum(columns['pod_start'])),
+            row_count,
+            int(sum(values['measured'])),
+            time.monotonic() - start_time,
+            metrics_error
+        )
+
+    @staticmethod
+    def percent(usage: float, requests: float) -> Optional[float]:
+        """Usage as a percentage of requests, None when no request is known"""
+        return usage / requests * 100 if requests > 0 else None
+
+    @staticmethod
+    def outliers(result: UtilizationGroup, low_percent: float, high_percent: float) -> List[ProvisioningOutlier]:
+        """Find the resources a deployment uses far below or above its requests
+
+        Args:
+            result: Utilization of the deployment
+            low_percent: Usage percentage below which it is over-provisioned
+            high_percent: Usage percentage above which it is under-provisioned
+
+        Returns:
+            List[ProvisioningOutlier]: One entry per outlier resource
+        """
+        outliers = []
+        for resource, percent in (('cpu', result.cpu_usage_percent), ('memory', result.memory_usage_percent)):
+            if percent is None:
+                continue
+            if percent < low_percent:
+                outliers.append(ProvisioningOutlier(result.namespace, result.name, resource, percent, 'over'))
+            elif percent > high_percent:
+                outliers.append(ProvisioningOutlier(result.namespace, result.name, resource, percent, 'under'))
+        return outliers
+
+    @staticmethod
+    def deployment_name(pod: dict) -> Optional[str]:
+        """Name the deployment of a pod without listing ReplicaSets
+
+        A deployment names its ReplicaSets "<deployment>-<pod-template-hash>"
+        and labels their pods with that hash.
+
+        Args:
+            pod: Pod as returned by the API
+
+        Returns:
+            Optional[str]: Deployment name, None for pods of other controllers
+        """
+        metadata = pod['metadata']
+        pod_template_hash = (metadata.get('labels') or {}).get('pod-template-hash')
+        if not pod_template_hash:
+            return None
+        suffix = f"-{pod_template_hash}"
+        for ref in metadata.get('ownerReferences') or []:
+            if ref.get('kind') == 'ReplicaSet' and ref['name'].endswith(suffix):
+                return ref['name'][:-len(suffix)]
+        return None
+
+    @staticmethod
+    def row_key(namespace: str, pod: str, container: str) -> int:
+        """Key joining the metrics of a container to its row
+
+        A 64-bit hash: a collision between two containers of the cluster is
+        vanishingly unlikely and would only mix up their usage.
+        """
+        return hash((namespace, pod, container))
+
+    def _add_pods(self, pods: List[dict], columns: Dict[str, array], group_ids: Dict[str, array],
+                  group_keys: Dict[str, dict], row_keys: array):
+        """Append one row per container of a page of pods to the columns"""
+        strings = {name: [] for name in columns if name != 'pod_start'}
+        for pod in pods:
+            if (pod.get('status') or {}).get('phase') in ('Succeeded', 'Failed'):
+                # Completed pods no longer hold their requests
+                continue
+            metadata = pod['metadata']
+            namespace = metadata['namespace']
+            deployment = self.deployment_name(pod)
+            node = (pod.get('spec') or {}).get('nodeName')
+            namespace_id = group_keys['namespace'].setdefault(namespace, len(group_keys['namespace']))
+            deployment_id = (group_keys['deployment'].setdefault((namespace, deployment), len(group_keys['deployment']))
+                             if deployment else -1)
+            node_id = group_keys['node'].setdefault(node, len(group_keys['node'])) if node else -1
+            for index, container in enumerate(pod['spec'].get('containers') or []):
+                resources = container.get('resources') or {}
+                requests = resources.get('requests') or {}
+                limits = resources.get('limits') or {}
+                row_keys.append(self.row_key(namespace, metadata['name'], container['name']))
+                columns['pod_start'].append(1.0 if index == 0 else 0.0)
+                strings['cpu_request'].append(requests.get('cpu'))
+                strings['cpu_limit'].append(limits.get('cpu'))
+                strings['memory_request'].append(requests.get('memory'))
+                strings['memory_limit'].append(limits.get('memory'))
+                group_ids['namespace'].append(namespace_id)
+                group_ids['deployment'].append(deployment_id)
+                group_ids['node'].append(node_id)
+        for name, quantities in strings.items():
+            columns[name].extend(parse_quantities(quantities))
+
+    @classmethod
+    def _add_metrics(cls, pod_metrics: List[dict], rows: Tuple[array, array], cpu_usage: array,
+                     memory_usage: array):
+        """Store the usage of a page of pod metrics in the rows of their containers"""
+        sorted_keys, key_rows = rows
+        for item in pod_metrics:
+            metadata = item['metadata']
+            for container in item.get('containers') or []:
+                row = find_row(sorted_keys, key_rows,
+                               cls.row_key(metadata['namespace'], metadata['name'], container['name']))
+                if row is None:
+                    continue
+                usage = container.get('usage') or {}
+                try:
+                    cpu_usage[row] = parse_quantity(usage['cpu'])
+                    memory_usage[row] = parse_quantity(usage['memory'])
+                except (KeyError, ValueError):
+                    continue
+
+    def _pod_pages(self, namespace: Optional[str], page_size: int) -> Iterator[List[dict]]:
+        """Read the pods page by page, from the informer cache when available"""
+        if self.informers:
+            serialize = self.core_api.api_client.sanitize_for_serialization
+            yield [serialize(pod) for pod in self.informers.pods.list(namespace)]
+            return
+        if namespace:
+            yield from self._pages(self.core_api.list_namespaced_pod, page_size, namespace)
+        else:
+            yield from self._pages(self.core_api.list_pod_for_all_namespaces, page_size)
+
+    def _metrics_pages(self, namespace: Optional[str], page_size: int) -> Iterator[List[dict]]:
+        """Read the pod metrics page by page"""
+        if namespace:
+            yield from self._pages(self.metrics_api.list_namespaced_custom_object, page_size,
+                                   "metrics.k8s.io", "v1beta1", namespace, "pods")
+        else:
+            yield from self._pages(self.metrics_api.list_cluster_custom_object, page_size,
+                                   "metrics.k8s.io", "v1beta1", "pods")
+
+    def _pages(self, list_func: Callable, page_size: int, *args) -> Iterator[List[dict]]:
+        """Walk every page of a list call using continue tokens"""
+        continue_token = None
+        while True:
+            response = list_func(*args, limit=page_size, _continue=continue_token,
+                                 timeout_seconds=self.timeout, _preload_content=False)
+            result = json.loads(response.data)
+            yield result.get('items') or []
+            continue_token = result.get('metadata', {}).get('continue')
+            if not continue_token:
+                return
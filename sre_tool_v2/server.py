@@ -0,0 +1,196 @@
+import argparse
+import codecs
+import contextlib
+import json
+import logging
+import os
+import shlex
+import socket
+import socketserver
+import stat
+import sys
+import threading
+from typing import List, Optional
+
+from commands import Session, run_command
+from utils.cache import cache_path
+
+logger = logging.getLogger("sre-tool")
+
+# argparse reports usage errors on the process-wide stdout/stderr, so parsing is serialized
+PARSE_LOCK = threading.Lock()
+SESSION_EXCLUDED_COMMANDS = ('shell', 'serve')
+
+
+def default_socket_path() -> str:
+    """Get the default path of the server socket
+
+    Returns:
+        str: Socket path in the cache directory
+    """
+    return cache_path("sre_tool.sock")
+
+
+def parse_session_command(parser: argparse.ArgumentParser, argv: List[str], out) -> Optional[argparse.Namespace]:
+    """Parse a command received by the shell or the server
+
+    Args:
+        parser: Parser built by build_parser
+        argv: Command arguments without the program name
+        out: Stream receiving help and usage errors
+
+    Returns:
+        Optional[argparse.Namespace]: Parsed arguments or None if there is nothing to run
+    """
+    with PARSE_LOCK, contextlib.redirect_stdout(out), contextlib.redirect_stderr(out):
+        try:
+            args = parser.parse_args(argv)
+        except SystemExit:
+            # --help and usage errors were already written to out
+            return None
+
+    if args.command in SESSION_EXCLUDED_COMMANDS:
+        print(f"Command {args.command} is not available inside a session", file=out)
+        return None
+    return args
+
+
+def run_shell(session: Session, parser: argparse.ArgumentParser):
+    """Run an interactive shell reusing one session for every command
+
+    Args:
+        session: Session holding the client and managers
+        parser: Parser built by build_parser
+    """
+    print("sre_tool shell - type a command (e.g. 'list --namespace default'), 'help' or 'exit'")
+    while True:
+        try:
+            line = input("sre_tool> ")
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            print(f"Error: {e}")
+            continue
+        if not argv:
+            continue
+        if argv[0] in ('exit', 'quit'):
+            return
+        if argv[0] == 'help':
+            parser.print_help()
+            continue
+
+        args = parse_session_command(parser, argv, sys.stdout)
+        if args is None:
+            continue
+        try:
+            run_command(args, session)
+        except KeyboardInterrupt:
+            print()
+        except Exception as e:
+            logger.error(f"Failed running command: {e}")
+            print(f"Failed running command: {e}")
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    """Runs one command per connection and streams its output back
+
+    A request is a single JSON line {"argv": [...]}; the response is the
+    plain text output of the command, terminated by closing the connection.
+    """
+
+    def handle(self):
+        out = codecs.getwriter("utf-8")(self.wfile)
+        try:
+            request = json.loads(self.rfile.readline())
+            argv = [str(arg) for arg in request["argv"]]
+        except (ValueError, KeyError, TypeError) as e:
+            out.write(f"Error: invalid request: {e}\n")
+            return
+
+        args = parse_session_command(self.server.parser, argv, out)
+        if args is None:
+            return
+        logger.debug(f"Serving command: {' '.join(argv)}")
+        try:
+            run_command(args, self.server.session, out)
+        except BrokenPipeError:
+            logger.debug("Client disconnected before the command finished")
+        except Exception as e:
+            logger.error(f"Failed running command: {e}")
+            out.write(f"Failed running command: {e}\n")
+
+
+class CommandServer(socketserver.ThreadingUnixStreamServer):
+    """Unix socket server sharing one session between concurrent clients"""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, session: Session, parser: argparse.ArgumentParser):
+        self.session = session
+        self.parser = parser
+        super().__init__(socket_path, CommandHandler)
+
+
+def remove_stale_socket(socket_path: str) -> Optional[str]:
+    """Remove the leftover socket of a server that is no longer running
+
+    A leftover socket blocks bind(), but the path may also be a regular
+    file or the socket of a server that is still running, which must be
+    left alone.
+
+    Args:
+        socket_path: Path the server is about to bind
+
+    Returns:
+        Optional[str]: Why the path cannot be used, None when it is free
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return None
+    if not stat.S_ISSOCK(mode):
+        return f"{socket_path} exists and is not a socket"
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            pass
+        else:
+            return f"A server is already listening on {socket_path}"
+    os.unlink(socket_path)
+    return None
+
+
+def serve(session: Session, parser: argparse.ArgumentParser, socket_path: Optional[str] = None):
+    """Serve commands from thin clients until interrupted
+
+    Args:
+        session: Session holding the client and managers
+        parser: Parser built by build_parser
+        socket_path: Optional socket path, in the cache directory by default
+
+    Raises:
+        RuntimeError: The socket path is taken by a file or a running server
+    """
+    socket_path = socket_path or default_socket_path()
+    os.makedirs(os.path.dirname(os.path.abspath(socket_path)), exist_ok=True)
+    error = remove_stale_socket(socket_path)
+    if error:
+        raise RuntimeError(error)
+
+    session.warm_up()
+    server = CommandServer(socket_path, session, parser)
+    os.chmod(socket_path, 0o600)
+    logger.info(f"Serving commands on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Server stopped")
+    finally:
+        server.server_close()
+        os.unlink(socket_path)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""Thin client for a running `main.py serve` process
+
+Forwards its arguments to the server and streams the output back, so a
+command costs the API calls only instead of a full tool startup:
+
+    python sre_client.py [--socket PATH] list --namespace default
+
+Only the standard library is imported here on purpose.
+"""
+import json
+import socket
+import sys
+
+from utils.cache import cache_path
+
+
+def main():
+    """Send the command line to the server and print its output"""
+    argv = sys.argv[1:]
+    socket_path = cache_path("sre_tool.sock")
+    if len(argv) >= 2 and argv[0] == '--socket':
+        socket_path = argv[1]
+        argv = argv[2:]
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(json.dumps({"argv": argv}).encode() + b"\n")
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                sys.stdout.buffer.write(data)
+                sys.stdout.buffer.flush()
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"No sre_tool server listening on {socket_path}, start one with: python main.py serve",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+
+import pytest
+
+# The tool imports its packages from the sre_tool_v2 directory, like main.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_api import FakeCluster, serve  # noqa: E402
+
+KUBECONFIG = """apiVersion: v1
+kind: Config
+clusters:
+- cluster: {{server: "http://127.0.0.1:{port}"}}
+  name: fake
+contexts:
+- context: {{cluster: fake, user: test}}
+  name: fake
+current-context: fake
+users:
+- name: test
+  user: {{token: test}}
+"""
+
+
+@pytest.fixture
+def cache_home(tmp_path, monkeypatch):
+    """Private cache directory for the connection check and namespace index"""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def cluster():
+    """Small fake cluster whose controller only rolls out when told to"""
+    return FakeCluster(deployments=20, pods_per_deployment=2, namespaces=4, nodes=4, rollout_delay=None)
+
+
+@pytest.fixture
+def k8s_client(cluster, cache_home, tmp_path, monkeypatch):
+    """KubernetesClient talking to the fake cluster over HTTP"""
+    from kubernetes.config import kube_config
+
+    from clients.kubernetes_client import KubernetesClient
+
+    server = serve(cluster)
+    kubeconfig = tmp_path / "kubeconfig"
+    kubeconfig.write_text(KUBECONFIG.format(port=server.server_address[1]))
+    monkeypatch.setenv("KUBECONFIG", str(kubeconfig))
+    # The SDK reads $KUBECONFIG once, when it is imported
+    monkeypatch.setattr(kube_config, "KUBE_CONFIG_DEFAULT_LOCATION", str(kubeconfig))
+    yield KubernetesClient(timeout=5, connect_timeout=2)
+    cluster.close_watches()
+    server.shutdown()
+    server.server_close()
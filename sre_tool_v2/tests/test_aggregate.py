@@ -0,0 +1,30 @@
+from array import array
+
+import pytest
+
+from utils import aggregate
+from utils.aggregate import find_row, sort_keys
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def backend(request, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(aggregate, "optional_numpy", lambda: None)
+    return request.param
+
+
+def test_find_row_after_sort_keys(backend):
+    keys = array('q', [hash(("ns", f"pod-{index}", "app")) for index in range(500)])
+    sorted_keys, rows = sort_keys(keys)
+
+    assert list(sorted_keys) == sorted(keys)
+    for row, key in enumerate(keys):
+        assert find_row(sorted_keys, rows, key) == row
+
+
+def test_find_row_of_unknown_key(backend):
+    sorted_keys, rows = sort_keys(array('q', [5, -3, 9]))
+
+    assert find_row(sorted_keys, rows, 4) is None
+    assert find_row(sorted_keys, rows, 10) is None
+    assert find_row(*sort_keys(array('q')), 1) is None
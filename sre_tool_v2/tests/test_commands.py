@@ -0,0 +1,118 @@
+import sys
+
+import pytest
+
+from benchmarks.fake_api import deployment_target
+from commands import (DEFAULT_INDEX_TTL, SESSION_MANAGERS, Session, build_parser, dispatch,
+                      run_across_contexts, run_command)
+from utils.results import ErrorResult
+from utils.timings import StageTimings
+
+
+def run(session, argv):
+    return dispatch(build_parser().parse_args(argv), session, StageTimings())
+
+
+def test_async_backend_rejects_index_options():
+    session = Session()
+    for option in (["--refresh-index"], ["--index-ttl", "60"]):
+        result = run(session, ["scale", "--deployment", "web", "--replicas", "1", "--backend", "async"] + option)
+        assert isinstance(result, ErrorResult)
+        assert "--backend sync" in result.message
+    assert "k8s_client" not in vars(session)
+
+
+def test_index_options_wait_for_the_first_lookup(k8s_client):
+    session = Session()
+    session.configure_index(5, True)
+    assert "namespace_index" not in vars(session)
+    assert "k8s_client" not in vars(session)
+
+    index = session.namespace_index
+    assert index.ttl == 5
+    assert index.refresh_pending
+    assert not session.refresh_index
+
+
+def test_index_options_apply_to_a_loaded_index(k8s_client):
+    session = Session()
+    index = session.namespace_index
+    assert index.ttl == DEFAULT_INDEX_TTL
+    assert not index.refresh_pending
+
+    session.configure_index(30, True)
+    assert index.ttl == 30
+    assert index.refresh_pending
+
+    session.configure_index(None, False)
+    assert index.ttl == DEFAULT_INDEX_TTL
+
+
+def test_yaml_output_without_pyyaml_fails_before_running(monkeypatch):
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    session = Session()
+    args = build_parser().parse_args(["scale", "--deployment", "web", "--replicas", "1", "-o", "yaml"])
+    with pytest.raises(RuntimeError, match="PyYAML"):
+        run_command(args, session)
+    assert "k8s_client" not in vars(session)
+
+
+@pytest.mark.parametrize("command", ["shell", "serve"])
+def test_long_running_modes_can_skip_the_informers(command):
+    assert not build_parser().parse_args([command]).no_informers
+    assert build_parser().parse_args([command, "--no-informers"]).no_informers
+
+
+def test_forbidden_informers_fall_back_to_api_calls(cluster, k8s_client):
+    cluster.forbidden_kinds.add("pods")
+    session = Session(use_informers=True)
+    informers = session.informers
+    assert session.deployment_manager.informers is informers
+
+    assert not session.start_informers()
+
+    assert session.informers is None
+    assert informers.informers["deployments"].stopped.is_set()
+    assert "pods" not in informers.informers
+    assert session.deployment_manager.informers is None
+    assert session.pod_manager.informers is None
+    assert len(session.deployment_manager.list_deployments(page_size=7)) == 20
+
+
+def test_informers_start_when_allowed(cluster, k8s_client):
+    session = Session(use_informers=True)
+
+    assert session.start_informers()
+    assert len(session.informers.pods.list()) == 40
+    session.informers.stop()
+    assert not Session().start_informers()
+
+
+def test_info_locates_the_namespace_of_the_deployment(cluster, k8s_client):
+    namespace, name = deployment_target(7, cluster.namespaces)
+
+    info = run(Session(), ["info", "--deployment", name])
+
+    assert (info.name, info.namespace) == (name, namespace)
+    missing = run(Session(), ["info", "--deployment", "missing"])
+    assert isinstance(missing, ErrorResult)
+    assert "not found" in missing.message
+
+
+def test_info_across_contexts_locates_the_deployment(cluster, k8s_client):
+    namespace, name = deployment_target(7, cluster.namespaces)
+    args = build_parser().parse_args(["info", "--deployment", name, "--contexts", "fake", "--skip-check"])
+
+    [result] = run_across_contexts(args, Session(), ["fake"])
+
+    assert result.cluster == "fake"
+    assert (result.result.name, result.result.namespace) == (name, namespace)
+
+
+def test_warm_up_builds_every_manager(k8s_client):
+    session = Session()
+
+    session.warm_up()
+
+    assert all(manager in vars(session) for manager in SESSION_MANAGERS)
+    assert session.diagnostics_manager.deployment_manager is session.deployment_manager
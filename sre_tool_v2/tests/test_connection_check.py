@@ -0,0 +1,23 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from clients.kubernetes_client import KubernetesClient
+
+
+def test_concurrent_checks_keep_every_cluster(cache_home):
+    hosts = [f"https://cluster-{index}:6443" for index in range(32)]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        list(executor.map(KubernetesClient._cache_connection_check, hosts))
+
+    with open(cache_home / "sre_tool" / "connection_check.json") as f:
+        assert sorted(json.load(f)) == sorted(hosts)
+    assert [path.name for path in (cache_home / "sre_tool").iterdir()] == ["connection_check.json"]
+
+
+def test_successful_check_is_cached(cluster, k8s_client):
+    assert k8s_client.check_connection()
+    assert k8s_client.check_connection()
+    assert cluster.requests == 1
+
+    assert k8s_client.check_connection(cache_ttl=0)
+    assert cluster.requests == 2
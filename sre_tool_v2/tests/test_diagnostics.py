@@ -0,0 +1,75 @@
+import asyncio
+import os
+
+import pytest
+
+from benchmarks.fake_api import deployment_target
+from managers.deployment_manager import DeploymentManager
+from managers.diagnostics_manager import DiagnosticsManager
+from managers.pod_manager import PodManager
+
+INDEX = 1
+
+
+@pytest.fixture
+def target(cluster):
+    """Deployment with pods of an old revision and of another controller matching its selector"""
+    namespace, name = deployment_target(INDEX, cluster.namespaces)
+    containers = [{"name": "app", "image": "registry.example.com/other:1.0", "resources": {}}]
+    with cluster.lock:
+        cluster.add_pod(namespace, f"{name}-old", {"app": name, "pod-template-hash": "old"}, containers, 0,
+                        "node-000", crashing=False)
+        cluster.add_pod(namespace, f"{name}-job", {"app": name}, containers, 0, "node-000", crashing=False)
+    return namespace, name
+
+
+def pod_requests(cluster, kind="pods"):
+    return [request for request in cluster.list_requests if request["kind"] == kind]
+
+
+def check_diagnostic(cluster, diagnostic, namespace, name):
+    assert diagnostic.error is None
+    assert [pod.name for pod in diagnostic.pods] == [f"{name}-cur-{index:04d}"
+                                                     for index in range(cluster.pods_per_deployment)]
+    kinds = [request["kind"] for request in cluster.list_requests]
+    assert kinds.index("replicasets") < kinds.index("pods")
+    for kind in ("pods", "podmetrics"):
+        [request] = pod_requests(cluster, kind)
+        assert request["labelSelector"] == f"app={name},pod-template-hash in (cur)"
+
+
+def test_pods_are_listed_with_the_template_hashes_of_live_replica_sets(cluster, k8s_client, target):
+    namespace, name = target
+    diagnostics = DiagnosticsManager(k8s_client, DeploymentManager(k8s_client), PodManager(k8s_client))
+
+    diagnostic = diagnostics.deployment_diagnostics(name, namespace)
+
+    check_diagnostic(cluster, diagnostic, namespace, name)
+
+
+def test_async_pods_are_listed_with_the_template_hashes_of_live_replica_sets(cluster, k8s_client, target,
+                                                                            monkeypatch):
+    pytest.importorskip("kubernetes_asyncio")
+    from kubernetes_asyncio.config import kube_config
+
+    from clients.async_kubernetes_client import AsyncKubernetesClient
+    from managers.async_deployment_manager import AsyncDeploymentManager
+    from managers.async_diagnostics_manager import AsyncDiagnosticsManager
+    from managers.async_pod_manager import AsyncPodManager
+
+    monkeypatch.setattr(kube_config, "KUBE_CONFIG_DEFAULT_LOCATION", os.environ["KUBECONFIG"])
+    namespace, name = target
+
+    async def diagnose():
+        async with await AsyncKubernetesClient.create(timeout=5) as async_client:
+            deployment_manager = AsyncDeploymentManager(async_client)
+            pod_manager = AsyncPodManager(async_client)
+            diagnostics = AsyncDiagnosticsManager(async_client, deployment_manager, pod_manager)
+            return await diagnostics.deployment_diagnostics(name, namespace)
+
+    check_diagnostic(cluster, asyncio.run(diagnose()), namespace, name)
+
+
+def test_pod_selector_without_template_hashes():
+    assert DiagnosticsManager.pod_selector("app=web", []) == "app=web"
+    assert DiagnosticsManager.pod_selector("", []) == ""
@@ -0,0 +1,83 @@
+from benchmarks.fake_api import deployment_target
+from managers.deployment_manager import DeploymentManager
+from managers.diagnostics_manager import DiagnosticsManager
+from managers.pod_manager import PodManager
+
+REPLICA_SETS = {"web-5c6d7", "web-84f9b"}
+
+
+def event(kind, name, reason="BackOff", count=None, last_seen="2024-01-01T00:00:00Z", message="", **fields):
+    data = {"involvedObject": {"kind": kind, "name": name}, "reason": reason, "message": message,
+            "lastTimestamp": last_seen, **fields}
+    if count is not None:
+        data["count"] = count
+    return data
+
+
+def summarize(events, pod_name=None):
+    return DiagnosticsManager.event_summaries(events, "web", REPLICA_SETS, pod_name)
+
+
+def test_pods_are_correlated_through_their_replica_set_prefix():
+    summaries = summarize([
+        event("Pod", "web-5c6d7-abcde"),
+        event("Pod", "web-84f9b-fghij"),
+        # A replaced pod of a live ReplicaSet still counts
+        event("Pod", "web-5c6d7-zzzzz"),
+        # Pods of another deployment sharing the name prefix do not
+        event("Pod", "web-api-6b7c8-klmno"),
+        event("Pod", "web-5c6d7"),
+        event("Pod", "web-12345-pqrst"),
+        event("ReplicaSet", "web-5c6d7", "FailedCreate"),
+        event("ReplicaSet", "web-api-6b7c8", "FailedCreate"),
+        event("Deployment", "web", "ProgressDeadlineExceeded"),
+        event("Deployment", "web-api", "ProgressDeadlineExceeded"),
+        event("Service", "web", "FailedToUpdateEndpoint"),
+    ])
+
+    assert {summary.reason: summary.objects for summary in summaries} == {
+        "BackOff": ["Pod/web-5c6d7-abcde", "Pod/web-5c6d7-zzzzz", "Pod/web-84f9b-fghij"],
+        "FailedCreate": ["ReplicaSet/web-5c6d7"],
+        "ProgressDeadlineExceeded": ["Deployment/web"],
+    }
+
+
+def test_pod_name_restricts_pod_events_only():
+    summaries = summarize([
+        event("Pod", "web-5c6d7-abcde"),
+        event("Pod", "web-5c6d7-fghij"),
+        event("Deployment", "web", "ProgressDeadlineExceeded"),
+    ], pod_name="web-5c6d7-fghij")
+
+    assert {summary.reason: summary.objects for summary in summaries} == {
+        "BackOff": ["Pod/web-5c6d7-fghij"],
+        "ProgressDeadlineExceeded": ["Deployment/web"],
+    }
+
+
+def test_counts_are_summed_and_the_latest_message_kept():
+    summaries = summarize([
+        event("Pod", "web-5c6d7-abcde", count=3, last_seen="2024-01-01T00:05:00Z", message="newer"),
+        event("Pod", "web-5c6d7-abcde", last_seen="2024-01-01T00:01:00Z", message="older"),
+        event("Pod", "web-5c6d7-fghij", last_seen=None, message="no time",
+              series={"count": 4, "lastObservedTime": "2024-01-01T00:03:00Z"}),
+        event("Pod", "web-5c6d7-klmno", "Unhealthy", count=2, last_seen="2024-01-01T00:10:00Z"),
+    ])
+
+    assert [(summary.reason, summary.count, summary.last_seen, summary.message) for summary in summaries] == [
+        ("Unhealthy", 2, "2024-01-01T00:10:00Z", ""),
+        ("BackOff", 8, "2024-01-01T00:05:00Z", "newer"),
+    ]
+
+
+def test_diagnostic_reports_the_events_of_crashing_pods(cluster, k8s_client):
+    deployment_manager = DeploymentManager(k8s_client)
+    pod_manager = PodManager(k8s_client)
+    diagnostics = DiagnosticsManager(k8s_client, deployment_manager, pod_manager)
+    namespace, name = deployment_target(10, cluster.namespaces)
+
+    diagnostic = diagnostics.deployment_diagnostics(name, namespace, include_metrics=False)
+
+    assert diagnostic.error is None
+    assert [(summary.reason, summary.count, summary.objects) for summary in diagnostic.events] == \
+        [("BackOff", 12, [f"Pod/{name}-cur-0000"])]
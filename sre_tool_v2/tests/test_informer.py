@@ -0,0 +1,115 @@
+from types import SimpleNamespace
+
+from kubernetes.client import V1ObjectMeta, V1OwnerReference, V1Pod
+
+from clients.informer import Informer, Store
+from managers.deployment_manager import DeploymentManager
+
+
+def pod(namespace, name, labels=None, owner=None):
+    owner_references = [V1OwnerReference(api_version="apps/v1", kind="ReplicaSet", name=owner, uid=owner)] \
+        if owner else None
+    return V1Pod(metadata=V1ObjectMeta(namespace=namespace, name=name, labels=labels,
+                                       owner_references=owner_references))
+
+
+def names(objects):
+    return [(obj.metadata.namespace, obj.metadata.name) for obj in objects]
+
+
+def test_store_indexes_by_namespace_name_owner_and_label():
+    store = Store()
+    store.replace([
+        pod("b", "web-1", {"app": "web", "tier": "front"}, owner="rs-web"),
+        pod("a", "web-1", {"app": "web"}, owner="rs-web-a"),
+        pod("b", "db-1", {"app": "db"}, owner="rs-db"),
+    ])
+
+    assert names(store.list()) == [("a", "web-1"), ("b", "db-1"), ("b", "web-1")]
+    assert names(store.list("b")) == [("b", "db-1"), ("b", "web-1")]
+    assert names(store.list(label_selector="app=web")) == [("a", "web-1"), ("b", "web-1")]
+    assert names(store.list("b", "app=web,tier in (front)")) == [("b", "web-1")]
+    assert names(store.list(label_selector="app!=web")) == [("b", "db-1")]
+    assert names(store.by_name("web-1")) == [("a", "web-1"), ("b", "web-1")]
+    assert names(store.by_owner("rs-db")) == [("b", "db-1")]
+    assert store.get("a", "web-1").metadata.labels == {"app": "web"}
+    assert store.get("a", "db-1") is None
+
+
+def test_store_upsert_and_delete_update_the_indexes():
+    store = Store()
+    store.upsert(pod("a", "web-1", {"app": "web"}, owner="rs-1"))
+    store.upsert(pod("a", "web-1", {"app": "api"}, owner="rs-2"))
+
+    assert names(store.list(label_selector="app=web")) == []
+    assert names(store.list(label_selector="app=api")) == [("a", "web-1")]
+    assert store.by_owner("rs-1") == []
+    assert names(store.by_owner("rs-2")) == [("a", "web-1")]
+
+    store.delete(pod("a", "web-1"))
+    store.delete(pod("a", "missing"))
+
+    assert store.list() == []
+    assert all(not index for index in store.indexes.values())
+
+
+def test_replace_drops_objects_missing_from_the_list():
+    store = Store()
+    store.replace([pod("a", "web-1", {"app": "web"}), pod("a", "web-2", {"app": "web"})])
+    store.replace([pod("a", "web-2", {"app": "web"})])
+
+    assert names(store.list(label_selector="app=web")) == [("a", "web-2")]
+    assert store.by_name("web-1") == []
+
+
+def test_relist_pages_through_the_list_and_records_its_resource_version(cluster, k8s_client):
+    changes = []
+    informer = Informer("deployments", k8s_client.apps_api.list_namespaced_deployment, 5, page_size=2,
+                        list_args=("ns-001",), on_change=lambda: changes.append(True))
+
+    informer._relist()
+
+    expected = sorted(("ns-001", name) for namespace, name in cluster.deployments if namespace == "ns-001")
+    assert names(informer.store.list()) == expected
+    assert informer.resource_version == str(cluster.resource_version)
+    assert changes == [True]
+
+
+def test_informer_relists_after_an_expired_resource_version(cluster, k8s_client):
+    lists = []
+
+    def list_deployments(*args, **kwargs):
+        if not kwargs.get("watch"):
+            lists.append(kwargs)
+        return k8s_client.apps_api.list_namespaced_deployment(*args, **kwargs)
+
+    # The watch finds the model to deserialize in the docstring
+    list_deployments.__doc__ = k8s_client.apps_api.list_namespaced_deployment.__doc__
+
+    informer = Informer("deployments", list_deployments, 5, list_args=("ns-001",))
+    informer.start()
+    try:
+        assert cluster.wait_for_watches(1)
+        # The next watch is answered with 410 Gone
+        cluster.expire_watches = 1
+        cluster.close_watches()
+        assert cluster.wait_for_watches(3)
+    finally:
+        informer.stop()
+        cluster.close_watches()
+
+    assert len(lists) == 2
+    first, expired, resumed = cluster.watch_requests[:3]
+    assert expired["resourceVersion"] == first["resourceVersion"]
+    assert resumed["resourceVersion"] == str(cluster.resource_version)
+
+
+def test_deployment_manager_locates_through_the_store(cluster, k8s_client):
+    informers = SimpleNamespace(deployments=Store())
+    informers.deployments.replace(
+        k8s_client.apps_api.list_deployment_for_all_namespaces(field_selector="metadata.name=web-00002").items
+    )
+    manager = DeploymentManager(k8s_client, informers=informers)
+
+    assert manager.locate_deployment_namespace("web-00002") == "ns-002"
+    assert "not found" in manager.locate_deployment_namespace("web-99999")
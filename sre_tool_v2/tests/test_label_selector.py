@@ -0,0 +1,61 @@
+import pytest
+from kubernetes.client import V1LabelSelector, V1LabelSelectorRequirement
+
+from utils.label_selector import parse_selector, selector_matches, selector_to_string
+
+
+def test_selector_to_string_sorts_labels_and_keeps_expressions():
+    selector = V1LabelSelector(
+        match_labels={"tier": "web", "app": "shop"},
+        match_expressions=[
+            V1LabelSelectorRequirement(key="env", operator="In", values=["prod", "staging"]),
+            V1LabelSelectorRequirement(key="track", operator="NotIn", values=["canary"]),
+            V1LabelSelectorRequirement(key="owner", operator="Exists"),
+            V1LabelSelectorRequirement(key="legacy", operator="DoesNotExist"),
+        ]
+    )
+
+    assert selector_to_string(selector) == \
+        "app=shop,tier=web,env in (prod,staging),track notin (canary),owner,!legacy"
+
+
+def test_parse_selector_round_trips_selector_to_string():
+    selector = "app=shop,env in (prod,staging),track notin (canary),owner,!legacy"
+
+    assert parse_selector(selector) == [
+        ("app", "=", {"shop"}),
+        ("env", "in", {"prod", "staging"}),
+        ("track", "notin", {"canary"}),
+        ("owner", "exists", set()),
+        ("legacy", "!", set()),
+    ]
+
+
+def test_parse_selector_accepts_kubectl_forms():
+    assert parse_selector(" app==shop , tier != db ,, ") == [("app", "=", {"shop"}), ("tier", "!=", {"db"})]
+    assert parse_selector("") == []
+    assert parse_selector(None) == []
+
+
+@pytest.mark.parametrize("selector, labels, matches", [
+    ("app=shop", {"app": "shop"}, True),
+    ("app=shop", {"app": "cart"}, False),
+    ("app=shop", None, False),
+    ("tier!=db", {"tier": "web"}, True),
+    ("tier!=db", {}, True),
+    ("tier!=db", {"tier": "db"}, False),
+    ("env in (prod,staging)", {"env": "staging"}, True),
+    ("env in (prod,staging)", {"env": "dev"}, False),
+    ("env in (prod,staging)", {}, False),
+    ("track notin (canary)", {}, True),
+    ("track notin (canary)", {"track": "canary"}, False),
+    ("owner", {"owner": ""}, True),
+    ("owner", {}, False),
+    ("!legacy", {}, True),
+    ("!legacy", {"legacy": "true"}, False),
+    ("app=shop,env in (prod)", {"app": "shop", "env": "prod"}, True),
+    ("app=shop,env in (prod)", {"app": "shop", "env": "dev"}, False),
+    ("", {"app": "shop"}, True),
+])
+def test_selector_matches(selector, labels, matches):
+    assert selector_matches(parse_selector(selector), labels) is matches
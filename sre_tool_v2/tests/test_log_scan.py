@@ -0,0 +1,105 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from managers import pod_manager
+from managers.pod_manager import PodManager
+
+LOG = b"".join(f"line {number}{' ERROR' if number in (3, 4, 9) else ''}\n".encode() for number in range(1, 11))
+
+
+class LogResponse:
+    """Log response streaming fixed chunks, whatever size is requested"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.released = False
+
+    def stream(self, amt):
+        yield from self.chunks
+
+    def release_conn(self):
+        self.released = True
+
+
+def chunked(data, size):
+    return [data[start:start + size] for start in range(0, len(data), size)]
+
+
+def scan(chunks, patterns=("ERROR",), context=2, stopped=None):
+    response = LogResponse(chunks)
+    core_api = SimpleNamespace(read_namespaced_pod_log=lambda *args, **kwargs: response)
+    manager = PodManager(SimpleNamespace(core_api=core_api, custom_api=None, timeout=5, request_timeout=5))
+    matches = []
+    counts = manager._scan_log_stream("ns", "web-1", "app", False, PodManager.log_matcher(list(patterns)),
+                                      context, None, None, matches.append, stopped or threading.Event())
+    assert response.released
+    return [(match.line_number, match.line, match.before, match.after) for match in matches], counts
+
+
+def test_context_ring_buffer_and_overlapping_matches():
+    matches, counts = scan([LOG])
+
+    assert matches == [
+        (3, "line 3 ERROR", ["line 1", "line 2"], ["line 4 ERROR", "line 5"]),
+        (4, "line 4 ERROR", ["line 2", "line 3 ERROR"], ["line 5", "line 6"]),
+        (9, "line 9 ERROR", ["line 7", "line 8"], ["line 10"]),
+    ]
+    assert counts == (10, len(LOG))
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 7, 13, 64])
+def test_lines_split_across_chunks_are_joined(size):
+    assert scan(chunked(LOG, size)) == scan([LOG])
+
+
+def test_context_comes_from_blocks_without_a_match():
+    # The first chunk has no match, so only its last lines are kept as context
+    matches, _ = scan([LOG[:LOG.index(b"line 3")], LOG[LOG.index(b"line 3"):]], context=1)
+
+    assert matches[0] == (3, "line 3 ERROR", ["line 2"], ["line 4 ERROR"])
+
+
+def test_without_context():
+    matches, _ = scan(chunked(LOG, 4), context=0)
+
+    assert [(number, before, after) for number, _, before, after in matches] == \
+        [(3, [], []), (4, [], []), (9, [], [])]
+
+
+def test_last_line_without_newline_and_crlf():
+    matches, counts = scan([b"start\r\nfatal ERR", b"OR at the end"], context=1)
+
+    assert matches == [(2, "fatal ERROR at the end", ["start"], [])]
+    assert counts == (2, 29)
+
+
+def test_overlong_line_is_truncated(monkeypatch):
+    monkeypatch.setattr(pod_manager, "MAX_LOG_LINE_BYTES", 12)
+    data = b"ERROR " + b"x" * 40 + b"\nnext ERROR\n"
+
+    matches, counts = scan(chunked(data, 4), context=0)
+
+    assert matches == [(1, "ERROR xxxxxx", [], []), (2, "next ERROR", [], [])]
+    assert counts == (2, len(data))
+
+
+def test_stopped_scan_reads_nothing_more():
+    stopped = threading.Event()
+    stopped.set()
+
+    assert scan([LOG], stopped=stopped) == ([], (0, 0))
+
+
+def test_log_matcher_on_lines_and_blocks():
+    assert PodManager.log_matcher(["err"], fixed_strings=True)(b"ok\nerr\n")
+    assert not PodManager.log_matcher(["err"], fixed_strings=True)(b"ERR\n")
+    assert PodManager.log_matcher(["err"], fixed_strings=True, ignore_case=True)(b"ERR\n")
+    assert PodManager.log_matcher(["a.c"], fixed_strings=True, ignore_case=True)(b"A.C\n")
+    assert not PodManager.log_matcher(["a.c"], fixed_strings=True, ignore_case=True)(b"abc\n")
+    assert PodManager.log_matcher([r"^panic:", "OOM"])(b"ok\npanic: boom\n")
+    with pytest.raises(ValueError):
+        PodManager.log_matcher([])
+    with pytest.raises(ValueError):
+        PodManager.log_matcher(["("])
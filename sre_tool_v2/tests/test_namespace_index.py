@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+from clients.namespace_index import NamespaceIndex
+from managers.deployment_manager import DeploymentManager
+
+NAME = "web-00001"
+OLD_NAMESPACE, NEW_NAMESPACE = "ns-001", "ns-002"
+
+
+@pytest.fixture
+def index(k8s_client, tmp_path):
+    index = NamespaceIndex(k8s_client, path=str(tmp_path / "namespace_index.json"))
+    index.refresh()
+    return index
+
+
+def age(index, seconds):
+    seen = time.time() - seconds
+    for namespaces in index.deployments.values():
+        for namespace in namespaces:
+            namespaces[namespace] = seen
+    return seen
+
+
+def move_deployment(cluster):
+    cluster.delete_deployment(OLD_NAMESPACE, NAME)
+    cluster.create_deployment(1, NEW_NAMESPACE)
+
+
+def test_refresh_confirms_entries_after_catching_up(cluster, index):
+    seen = age(index, 500)
+    cluster.create_deployment(100, OLD_NAMESPACE)
+
+    index.refresh()
+
+    assert index.resource_version == str(cluster.resource_version)
+    assert "web-00100" in index.deployments
+    assert all(timestamp > seen for namespaces in index.deployments.values()
+               for timestamp in namespaces.values())
+
+
+def test_refresh_without_changes_confirms_entries_without_a_bookmark(cluster, index):
+    # The stored resourceVersion is the one of the list made before the watch
+    cluster.bookmarks = False
+    seen = age(index, 500)
+
+    index.refresh()
+
+    assert index.resource_version == str(cluster.resource_version)
+    assert index.deployments[NAME][OLD_NAMESPACE] > seen
+
+
+def test_refresh_keeps_timestamps_until_caught_up(cluster, index):
+    # Without a bookmark the watch times out before reaching the current
+    # resourceVersion, as when the server did not deliver every change in time
+    cluster.bookmarks = False
+    seen = age(index, 500)
+    cluster.create_deployment(100, OLD_NAMESPACE)
+    with cluster.lock:
+        cluster.next_version()
+
+    index.refresh()
+
+    assert index.resource_version != str(cluster.resource_version)
+    assert "web-00100" in index.deployments
+    assert index.deployments[NAME] == {OLD_NAMESPACE: seen}
+
+
+def test_lookup_of_stale_namespace_queries_the_cluster(cluster, index):
+    move_deployment(cluster)
+
+    assert index.lookup(NAME) == OLD_NAMESPACE
+    assert index.lookup(NAME, stale_namespace=OLD_NAMESPACE) == NEW_NAMESPACE
+    assert index.lookup(NAME) == NEW_NAMESPACE
+
+
+def test_scale_relocates_a_moved_deployment(cluster, k8s_client, index):
+    manager = DeploymentManager(k8s_client, namespace_index=index)
+    move_deployment(cluster)
+
+    result = manager.scale_deployment(NAME, cluster.pods_per_deployment, wait_mode="watch")
+
+    assert result.status == "Scaled", result.message
+    assert result.namespace == NEW_NAMESPACE
+
+
+def test_read_of_a_deleted_deployment_is_not_found(cluster, k8s_client, index):
+    manager = DeploymentManager(k8s_client, namespace_index=index)
+    cluster.delete_deployment(OLD_NAMESPACE, NAME)
+
+    with pytest.raises(LookupError, match="not found"):
+        manager.call_in_namespace(NAME, None, lambda namespace: manager.read_deployment(NAME, namespace))
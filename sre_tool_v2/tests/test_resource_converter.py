@@ -0,0 +1,80 @@
+import math
+
+import pytest
+
+from utils import resource_converter
+from utils.resource_converter import (convert_memory_to_bytes, from_column, parse_cpu, parse_memory,
+                                      parse_quantities, parse_quantity, utilization_percent)
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def backend(request, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(resource_converter, "optional_numpy", lambda: None)
+    return request.param
+
+
+@pytest.mark.parametrize("quantity, value", [
+    ("250000000n", 0.25),
+    ("1500u", 0.0015),
+    ("100m", 0.1),
+    ("2", 2.0),
+    ("0.5", 0.5),
+    (".5", 0.5),
+    ("+1", 1.0),
+    ("1k", 1e3),
+    ("1K", 1e3),
+    ("1M", 1e6),
+    ("1G", 1e9),
+    ("1T", 1e12),
+    ("2P", 2e15),
+    ("1E", 1e18),
+    ("64Ki", 64 * 2 ** 10),
+    ("1.5Mi", 1.5 * 2 ** 20),
+    ("2Gi", 2 * 2 ** 30),
+    ("1Ti", 2 ** 40),
+    ("1Pi", 2 ** 50),
+    ("1Ei", 2 ** 60),
+    ("1e3", 1e3),
+    ("1E3", 1e3),
+    ("1.5e-3", 0.0015),
+    ("2E+2", 200.0),
+    (" 128Mi ", 128 * 2 ** 20),
+])
+def test_parse_quantity(quantity, value):
+    assert parse_quantity(quantity) == pytest.approx(value)
+
+
+def test_e_is_exa_without_digits_and_an_exponent_with_them():
+    assert parse_quantity("1E") == 10 ** 18
+    assert parse_quantity("1E1") == 10
+    assert parse_quantity("1Ei") == 2 ** 60
+
+
+@pytest.mark.parametrize("quantity", ["", "m", "1e", "1x", "1mi", "1KiB", "1.2.3", "abc", "1 Gi"])
+def test_parse_quantity_rejects_malformed_quantities(quantity):
+    with pytest.raises(ValueError):
+        parse_quantity(quantity)
+
+
+def test_milli_and_memory_rounding():
+    assert parse_quantity("100m") == 0.1
+    assert convert_memory_to_bytes("1.5") == 2
+    assert convert_memory_to_bytes("1500m") == 2
+    assert parse_cpu(None) is None
+    assert parse_cpu("bogus") is None
+    assert parse_memory("1Gi") == 2 ** 30
+    assert parse_memory("bogus") is None
+
+
+def test_parse_quantities_marks_missing_and_malformed_as_nan(backend):
+    column = parse_quantities(["250m", None, "bogus", "1Gi"])
+
+    assert from_column(column) == [0.25, None, None, float(2 ** 30)]
+
+
+def test_utilization_percent(backend):
+    usage = [0.5, math.nan, 0.1, 0.2]
+    requests = [1.0, 1.0, 0.0, math.nan]
+
+    assert from_column(utilization_percent(usage, requests)) == [50.0, None, None, None]
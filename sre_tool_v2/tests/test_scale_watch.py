@@ -0,0 +1,129 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from managers.deployment_manager import DeploymentManager
+
+NAMESPACE, NAME = "ns-001", "web-00001"
+
+
+@pytest.fixture
+def manager(k8s_client):
+    return DeploymentManager(k8s_client)
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        yield pool
+
+
+def start_scale(executor, manager, replicas):
+    return executor.submit(manager.scale_deployment, NAME, replicas, NAMESPACE, "watch")
+
+
+def test_watch_resumes_from_patch_resource_version(cluster, manager):
+    # The rollout completes before the watch opens: only resuming from the
+    # patch's resourceVersion delivers it
+    cluster.rollout_delay = 0
+    patched_version = cluster.resource_version + 1
+
+    result = manager.scale_deployment(NAME, 3, NAMESPACE, wait_mode="watch")
+
+    assert result.status == "Scaled"
+    assert len(cluster.watch_requests) == 1
+    watch = cluster.watch_requests[0]
+    assert watch["resourceVersion"] == str(patched_version)
+    assert watch["fieldSelector"] == f"metadata.name={NAME}"
+    assert watch["allowWatchBookmarks"].lower() == "true"
+
+
+def test_watch_skips_bookmarks_and_resumes_from_them(cluster, manager, executor):
+    future = start_scale(executor, manager, 3)
+    assert cluster.wait_for_watches(1)
+
+    # Changes to other objects only reach the watch as a bookmark
+    cluster.create_deployment(100, NAMESPACE)
+    bookmark_version = cluster.resource_version
+    # Give the bookmark time to reach the client before the stream closes
+    time.sleep(0.3)
+    assert not future.done()
+    cluster.close_watches()
+    assert cluster.wait_for_watches(2)
+    cluster.roll_out(NAMESPACE, NAME)
+
+    result = future.result(timeout=10)
+    assert result.status == "Scaled"
+    assert cluster.watch_requests[1]["resourceVersion"] == str(bookmark_version)
+
+
+def test_watch_relists_after_expired_resource_version(cluster, manager, executor):
+    cluster.expire_watches = 1
+    future = start_scale(executor, manager, 3)
+    assert cluster.wait_for_watches(2)
+    cluster.roll_out(NAMESPACE, NAME)
+
+    result = future.result(timeout=10)
+    assert result.status == "Scaled"
+    expired, resumed = cluster.watch_requests
+    # The second watch starts from the relist, which saw the patch
+    assert int(resumed["resourceVersion"]) >= int(expired["resourceVersion"])
+
+
+def test_watch_fails_when_deployment_is_deleted(cluster, manager, executor):
+    future = start_scale(executor, manager, 3)
+    assert cluster.wait_for_watches(1)
+    cluster.delete_deployment(NAMESPACE, NAME)
+
+    result = future.result(timeout=10)
+    assert result.status == "Failed"
+    assert "was deleted" in result.message
+
+
+def test_noop_patch_of_ready_deployment_does_not_watch(cluster, manager):
+    result = manager.scale_deployment(NAME, cluster.pods_per_deployment, NAMESPACE, wait_mode="watch")
+
+    assert result.status == "Scaled"
+    assert cluster.watch_requests == []
+
+
+def test_noop_patch_of_unready_deployment_watches_from_status_read(cluster, manager, executor):
+    with cluster.lock:
+        deployment = cluster.deployments[(NAMESPACE, NAME)]
+        deployment["status"]["readyReplicas"] = 1
+        cluster.update_deployment(deployment)
+    read_version = cluster.resource_version
+
+    future = start_scale(executor, manager, cluster.pods_per_deployment)
+    assert cluster.wait_for_watches(1)
+    cluster.roll_out(NAMESPACE, NAME)
+
+    result = future.result(timeout=10)
+    assert result.status == "Scaled"
+    assert cluster.watch_requests[0]["resourceVersion"] == str(read_version)
+
+
+def deployment(generation=2, observed_generation=2, replicas=3, ready_replicas=3):
+    return SimpleNamespace(
+        metadata=SimpleNamespace(generation=generation),
+        status=SimpleNamespace(observed_generation=observed_generation, replicas=replicas,
+                               ready_replicas=ready_replicas),
+    )
+
+
+@pytest.mark.parametrize("kwargs, reached", [
+    ({}, True),
+    ({"observed_generation": 1}, False),
+    ({"replicas": 4}, False),
+    ({"ready_replicas": 2}, False),
+    ({"ready_replicas": None}, False),
+    ({"generation": None, "observed_generation": None}, True),
+])
+def test_scale_reached(kwargs, reached):
+    assert DeploymentManager.scale_reached(deployment(**kwargs), 3) is reached
+
+
+def test_scale_reached_treats_missing_counts_as_zero():
+    assert DeploymentManager.scale_reached(deployment(replicas=None, ready_replicas=None), 0)
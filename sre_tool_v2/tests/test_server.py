@@ -0,0 +1,44 @@
+import socket
+
+import pytest
+
+from server import remove_stale_socket, serve
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    # Unix socket paths are limited to about 100 characters
+    return str(tmp_path / "s.sock")
+
+
+def test_missing_path_is_free(socket_path):
+    assert remove_stale_socket(socket_path) is None
+
+
+def test_stale_socket_is_removed(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+
+    assert remove_stale_socket(socket_path) is None
+    with pytest.raises(FileNotFoundError):
+        open(socket_path)
+
+
+def test_live_server_socket_is_kept(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(socket_path)
+        server.listen()
+
+        assert "already listening" in remove_stale_socket(socket_path)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(socket_path)
+
+
+def test_serve_refuses_to_replace_a_regular_file(socket_path):
+    with open(socket_path, "w") as f:
+        f.write("user data")
+
+    with pytest.raises(RuntimeError, match="not a socket"):
+        serve(None, None, socket_path)
+    with open(socket_path) as f:
+        assert f.read() == "user data"
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import CASES, FORBIDDEN_IMPORTS, MAIN_PATH, median_time
+
+# Allowed time above a bare interpreter start, as in benchmarks.bench_startup
+BUDGET_MS = 50.0
+RUNS = 3
+
+
+@pytest.fixture(scope="module")
+def interpreter_start():
+    baseline, _ = median_time(["-c", "pass"], RUNS)
+    return baseline
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_startup_skips_cluster_packages(case):
+    _, imports = median_time(CASES[case], 1)
+
+    loaded = sorted({module for _, module in imports if module.split(".")[0] in FORBIDDEN_IMPORTS})
+    assert not loaded, f"{case} imported {', '.join(loaded)}"
+
+
+@pytest.mark.parametrize("case", sorted(CASES))
+def test_startup_within_budget(case, interpreter_start):
+    elapsed, _ = median_time(CASES[case], RUNS)
+
+    overhead = (elapsed - interpreter_start) * 1000
+    assert overhead <= BUDGET_MS, f"{case} took {overhead:.1f} ms over the interpreter start"
+
+
+def test_no_command_prints_the_usage():
+    completed = subprocess.run([sys.executable, MAIN_PATH], capture_output=True, text=True,
+                               cwd=os.path.dirname(MAIN_PATH))
+
+    assert completed.returncode == 0
+    assert completed.stdout.startswith("usage:")
+    assert "Failed running tool" not in completed.stdout + completed.stderr
@@ -0,0 +1,127 @@
+import json
+import time
+from datetime import datetime, timezone
+
+import pytest
+from kubernetes.client import V1ContainerState, V1ContainerStateTerminated, V1ContainerStateWaiting
+
+from benchmarks.fake_api import deployment_target
+from managers.pod_manager import PodManager
+from managers.sweep_manager import UNHEALTHY_REASONS, SweepManager
+from utils.results import SweepSummary, UnhealthyDeployment
+
+
+def pod(*container_statuses):
+    return {"metadata": {"name": "web-1"}, "status": {"containerStatuses": list(container_statuses)}}
+
+
+def waiting(reason, last_state=None):
+    return {"state": {"waiting": {"reason": reason}}, "lastState": last_state or {}}
+
+
+def terminated(reason, last_state=None):
+    return {"state": {"terminated": {"reason": reason}}, "lastState": last_state or {}}
+
+
+def running(last_state=None):
+    return {"state": {"running": {}}, "lastState": last_state or {}}
+
+
+@pytest.mark.parametrize("reason", sorted(UNHEALTHY_REASONS))
+def test_unhealthy_waiting_and_terminated_reasons(reason):
+    assert SweepManager.pod_issues(pod(waiting(reason))) == [reason]
+    assert SweepManager.pod_issues(pod(terminated(reason))) == [reason]
+
+
+@pytest.mark.parametrize("status", [
+    running(),
+    waiting("ContainerCreating"),
+    waiting("PodInitializing"),
+    terminated("Completed"),
+    running({"terminated": {"reason": "Error"}}),
+])
+def test_healthy_container_states(status):
+    assert SweepManager.pod_issues(pod(status)) == []
+
+
+def test_waiting_reason_takes_precedence_over_terminated():
+    status = {"state": {"waiting": {"reason": "ContainerCreating"}, "terminated": {"reason": "Error"}}}
+    assert SweepManager.pod_issues(pod(status)) == []
+
+
+NOW = datetime(2024, 1, 2, tzinfo=timezone.utc).timestamp()
+
+
+def oom_killed(minutes_ago=None, now=NOW):
+    terminated = {"reason": "OOMKilled"}
+    if minutes_ago is not None:
+        terminated["finishedAt"] = datetime.fromtimestamp(now - minutes_ago * 60, timezone.utc) \
+            .strftime("%Y-%m-%dT%H:%M:%SZ")
+    return {"terminated": terminated}
+
+
+def test_oom_kill_of_a_restarting_container_is_reported_once():
+    assert SweepManager.pod_issues(pod(waiting("CrashLoopBackOff", oom_killed(600))), NOW) == \
+        ["CrashLoopBackOff", "OOMKilled"]
+    assert SweepManager.pod_issues(pod(waiting("ContainerCreating", oom_killed())), NOW) == ["OOMKilled"]
+    assert SweepManager.pod_issues(pod(terminated("OOMKilled", oom_killed(1))), NOW) == ["OOMKilled"]
+
+
+def test_recent_oom_kill_of_a_running_container_is_reported():
+    assert SweepManager.pod_issues(pod(running(oom_killed(5))), NOW) == ["OOMKilled"]
+
+
+def test_old_oom_kill_of_a_running_ready_container_is_ignored():
+    status = dict(running(oom_killed(minutes_ago=3 * 24 * 60)), ready=True, restartCount=1)
+
+    assert SweepManager.pod_issues(pod(status), NOW) == []
+    assert SweepManager.pod_issues(pod(running(oom_killed())), NOW) == []
+
+
+@pytest.mark.parametrize("minutes_ago, reported", [(5, True), (3 * 24 * 60, False)])
+def test_sweep_of_a_ready_deployment_with_an_oom_kill(cluster, k8s_client, minutes_ago, reported):
+    namespace, name = deployment_target(1, cluster.namespaces)
+    pod_name = f"{name}-cur-0000"
+    with cluster.lock:
+        entry = cluster.store["pods"][namespace][pod_name]
+        data = json.loads(entry.data)
+        data["status"]["containerStatuses"][0].update(
+            restartCount=1, lastState=oom_killed(minutes_ago, now=time.time()))
+        cluster.store["pods"][namespace][pod_name] = entry._replace(data=json.dumps(data).encode())
+
+    results = list(SweepManager(k8s_client).cluster_sweep(namespace=namespace))
+
+    issues = {result.name: result.pod_issues for result in results[:-1]}
+    assert (name in issues) is reported
+    if reported:
+        assert [(issue.pod, issue.reasons) for issue in issues[name]] == [(pod_name, ["OOMKilled"])]
+
+
+def test_reasons_of_every_container_are_reported():
+    assert SweepManager.pod_issues(pod(running(), waiting("ImagePullBackOff"), terminated("Error"))) == \
+        ["ImagePullBackOff", "Error"]
+    assert SweepManager.pod_issues({"metadata": {"name": "pending"}, "status": {}}) == []
+
+
+def test_sweep_reports_deployments_with_crashing_pods(cluster, k8s_client):
+    results = list(SweepManager(k8s_client).cluster_sweep(max_workers=2, page_size=3))
+
+    summary = results[-1]
+    unhealthy = sorted((result.namespace, result.name) for result in results[:-1])
+    assert isinstance(summary, SweepSummary)
+    assert all(isinstance(result, UnhealthyDeployment) for result in results[:-1])
+    # The fake cluster crashes the first pod of every tenth deployment
+    assert unhealthy == sorted(deployment_target(index, cluster.namespaces) for index in range(0, 20, 10))
+    assert all(result.pod_issues[0].reasons == ["CrashLoopBackOff"] for result in results[:-1])
+    assert (summary.deployments, summary.unhealthy) == (20, 2)
+
+
+def test_container_reason_of_models_and_raw_states():
+    assert PodManager.container_reason(V1ContainerState(waiting=V1ContainerStateWaiting(reason="BackOff"))) == \
+        "BackOff"
+    assert PodManager.container_reason(
+        V1ContainerState(terminated=V1ContainerStateTerminated(exit_code=137, reason="OOMKilled"))) == "OOMKilled"
+    assert PodManager.container_reason(V1ContainerState()) is None
+    assert PodManager.container_reason(None) is None
+    assert PodManager.container_reason({"terminated": {"reason": "Error"}}) == "Error"
+    assert PodManager.container_reason({"running": {}}) is None
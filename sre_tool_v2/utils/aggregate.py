@@ -0,0 +1,144 @@
+import math
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Sequence, Tuple
+
+from utils.resource_converter import optional_numpy
+
+
+def group_sums(groups, values, group_count: int) -> List[float]:
+    """Sum a numeric column per group
+
+    Unknown (NaN) values and rows without a group (-1) are skipped.
+
+    Args:
+        groups: Column of group ids, one per row
+        values: Column of values, one per row
+        group_count: Number of groups
+
+    Returns:
+        List[float]: Sum of every group
+    """
+    numpy = optional_numpy()
+    if numpy is None:
+        sums = [0.0] * group_count
+        for group, value in zip(groups, values):
+            if group >= 0 and not math.isnan(value):
+                sums[group] += value
+        return sums
+
+    groups = numpy.asarray(groups, dtype=numpy.int64)
+    values = numpy.asarray(values, dtype=numpy.float64)
+    known = (groups >= 0) & ~numpy.isnan(values)
+    return numpy.bincount(groups[known], weights=values[known], minlength=group_count).tolist()
+
+
+def sort_keys(keys: array) -> Tuple[array, array]:
+    """Sort a column of integer keys so rows can be found with find_row
+
+    Args:
+        keys: Column of 64-bit keys, one per row
+
+    Returns:
+        Tuple[array, array]: The sorted keys and, for each of them, its row
+    """
+    numpy = optional_numpy()
+    if numpy is None:
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        return array('q', (keys[row] for row in order)), array('q', order)
+
+    keys = numpy.frombuffer(keys, dtype=numpy.int64)
+    order = numpy.argsort(keys, kind='stable')
+    return array('q', keys[order].tobytes()), array('q', order.astype(numpy.int64).tobytes())
+
+
+def find_row(sorted_keys: array, rows: array, key: int) -> Optional[int]:
+    """Find the row of a key with a binary search
+
+    Args:
+        sorted_keys: Sorted keys returned by sort_keys
+        rows: Rows returned by sort_keys
+        key: Key to find
+
+    Returns:
+        Optional[int]: Row of the key, None if it is unknown
+    """
+    position = bisect_left(sorted_keys, key)
+    if position < len(sorted_keys) and sorted_keys[position] == key:
+        return rows[position]
+    return None
+
+
+def group_percentiles(groups, values, group_count: int,
+                      percentiles: Sequence[float]) -> List[List[Optional[float]]]:
+    """Compute percentiles of a numeric column per group
+
+    Uses linear interpolation between the closest ranks, like
+    numpy.percentile. With NumPy the rows are sorted once by group and value
+    and every group's percentile is read from the sorted column in one step.
+
+    Args:
+        groups: Column of group ids, one per row
+        values: Column of values, one per row
+        group_count: Number of groups
+        percentiles: Percentiles to compute, between 0 and 100
+
+    Returns:
+        List[List[Optional[float]]]: For every group, one value per
+            percentile, None for groups without known values
+    """
+    numpy = optional_numpy()
+    if numpy is None:
+        grouped = [[] for _ in range(group_count)]
+        for group, value in zip(groups, values):
+            if group >= 0 and not math.isnan(value):
+                grouped[group].append(value)
+        result = []
+        for group_values in grouped:
+            group_values.sort()
+            result.append([interpolate(group_values, 0, len(group_values), q) for q in percentiles])
+        return result
+
+    groups = numpy.asarray(groups, dtype=numpy.int64)
+    values = numpy.asarray(values, dtype=numpy.float64)
+    known = (groups >= 0) & ~numpy.isnan(values)
+    groups, values = groups[known], values[known]
+    order = numpy.lexsort((values, groups))
+    groups, values = groups[order], values[order]
+    starts = numpy.searchsorted(groups, numpy.arange(group_count), side='left')
+    counts = numpy.searchsorted(groups, numpy.arange(group_count), side='right') - starts
+    if not len(values):
+        return [[None] * len(percentiles) for _ in range(group_count)]
+
+    columns = []
+    for q in percentiles:
+        rank = numpy.maximum(counts - 1, 0) * (q / 100)
+        lower = numpy.floor(rank).astype(numpy.int64)
+        upper = numpy.minimum(lower + 1, numpy.maximum(counts - 1, 0))
+        lower_values = values[numpy.minimum(starts + lower, len(values) - 1)]
+        upper_values = values[numpy.minimum(starts + upper, len(values) - 1)]
+        column = lower_values + (upper_values - lower_values) * (rank - lower)
+        columns.append([value if count else None for value, count in zip(column.tolist(), counts.tolist())])
+    return [list(row) for row in zip(*columns)]
+
+
+def interpolate(sorted_values: Sequence[float], start: int, count: int, q: float) -> Optional[float]:
+    """Read a percentile from a sorted slice with linear interpolation
+
+    Args:
+        sorted_values: Sorted values
+        start: Index of the first value of the slice
+        count: Number of values in the slice
+        q: Percentile, between 0 and 100
+
+    Returns:
+        Optional[float]: Percentile of the slice, None if it is empty
+    """
+    if not count:
+        return None
+    rank = (count - 1) * (q / 100)
+    lower = math.floor(rank)
+    upper = min(lower + 1, count - 1)
+    lower_value = sorted_values[start + lower]
+    upper_value = sorted_values[start + upper]
+    return lower_value + (upper_value - lower_value) * (rank - lower)
@@ -0,0 +1,14 @@
+import os
+
+
+def cache_path(filename: str) -> str:
+    """Return the path of a file in the tool's local cache directory
+
+    Args:
+        filename: Name of the cache file
+
+    Returns:
+        str: Path under $XDG_CACHE_HOME/sre_tool (or ~/.cache/sre_tool)
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "sre_tool", filename)
@@ -0,0 +1,97 @@
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+
+def selector_to_string(selector) -> str:
+    """Convert a Kubernetes LabelSelector to its query string form
+
+    Args:
+        selector: V1LabelSelector with matchLabels and/or matchExpressions
+
+    Returns:
+        str: Label selector string (e.g., "app=web,tier in (a,b)")
+    """
+    terms = [f"{key}={value}" for key, value in sorted((selector.match_labels or {}).items())]
+    for expression in selector.match_expressions or []:
+        values = ",".join(expression.values or [])
+        if expression.operator == 'In':
+            terms.append(f"{expression.key} in ({values})")
+        elif expression.operator == 'NotIn':
+            terms.append(f"{expression.key} notin ({values})")
+        elif expression.operator == 'Exists':
+            terms.append(expression.key)
+        elif expression.operator == 'DoesNotExist':
+            terms.append(f"!{expression.key}")
+    return ",".join(terms)
+
+
+def parse_selector(selector: str) -> List[Tuple[str, str, Set[str]]]:
+    """Parse a label selector string into requirements
+
+    Supports the forms produced by selector_to_string and kubectl:
+    "key=value", "key==value", "key!=value", "key in (a,b)",
+    "key notin (a,b)", "key" and "!key".
+
+    Args:
+        selector: Label selector string
+
+    Returns:
+        List[Tuple[str, str, Set[str]]]: (key, operator, values) requirements
+    """
+    terms = []
+    depth = 0
+    term = ""
+    for char in selector or "":
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            terms.append(term)
+            term = ""
+        else:
+            term += char
+    terms.append(term)
+
+    requirements = []
+    for term in (term.strip() for term in terms):
+        if not term:
+            continue
+        match = re.match(r"^(\S+)\s+(in|notin)\s+\((.*)\)$", term)
+        if match:
+            values = {value.strip() for value in match.group(3).split(",") if value.strip()}
+            requirements.append((match.group(1), match.group(2), values))
+        elif "!=" in term:
+            key, value = term.split("!=", 1)
+            requirements.append((key.strip(), "!=", {value.strip()}))
+        elif "=" in term:
+            key, value = re.split(r"==?", term, 1)
+            requirements.append((key.strip(), "=", {value.strip()}))
+        elif term.startswith("!"):
+            requirements.append((term[1:].strip(), "!", set()))
+        else:
+            requirements.append((term, "exists", set()))
+    return requirements
+
+
+def selector_matches(requirements: List[Tuple[str, str, Set[str]]], labels: Optional[Dict[str, str]]) -> bool:
+    """Check whether labels satisfy parsed selector requirements
+
+    Args:
+        requirements: Requirements returned by parse_selector
+        labels: Labels of an object
+
+    Returns:
+        bool: True if every requirement is satisfied
+    """
+    labels = labels or {}
+    for key, operator, values in requirements:
+        if operator in ("=", "in") and labels.get(key) not in values:
+            return False
+        if operator in ("!=", "notin") and key in labels and labels[key] in values:
+            return False
+        if operator == "exists" and key not in labels:
+            return False
+        if operator == "!" and key in labels:
+            return False
+    return True
@@ -0,0 +1,577 @@
+import json
+import sys
+from typing import Iterable, List, Union
+
+from utils.resource_converter import format_cpu, format_memory, format_percent
+from utils.results import (BulkScaleSummary, ClusterResult, DeploymentDiagnostic, DeploymentInfo, DeploymentSummary,
+                           DiagnosticUpdate, ErrorResult, EventSummary, LogMatch, LogScanSummary, PodStatus,
+                           ProvisioningOutlier, ReplicaSetStatus, Result, RolloutProgress, RolloutResult,
+                           ScaleResult, SweepSummary, UnhealthyDeployment, UtilizationGroup, UtilizationSummary)
+
+
+def is_error(result: Result) -> bool:
+    """Check whether a result reports a failure of the command
+
+    Args:
+        result: Result returned by a manager
+
+    Returns:
+        bool: True for an ErrorResult, a failed scale or an aborted diagnostic
+    """
+    if isinstance(result, ErrorResult):
+        return True
+    if isinstance(result, ClusterResult):
+        return is_error(result.result)
+    if isinstance(result, ScaleResult):
+        return result.status == 'Failed'
+    if isinstance(result, RolloutResult):
+        return result.status != 'Complete'
+    if isinstance(result, DeploymentDiagnostic):
+        return result.error is not None
+    return False
+
+
+def yaml_module():
+    """Return the yaml module of the optional PyYAML package
+
+    Raises:
+        RuntimeError: If PyYAML is not installed
+    """
+    try:
+        import yaml
+    except ImportError:
+        raise RuntimeError("--output yaml requires PyYAML (pip install pyyaml)")
+    return yaml
+
+
+def render(command: str, result: Union[Result, Iterable[Result]], output: str = 'table', out=None) -> bool:
+    """Write the result of a command in the requested format
+
+    Iterables are consumed as they are produced: jsonl writes one line per
+    record and the table format prints list rows immediately, while json and
+    yaml collect the whole sequence into one document.
+
+    Args:
+        command: Name of the command that produced the result
+        result: Single result or iterable of results
+        output: One of "table", "json", "jsonl" or "yaml"
+        out: Optional output stream, stdout by default
+
+    Returns:
+        bool: True if the command failed
+    """
+    out = out or sys.stdout
+    single = isinstance(result, Result)
+    results = [result] if single else result
+
+    if output == 'jsonl':
+        failed = False
+        for item in results:
+            failed = failed or is_error(item)
+            for record in item.records():
+                out.write(json.dumps(record, default=str) + "\n")
+            out.flush()
+        return failed
+
+    if output in ('json', 'yaml'):
+        items = list(results)
+        data = items[0].to_dict() if single else [item.to_dict() for item in items]
+        if output == 'json':
+            out.write(json.dumps(data, indent=2, default=str) + "\n")
+        else:
+            out.write(yaml_module().safe_dump(data, sort_keys=False))
+        return any(is_error(item) for item in items)
+
+    return TABLE_RENDERERS[command](results, out)
+
+
+def print_error(message: str, out):
+    """Print a failure in the table format"""
+    print("-" * 50, file=out)
+    print(f"Error: {message}", file=out)
+
+
+def render_list_table(results: Iterable[Result], out) -> bool:
+    print("Deployments list:", file=out, flush=True)
+    for item in results:
+        if isinstance(item, ErrorResult):
+            print_error(item.message, out)
+            return True
+        print(format_deployment_row(item), file=out, flush=True)
+    return False
+
+
+def render_info_table(results: Iterable[Result], out) -> bool:
+    for item in results:
+        if isinstance(item, ErrorResult):
+            print_error(item.message, out)
+            return True
+        print(format_deployment_info(item), file=out)
+    return False
+
+
+def render_scale_table(results: Iterable[Result], out) -> bool:
+    scale_results: List[ScaleResult] = []
+    for item in results:
+        if isinstance(item, ErrorResult):
+            print_error(item.message, out)
+            return True
+        if isinstance(item, BulkScaleSummary):
+            print(format_bulk_scale(scale_results, item), file=out)
+            return any(is_error(result) for result in scale_results)
+        scale_results.append(item)
+
+    # A single deployment was scaled
+    for item in scale_results:
+        if item.status == 'Failed':
+            print_error(item.message, out)
+            return True
+        print(item.message, file=out)
+    return False
+
+
+def render_diagnostic_table(results: Iterable[Result], out) -> bool:
+    for item in results:
+        if isinstance(item, ErrorResult):
+            print_error(item.message, out)
+            return True
+        if isinstance(item, DiagnosticUpdate):
+            # Watch mode redraws only what changed
+            print(format_diagnostic_update(item), file=out, flush=True)
+            continue
+        if item.error:
+            print_error(f"{format_deployment_info(item.deployment)}\n{item.error}", out)
+            return True
+        print(format_diagnostic(item), file=out, flush=True)
+    return False
+
+
+def render_rollout_table(results: Iterable[Result], out) -> bool:
+    for item in results:
+        if isinstance(item, RolloutProgress):
+            print(format_rollout_progress(item), file=out, flush=True)
+        elif item.status == 'Complete':
+            print(item.message, file=out)
+        else:
+            print_error(item.message, out)
+            return True
+    return False
+
+
+def render_logs_table(results: Iterable[Result], out) -> bool:
+    for item in results:
+        if isinstance(item, ErrorResult):
+            print_error(item.message, out)
+            return True
+        if isinstance(item, LogScanSummary):
+            print(format_log_summary(item), file=out)
+            return False
+        print(format_log_match(item), file=out, flush=True)
+    return False
+
+
+def render_sweep_table(results: Iterable[Result], out) -> bool:
+    unhealthy: List[UnhealthyDeployment] = []
+    for item in results:
+        if isinstance(item, ErrorResult):
+            print_error(item.message, out)
+            return True
+        if isinstance(item, SweepSummary):
+            print(format_sweep(unhealthy, item), file=out)
+            return False
+        unhealthy.append(item)
+    return False
+
+
+def render_utilization_table(results: Iterable[Result], out) -> bool:
+    groups: List[UtilizationGroup] = []
+    outliers: List[ProvisioningOutlier] = []
+    for item in results:
+        if isinstance(item, ErrorResult):
+            print_error(item.message, out)
+            return True
+        if isinstance(item, UtilizationSummary):
+            print(format_utilization(groups, outliers, item), file=out)
+            return False
+        if isinstance(item, ProvisioningOutlier):
+            outliers.append(item)
+        else:
+            groups.append(item)
+    return False
+
+
+def render_clusters_table(results: Iterable[ClusterResult], out) -> bool:
+    """Print the merged results of a multi-cluster list, info or diagnostic
+
+    Results arrive grouped by cluster in completion order; every line or
+    block is prefixed with its cluster, and a failed cluster does not stop
+    the output of the others.
+    """
+    failed = False
+    for item in results:
+        result = item.result
+        if isinstance(result, ErrorResult):
+            print_error(f"[{item.cluster}] {result.message}", out)
+            failed = True
+        elif isinstance(result, DeploymentSummary):
+            print(f"Cluster: {item.cluster}, {format_deployment_row(result)}", file=out, flush=True)
+        elif isinstance(result, DeploymentDiagnostic) and result.error:
+            print_error(f"[{item.cluster}] {format_deployment_info(result.deployment)}\n{result.error}", out)
+            failed = True
+        elif isinstance(result, DeploymentDiagnostic):
+            print(f"Cluster: {item.cluster}\n{format_diagnostic(result)}", file=out, flush=True)
+        else:
+            print(f"Cluster: {item.cluster}\n{format_deployment_info(result)}", file=out, flush=True)
+    return failed
+
+
+TABLE_RENDERERS = {
+    'list': render_list_table,
+    'info': render_info_table,
+    'scale': render_scale_table,
+    'diagnostic': render_diagnostic_table,
+    'rollout-status': render_rollout_table,
+    'logs': render_logs_table,
+    'sweep': render_sweep_table,
+    'utilization': render_utilization_table,
+    'clusters': render_clusters_table,
+}
+
+
+def format_columns(headers: tuple, rows: List[tuple]) -> List[str]:
+    """Align rows of strings under their headers
+
+    Args:
+        headers: Column headers
+        rows: Rows with one string per column
+
+    Returns:
+        List[str]: Header line followed by one line per row
+    """
+    widths = [max(len(headers[i]), *(len(row[i]) for row in rows)) for i in range(len(headers))]
+    lines = ["  ".join(header.ljust(widths[i]) for i, header in enumerate(headers)).rstrip()]
+    for row in rows:
+        lines.append("  ".join(row[i].ljust(widths[i]) for i in range(len(headers))).rstrip())
+    return lines
+
+
+def format_deployment_row(deployment: DeploymentSummary) -> str:
+    """Format one row of the deployment list"""
+    return f"Namespace: {deployment.namespace}, Name: {deployment.name}, Replicas: {deployment.replicas}"
+
+
+def format_deployment_info(info: DeploymentInfo) -> str:
+    """Format the details of a deployment
+
+    Args:
+        info: Deployment information
+
+    Returns:
+        str: Formatted deployment information
+    """
+    output = "Deployment Info:\n"
+    output += f"Name: {info.name}, Namespace: {info.namespace}\n"
+    output += f"Replicas: Desired={info.replicas}, "
+    output += f"Ready={info.ready_replicas}, "
+    output += f"Available={info.available_replicas}\n"
+
+    output += "Containers:\n"
+    for container in info.containers:
+        output += f"  {container.name} ({container.image})\n"
+        output += (f"    Requests: CPU={format_cpu(container.cpu_request_cores)}, "
+                   f"Memory={format_memory(container.memory_request_bytes)}\n")
+        output += (f"    Limits: CPU={format_cpu(container.cpu_limit_cores)}, "
+                   f"Memory={format_memory(container.memory_limit_bytes)}\n")
+
+    output += "-" * 50 + "\n"
+    return output
+
+
+def format_bulk_scale(results: List[ScaleResult], summary: BulkScaleSummary) -> str:
+    """Format the per-deployment table of a bulk scale
+
+    Args:
+        results: Outcome of every deployment
+        summary: Totals of the bulk scale
+
+    Returns:
+        str: Formatted table, failure details and summary line
+    """
+    if not summary.total:
+        return "No deployments matched the requested selection"
+
+    rows = [(result.namespace or "-", result.name, result.status, f"{result.elapsed:.2f}s") for result in results]
+    lines = format_columns(("NAMESPACE", "DEPLOYMENT", "RESULT", "TIME"), rows)
+    for result in results:
+        if result.status != "Scaled":
+            lines.append(f"{result.namespace or '-'}/{result.name}: {result.message}")
+
+    lines.append(
+        f"Scaled {summary.scaled}/{summary.total} deployments to {summary.replicas} replicas "
+        f"in {summary.total_time:.2f}s (slowest: {summary.slowest:.2f}s)"
+    )
+    return "\n".join(lines) + "\n"
+
+
+def format_diagnostic(diagnostic: DeploymentDiagnostic) -> str:
+    """Format a deployment diagnostic
+
+    Args:
+        diagnostic: Diagnostic of the deployment
+
+    Returns:
+        str: Deployment info, ReplicaSets and per-pod details
+    """
+    output = format_deployment_info(diagnostic.deployment)
+    output += format_replica_sets(diagnostic.replica_sets)
+
+    for message in diagnostic.pod_errors:
+        output += f"Pod Info Error: {message}"
+
+    for pod in diagnostic.pods:
+        output += format_pod(pod)
+
+    if diagnostic.events:
+        output += format_events(diagnostic.events)
+
+    return output
+
+
+def format_events(events: List[EventSummary]) -> str:
+    """Format the warning events of a deployment grouped by reason"""
+    output = "Events:\n"
+    for event in events:
+        objects = ", ".join(event.objects[:3])
+        if len(event.objects) > 3:
+            objects += f" and {len(event.objects) - 3} more"
+        output += f"  {event.reason} x{event.count}, last seen {event.last_seen or 'N/A'}: {event.message} "
+        output += f"({objects})\n"
+    output += "-" * 50 + "\n"
+    return output
+
+
+def format_diagnostic_update(update: DiagnosticUpdate) -> str:
+    """Format the changes of a watched deployment diagnostic
+
+    Args:
+        update: Changes since the previous update
+
+    Returns:
+        str: What changed, followed by the changed parts only
+    """
+    output = f"[{update.elapsed:6.1f}s] {update.namespace}/{update.name} changed\n"
+    if update.deployment:
+        output += format_deployment_info(update.deployment)
+    if update.replica_sets is not None:
+        output += format_replica_sets(update.replica_sets)
+    for name in update.removed_pods:
+        output += f"Pod Removed: {name}\n"
+    for pod in update.pods:
+        output += format_pod(pod)
+    return output
+
+
+def format_replica_sets(replica_sets: List[ReplicaSetStatus]) -> str:
+    """Format the live ReplicaSets of a deployment"""
+    output = "ReplicaSets:\n"
+    for rs in replica_sets:
+        output += f"  {rs.name} (revision {rs.revision}"
+        output += ", current): " if rs.current else "): "
+        output += f"Desired={rs.desired}, "
+        output += f"Ready={rs.ready}, "
+        output += f"Available={rs.available}\n"
+    output += "-" * 50 + "\n"
+    return output
+
+
+def format_pod(pod: PodStatus) -> str:
+    """Format the status, resources and usage of a pod"""
+    conditions_str = ", ".join([
+        f"{cond.type}:{cond.status}" for cond in pod.conditions
+    ])
+
+    pod_output = "Pod Info:\n"
+    pod_output += f"Name: {pod.name}, Namespace: {pod.namespace}\n"
+    pod_output += f"ReplicaSet: {pod.replicaset}\n"
+    pod_output += f"Node: {pod.node}"
+    if pod.node_usage:
+        pod_output += f" (Usage: CPU={format_cpu(pod.node_usage.cpu_cores)}, "
+        pod_output += f"Memory={format_memory(pod.node_usage.memory_bytes)})"
+    pod_output += "\n"
+    pod_output += f"Phase: {pod.phase}, Reason: {pod.reason}\n"
+    pod_output += f"Conditions: {conditions_str}\n"
+
+    if pod.container_reasons:
+        pod_output += f"Container Issues: {', '.join(pod.container_reasons)}\n"
+
+    for idx, c in enumerate(pod.containers):
+        pod_output += f"Container {idx+1}: {c.name} ({c.image})\n"
+        pod_output += (f"  Resource Requests: CPU={format_cpu(c.cpu_request_cores)}, "
+                       f"Memory={format_memory(c.memory_request_bytes)}\n")
+        pod_output += (f"  Resource Limits: CPU={format_cpu(c.cpu_limit_cores)}, "
+                       f"Memory={format_memory(c.memory_limit_bytes)}\n")
+
+        if c.cpu_usage_cores is not None or c.memory_usage_bytes is not None:
+            pod_output += f"  Current Usage: CPU={format_cpu(c.cpu_usage_cores)}"
+            if c.cpu_usage_percent is not None:
+                pod_output += f" ({format_percent(c.cpu_usage_percent)})"
+            pod_output += f", Memory={format_memory(c.memory_usage_bytes)}"
+            if c.memory_usage_percent is not None:
+                pod_output += f" ({format_percent(c.memory_usage_percent)})"
+            pod_output += "\n"
+
+    pod_output += "-" * 50 + "\n"
+    return pod_output
+
+
+def format_rollout_progress(progress: RolloutProgress) -> str:
+    """Format one progress line of a rollout
+
+    Args:
+        progress: State of the rollout
+
+    Returns:
+        str: Replica counts, live ReplicaSets and what the rollout waits for
+    """
+    replica_sets = ", ".join(
+        f"{rs.name} (revision {rs.revision}): {rs.ready}/{rs.desired} ready" for rs in progress.replica_sets
+    )
+    return (
+        f"[{progress.elapsed:6.1f}s] {progress.namespace}/{progress.name}: "
+        f"updated {progress.updated}/{progress.desired}, ready {progress.ready}/{progress.desired}, "
+        f"available {progress.available}/{progress.desired} [{replica_sets}] - {progress.message}"
+    )
+
+
+def format_log_match(match: LogMatch) -> str:
+    """Format a matching log line with its context, like grep
+
+    Args:
+        match: Matching line
+
+    Returns:
+        str: Context lines marked with "-" and the match marked with ":",
+            followed by a "--" separator
+    """
+    source = f"{match.pod}/{match.container}" + (" (previous)" if match.previous else "")
+    first = match.line_number - len(match.before)
+    lines = [f"{source}:{first + idx}- {line}" for idx, line in enumerate(match.before)]
+    lines.append(f"{source}:{match.line_number}: {match.line}")
+    lines.extend(f"{source}:{match.line_number + idx + 1}- {line}" for idx, line in enumerate(match.after))
+    lines.append("--")
+    return "\n".join(lines)
+
+
+def format_log_summary(summary: LogScanSummary) -> str:
+    """Format the totals of a log scan
+
+    Args:
+        summary: Totals of the scan
+
+    Returns:
+        str: Unreadable logs and a summary line
+    """
+    lines = [f"Failed to read logs of {stream}: {message}"
+             for stream, message in sorted(summary.failed_streams.items())]
+    lines.append(
+        f"Scanned {summary.streams} logs of {summary.pods} pods ({summary.lines} lines, "
+        f"{format_memory(summary.bytes)}) in {summary.total_time:.2f}s: {summary.matches} matches"
+    )
+    return "\n".join(lines) + "\n"
+
+
+def format_sweep(unhealthy: List[UnhealthyDeployment], summary: SweepSummary) -> str:
+    """Format the unhealthy deployments found by a sweep
+
+    Args:
+        unhealthy: Unhealthy deployments
+        summary: Totals of the sweep
+
+    Returns:
+        str: Formatted table, pod details and summary line
+    """
+    unhealthy = sorted(unhealthy, key=lambda deployment: (deployment.namespace, deployment.name))
+    lines = []
+    if unhealthy:
+        rows = []
+        for deployment in unhealthy:
+            issue_counts = {}
+            for issue in deployment.pod_issues:
+                for reason in issue.reasons:
+                    issue_counts[reason] = issue_counts.get(reason, 0) + 1
+            issues = ", ".join(f"{reason} x{count}" for reason, count in sorted(issue_counts.items()))
+            if deployment.ready < deployment.desired:
+                issues = f"NotReady, {issues}" if issues else "NotReady"
+            rows.append((deployment.namespace, deployment.name,
+                         f"{deployment.ready}/{deployment.desired}", issues))
+        lines.extend(format_columns(("NAMESPACE", "DEPLOYMENT", "READY", "ISSUES"), rows))
+        for deployment in unhealthy:
+            for issue in deployment.pod_issues:
+                lines.append(f"{deployment.namespace}/{deployment.name}: pod {issue.pod}: {', '.join(issue.reasons)}")
+    for namespace, message in sorted(summary.failed_namespaces.items()):
+        lines.append(f"Failed to sweep namespace {namespace}: {message}")
+
+    lines.append(
+        f"Swept {summary.deployments} deployments, {summary.replicasets} ReplicaSets and "
+        f"{summary.pods} pods in {summary.namespaces} namespaces in {summary.total_time:.2f}s: "
+        f"{summary.unhealthy} unhealthy"
+    )
+    return "\n".join(lines) + "\n"
+
+
+def format_utilization(groups: List[UtilizationGroup], outliers: List[ProvisioningOutlier],
+                       summary: UtilizationSummary) -> str:
+    """Format a utilization report
+
+    Args:
+        groups: Aggregates of every deployment, namespace, node and the cluster
+        outliers: Over- and under-provisioned deployments
+        summary: Totals of the report
+
+    Returns:
+        str: One table per kind of group, the outliers and a summary line
+    """
+    headers = ("PODS", "CPU REQ", "CPU LIM", "CPU USED", "CPU %", "CPU P50/P95",
+               "MEM REQ", "MEM LIM", "MEM USED", "MEM %", "MEM P50/P95")
+    sections = (
+        ("deployment", "Deployments:", ("NAMESPACE", "DEPLOYMENT"), lambda group: (group.namespace, group.name)),
+        ("namespace", "Namespaces:", ("NAMESPACE",), lambda group: (group.name,)),
+        ("node", "Nodes:", ("NODE",), lambda group: (group.name,)),
+        ("cluster", "Cluster:", ("CLUSTER",), lambda group: (group.name,)),
+    )
+    lines = []
+    for kind, title, label_headers, labels in sections:
+        rows = [
+            labels(group) + (
+                str(group.pods),
+                format_cpu(group.cpu_request_cores),
+                format_cpu(group.cpu_limit_cores),
+                format_cpu(group.cpu_usage_cores),
+                format_percent(group.cpu_usage_percent),
+                f"{format_percent(group.cpu_percent_p50)}/{format_percent(group.cpu_percent_p95)}",
+                format_memory(group.memory_request_bytes),
+                format_memory(group.memory_limit_bytes),
+                format_memory(group.memory_usage_bytes),
+                format_percent(group.memory_usage_percent),
+                f"{format_percent(group.memory_percent_p50)}/{format_percent(group.memory_percent_p95)}",
+            )
+            for group in groups if group.group == kind
+        ]
+        if rows:
+            lines.append(title)
+            lines.extend(format_columns(label_headers + headers, rows))
+            lines.append("")
+
+    for outlier in outliers:
+        label = "Over-provisioned" if outlier.provisioning == "over" else "Under-provisioned"
+        lines.append(f"{label}: {outlier.namespace}/{outlier.name} uses "
+                     f"{format_percent(outlier.usage_percent)} of its {outlier.resource} requests")
+    if summary.metrics_error:
+        lines.append(f"Pod metrics unavailable: {summary.metrics_error}")
+
+    lines.append(
+        f"Aggregated {summary.containers} containers ({summary.containers_with_metrics} with metrics) of "
+        f"{summary.pods} pods in {summary.deployments} deployments, {summary.namespaces} namespaces and "
+        f"{summary.nodes} nodes in {summary.total_time:.2f}s"
+    )
+    return "\n".join(lines) + "\n"
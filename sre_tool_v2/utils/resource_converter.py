@@ -1,32 +1,219 @@
+import math
+import re
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+# Multipliers of the Kubernetes quantity suffixes, as (base, exponent). "K" is
+# not a Kubernetes suffix but was accepted by earlier versions of this tool.
+QUANTITY_SUFFIXES = {
+    'n': (10, -9), 'u': (10, -6), 'm': (10, -3), '': (10, 0),
+    'k': (10, 3), 'K': (10, 3), 'M': (10, 6), 'G': (10, 9), 'T': (10, 12), 'P': (10, 15), 'E': (10, 18),
+    'Ki': (2, 10), 'Mi': (2, 20), 'Gi': (2, 30), 'Ti': (2, 40), 'Pi': (2, 50), 'Ei': (2, 60),
+}
+QUANTITY_PATTERN = re.compile(r'([+-]?(?:\d+\.?\d*|\.\d+))(?:[eE]([+-]?\d+)|([a-zA-Z]*))')
+
+
+@lru_cache(maxsize=4096)
+def parse_quantity(quantity: str) -> float:
+    """Parse a Kubernetes quantity into its base unit
+    
+    Supports the decimal suffixes (n, u, m, k, M, G, T, P, E), the binary
+    suffixes (Ki to Ei) and exponent notation (e.g. "1e3"). Results are
+    memoized since the same few request and limit strings repeat across
+    every pod of a deployment.
+    
+    Args:
+        quantity: Quantity string (e.g., "250m", "64Mi", "1e3")
+        
+    Returns:
+        float: Value in cores for CPU, bytes for memory
+        
+    Raises:
+        ValueError: If the quantity is malformed
+    """
+    match = QUANTITY_PATTERN.fullmatch(quantity.strip())
+    if not match:
+        raise ValueError(f"Invalid quantity: {quantity!r}")
+    number, exponent, suffix = match.groups()
+    if exponent is not None:
+        base, power = 10, int(exponent)
+    elif suffix in QUANTITY_SUFFIXES:
+        base, power = QUANTITY_SUFFIXES[suffix]
+    else:
+        raise ValueError(f"Invalid quantity suffix: {quantity!r}")
+    # Dividing for negative powers keeps "100m" exactly 0.1
+    if power < 0:
+        return float(number) / base ** -power
+    return float(number) * base ** power
+
 def convert_cpu_to_cores(cpu_str: str) -> float:
     """Convert Kubernetes CPU notation to core value
     
     Args:
-        cpu_str: CPU string (e.g., "100m", "0.5")
+        cpu_str: CPU string (e.g., "100m", "0.5", "250000000n")
         
     Returns:
         float: CPU value in cores
     """
-    if cpu_str.endswith('m'):
-        return float(cpu_str[:-1]) / 1000
-    return float(cpu_str)
+    return parse_quantity(cpu_str)
         
 def convert_memory_to_bytes(mem_str: str) -> int:
     """Convert Kubernetes memory notation to bytes
     
+    Fractional byte counts are rounded up, as Kubernetes does.
+    
     Args:
-        mem_str: Memory string (e.g., "100Mi", "2Gi")
+        mem_str: Memory string (e.g., "100Mi", "2Gi", "1e9")
         
     Returns:
         int: Memory value in bytes
     """
-    units = {'Ki': 2**10, 'Mi': 2**20, 'Gi': 2**30, 'Ti': 2**40}
-    if mem_str[-2:] in units:
-        return int(float(mem_str[:-2]) * units[mem_str[-2:]])
-    elif mem_str[-1] == 'K':
-        return int(float(mem_str[:-1]) * 1000)
-    elif mem_str[-1] == 'M':
-        return int(float(mem_str[:-1]) * 1000000)
-    elif mem_str[-1] == 'G':
-        return int(float(mem_str[:-1]) * 1000000000)
-    return int(mem_str)
\ No newline at end of file
+    return math.ceil(parse_quantity(mem_str))
+
+def parse_cpu(cpu_str: Optional[str]) -> Optional[float]:
+    """Parse a CPU quantity, tolerating missing or malformed values
+    
+    Args:
+        cpu_str: CPU string or None
+        
+    Returns:
+        Optional[float]: CPU value in cores, None if unknown
+    """
+    if cpu_str is None:
+        return None
+    try:
+        return convert_cpu_to_cores(cpu_str)
+    except ValueError:
+        return None
+
+def parse_memory(mem_str: Optional[str]) -> Optional[int]:
+    """Parse a memory quantity, tolerating missing or malformed values
+    
+    Args:
+        mem_str: Memory string or None
+        
+    Returns:
+        Optional[int]: Memory value in bytes, None if unknown
+    """
+    if mem_str is None:
+        return None
+    try:
+        return convert_memory_to_bytes(mem_str)
+    except ValueError:
+        return None
+
+@lru_cache(maxsize=None)
+def optional_numpy():
+    """Return the numpy module, or None when it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def to_column(values: Iterable[Optional[float]]):
+    """Build a numeric column from values where None means unknown
+    
+    Args:
+        values: Numbers or None
+        
+    Returns:
+        A float64 NumPy array with NaN for unknown values, or a list of
+        floats with NaN when NumPy is not installed
+    """
+    column = [math.nan if value is None else value for value in values]
+    numpy = optional_numpy()
+    return numpy.array(column, dtype=numpy.float64) if numpy else column
+
+def parse_quantities(quantities: Iterable[Optional[str]]):
+    """Parse a column of quantities in one pass
+    
+    Each distinct string is parsed once thanks to the memoized scalar path.
+    
+    Args:
+        quantities: Quantity strings, None for missing values
+        
+    Returns:
+        Column built by to_column, NaN for missing or malformed quantities
+    """
+    values = []
+    for quantity in quantities:
+        try:
+            values.append(None if quantity is None else parse_quantity(quantity))
+        except ValueError:
+            values.append(None)
+    return to_column(values)
+
+def utilization_percent(usage, requests):
+    """Compute usage as a percentage of requests for whole columns at once
+    
+    Args:
+        usage: Column of usage values
+        requests: Column of requests in the same unit
+        
+    Returns:
+        Column of percentages, NaN where the usage is unknown or the
+        request is unknown or zero
+    """
+    numpy = optional_numpy()
+    if numpy is None:
+        return [
+            used / requested * 100 if requested > 0 else math.nan
+            for used, requested in zip(usage, requests)
+        ]
+    usage = numpy.asarray(usage, dtype=numpy.float64)
+    requests = numpy.asarray(requests, dtype=numpy.float64)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        percent = usage / requests * 100
+    percent[~(requests > 0)] = numpy.nan
+    return percent
+
+def from_column(column) -> List[Optional[float]]:
+    """Convert a column back to plain floats with None for unknown values"""
+    values = column.tolist() if hasattr(column, 'tolist') else column
+    return [None if math.isnan(value) else value for value in values]
+
+def format_cpu(cores: Optional[float]) -> str:
+    """Format a CPU value in Kubernetes notation
+    
+    Args:
+        cores: CPU value in cores or None
+        
+    Returns:
+        str: Whole cores (e.g. "2"), millicores (e.g. "250m") or "N/A"
+    """
+    if cores is None:
+        return "N/A"
+    millicores = round(cores * 1000, 6)
+    if millicores % 1000 == 0:
+        return str(int(millicores // 1000))
+    if millicores == int(millicores):
+        return f"{int(millicores)}m"
+    return f"{millicores:g}m"
+
+def format_memory(mem_bytes: Optional[int]) -> str:
+    """Format a memory value in Kubernetes binary notation
+    
+    Args:
+        mem_bytes: Memory value in bytes or None
+        
+    Returns:
+        str: Largest binary unit dividing the value (e.g. "256Mi"), one
+            decimal of the largest unit below it otherwise, or "N/A"
+    """
+    if mem_bytes is None:
+        return "N/A"
+    units = (('Ti', 2**40), ('Gi', 2**30), ('Mi', 2**20), ('Ki', 2**10))
+    for suffix, size in units:
+        if mem_bytes >= size and mem_bytes % size == 0:
+            return f"{mem_bytes // size}{suffix}"
+    for suffix, size in units:
+        if mem_bytes >= size:
+            return f"{mem_bytes / size:.1f}{suffix}"
+    return str(mem_bytes)
+
+def format_percent(percent: Optional[float]) -> str:
+    """Format a usage percentage with one decimal, "N/A" if unknown"""
+    if percent is None:
+        return "N/A"
+    return f"{percent:.1f}%"
@@ -0,0 +1,436 @@
+from dataclasses import asdict, dataclass, field
+from typing import Any, ClassVar, Dict, Iterator, List, Optional
+
+
+class Result:
+    """Base of the typed results returned by the managers
+
+    Every result converts to a plain dictionary for json/yaml output and to
+    one or more flat records, tagged with their kind, for JSON Lines output.
+    Results are slotted records holding parsed values; None stands for an
+    unknown value and formatting happens only when rendering.
+    """
+
+    __slots__ = ()
+    kind: ClassVar[str] = "result"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the result to plain data
+
+        Returns:
+            Dict[str, Any]: Fields of the result
+        """
+        return asdict(self)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Flatten the result into JSON Lines records
+
+        Yields:
+            Dict[str, Any]: One record tagged with its kind
+        """
+        yield {"kind": self.kind, **self.to_dict()}
+
+
+@dataclass(slots=True)
+class ErrorResult(Result):
+    """Failure of a command or of one of its steps"""
+
+    kind: ClassVar[str] = "error"
+    message: str
+
+
+@dataclass(slots=True)
+class DeploymentSummary(Result):
+    """One row of the deployment list"""
+
+    kind: ClassVar[str] = "deployment"
+    namespace: str
+    name: str
+    replicas: Optional[int]
+
+
+@dataclass(slots=True)
+class ContainerSpec(Result):
+    """Image and resources of a container in a pod template
+
+    CPU values are in cores and memory values in bytes.
+    """
+
+    kind: ClassVar[str] = "container"
+    name: str
+    image: str
+    cpu_request_cores: Optional[float] = None
+    memory_request_bytes: Optional[int] = None
+    cpu_limit_cores: Optional[float] = None
+    memory_limit_bytes: Optional[int] = None
+
+
+@dataclass(slots=True)
+class DeploymentInfo(Result):
+    """Replica counts and containers of a deployment"""
+
+    kind: ClassVar[str] = "deployment"
+    name: str
+    namespace: str
+    replicas: Optional[int]
+    ready_replicas: int
+    available_replicas: int
+    containers: List[ContainerSpec] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ScaleResult(Result):
+    """Outcome of scaling one deployment
+
+    status is "Scaled", "Timeout" or "Failed".
+    """
+
+    kind: ClassVar[str] = "scale"
+    namespace: Optional[str]
+    name: str
+    replicas: int
+    status: str
+    message: str
+    elapsed: Optional[float] = None
+
+
+@dataclass(slots=True)
+class BulkScaleSummary(Result):
+    """Totals of a bulk scale, produced after every ScaleResult"""
+
+    kind: ClassVar[str] = "scale_summary"
+    replicas: int
+    scaled: int
+    total: int
+    total_time: float
+    slowest: float
+
+
+@dataclass(slots=True)
+class ReplicaSetStatus(Result):
+    """Replica counts of a live ReplicaSet of a deployment"""
+
+    kind: ClassVar[str] = "replicaset"
+    name: str
+    revision: int
+    current: bool
+    desired: Optional[int]
+    ready: int
+    available: int
+
+
+@dataclass(slots=True)
+class RolloutProgress(Result):
+    """State of a deployment rollout, produced every time it changes"""
+
+    kind: ClassVar[str] = "rollout_progress"
+    namespace: str
+    name: str
+    desired: int
+    updated: int
+    ready: int
+    available: int
+    replica_sets: List[ReplicaSetStatus] = field(default_factory=list)
+    message: str = ""
+    elapsed: float = 0.0
+
+
+@dataclass(slots=True)
+class RolloutResult(Result):
+    """Outcome of waiting for a deployment rollout
+
+    status is "Complete", "Failed" or "Timeout".
+    """
+
+    kind: ClassVar[str] = "rollout"
+    namespace: Optional[str]
+    name: str
+    status: str
+    message: str
+    elapsed: float
+
+
+@dataclass(slots=True)
+class ContainerStatus(Result):
+    """Resources and usage of a running container
+
+    CPU values are in cores, memory values in bytes and usage percentages
+    are relative to the requests.
+    """
+
+    kind: ClassVar[str] = "container"
+    name: str
+    image: str
+    cpu_request_cores: Optional[float] = None
+    memory_request_bytes: Optional[int] = None
+    cpu_limit_cores: Optional[float] = None
+    memory_limit_bytes: Optional[int] = None
+    cpu_usage_cores: Optional[float] = None
+    memory_usage_bytes: Optional[int] = None
+    cpu_usage_percent: Optional[float] = None
+    memory_usage_percent: Optional[float] = None
+
+
+@dataclass(slots=True)
+class PodCondition(Result):
+    """Condition of a pod"""
+
+    kind: ClassVar[str] = "condition"
+    type: str
+    status: str
+    reason: Optional[str] = None
+    message: Optional[str] = None
+
+
+@dataclass(slots=True)
+class NodeUsage(Result):
+    """Usage of the node hosting a pod"""
+
+    kind: ClassVar[str] = "node_usage"
+    cpu_cores: Optional[float] = None
+    memory_bytes: Optional[int] = None
+
+
+@dataclass(slots=True)
+class PodStatus(Result):
+    """Status, resources and usage of a pod"""
+
+    kind: ClassVar[str] = "pod"
+    name: str
+    namespace: str
+    replicaset: str
+    phase: Optional[str]
+    reason: Optional[str]
+    node: Optional[str]
+    start_time: Optional[str]
+    conditions: List[PodCondition] = field(default_factory=list)
+    container_reasons: List[str] = field(default_factory=list)
+    containers: List[ContainerStatus] = field(default_factory=list)
+    node_usage: Optional[NodeUsage] = None
+
+
+@dataclass(slots=True)
+class EventSummary(Result):
+    """Warning events of a deployment, its ReplicaSets and pods sharing a reason
+
+    count sums the occurrences of every deduplicated event; last_seen and
+    message come from the most recent one and objects lists the
+    "Kind/name" of every object the events were reported on.
+    """
+
+    kind: ClassVar[str] = "event"
+    reason: str
+    count: int
+    last_seen: Optional[str]
+    message: str
+    objects: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class DeploymentDiagnostic(Result):
+    """Diagnostic of a deployment, its live ReplicaSets and their pods
+
+    error is set when the diagnostic stopped after reading the deployment;
+    pod_errors holds failures of the pod status lookup.
+    """
+
+    kind: ClassVar[str] = "diagnostic"
+    deployment: DeploymentInfo
+    replica_sets: List[ReplicaSetStatus] = field(default_factory=list)
+    pods: List[PodStatus] = field(default_factory=list)
+    pod_errors: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    events: List[EventSummary] = field(default_factory=list)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        yield from self.deployment.records()
+        for replica_set in self.replica_sets:
+            yield from replica_set.records()
+        for pod in self.pods:
+            yield from pod.records()
+        for event in self.events:
+            yield from event.records()
+        for message in self.pod_errors:
+            yield from ErrorResult(message).records()
+        if self.error:
+            yield from ErrorResult(self.error).records()
+
+
+@dataclass(slots=True)
+class DiagnosticUpdate(Result):
+    """Changes of a watched deployment diagnostic since the previous update
+
+    deployment and replica_sets are None when they did not change; pods only
+    holds the pods that were added or changed.
+    """
+
+    kind: ClassVar[str] = "diagnostic_update"
+    namespace: str
+    name: str
+    elapsed: float
+    deployment: Optional[DeploymentInfo] = None
+    replica_sets: Optional[List[ReplicaSetStatus]] = None
+    pods: List[PodStatus] = field(default_factory=list)
+    removed_pods: List[str] = field(default_factory=list)
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        yield {"kind": self.kind, "namespace": self.namespace, "name": self.name,
+               "elapsed": self.elapsed, "removed_pods": self.removed_pods}
+        if self.deployment:
+            yield from self.deployment.records()
+        for replica_set in self.replica_sets or []:
+            yield from replica_set.records()
+        for pod in self.pods:
+            yield from pod.records()
+
+
+@dataclass(slots=True)
+class PodIssue(Result):
+    """Failure reasons of a pod's containers"""
+
+    kind: ClassVar[str] = "pod_issue"
+    pod: str
+    reasons: List[str]
+
+
+@dataclass(slots=True)
+class UnhealthyDeployment(Result):
+    """Deployment reported by a sweep"""
+
+    kind: ClassVar[str] = "unhealthy_deployment"
+    namespace: str
+    name: str
+    ready: int
+    desired: int
+    pod_issues: List[PodIssue] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class SweepSummary(Result):
+    """Totals of a sweep, produced after every UnhealthyDeployment"""
+
+    kind: ClassVar[str] = "sweep_summary"
+    namespaces: int
+    deployments: int
+    replicasets: int
+    pods: int
+    unhealthy: int
+    total_time: float
+    failed_namespaces: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class LogMatch(Result):
+    """Log line of a container matching a pattern, with the lines around it"""
+
+    kind: ClassVar[str] = "log_match"
+    namespace: str
+    pod: str
+    container: str
+    previous: bool
+    line_number: int
+    line: str
+    before: List[str] = field(default_factory=list)
+    after: List[str] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class LogScanSummary(Result):
+    """Totals of a log scan, produced after every LogMatch
+
+    failed_streams maps "pod/container" (with " (previous)" for the logs of
+    the previous instance) to the error of streams that could not be read.
+    """
+
+    kind: ClassVar[str] = "log_summary"
+    pods: int
+    streams: int
+    lines: int
+    bytes: int
+    matches: int
+    total_time: float
+    failed_streams: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class UtilizationGroup(Result):
+    """Requests, limits and usage aggregated over a deployment, namespace, node or the cluster
+
+    group is "deployment", "namespace", "node" or "cluster". Usage
+    percentages relate the usage to the requests of the containers that
+    report metrics; the p50/p95 fields are percentiles of that percentage
+    across the group's containers.
+    """
+
+    kind: ClassVar[str] = "utilization"
+    group: str
+    name: str
+    namespace: Optional[str]
+    pods: int
+    containers: int
+    cpu_request_cores: float
+    cpu_limit_cores: float
+    cpu_usage_cores: Optional[float]
+    memory_request_bytes: int
+    memory_limit_bytes: int
+    memory_usage_bytes: Optional[int]
+    cpu_usage_percent: Optional[float] = None
+    memory_usage_percent: Optional[float] = None
+    cpu_percent_p50: Optional[float] = None
+    cpu_percent_p95: Optional[float] = None
+    memory_percent_p50: Optional[float] = None
+    memory_percent_p95: Optional[float] = None
+
+
+@dataclass(slots=True)
+class ProvisioningOutlier(Result):
+    """Deployment using far less than, or more than, it requests
+
+    provisioning is "over" when the usage is below the low threshold and
+    "under" when it is above the high threshold.
+    """
+
+    kind: ClassVar[str] = "provisioning_outlier"
+    namespace: str
+    name: str
+    resource: str
+    usage_percent: float
+    provisioning: str
+
+
+@dataclass(slots=True)
+class UtilizationSummary(Result):
+    """Totals of a utilization report, produced after every group and outlier"""
+
+    kind: ClassVar[str] = "utilization_summary"
+    namespaces: int
+    deployments: int
+    nodes: int
+    pods: int
+    containers: int
+    containers_with_metrics: int
+    total_time: float
+    metrics_error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ClusterResult(Result):
+    """Result of a command on one cluster of a multi-cluster run
+
+    The wrapped result keeps its own kind and fields; the name of the
+    kubeconfig context is added to them as a cluster column.
+    """
+
+    cluster: str
+    result: Result
+
+    @property
+    def kind(self) -> str:
+        return self.result.kind
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cluster": self.cluster, **self.result.to_dict()}
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        for record in self.result.records():
+            yield {"kind": record.pop("kind"), "cluster": self.cluster, **record}
@@ -0,0 +1,70 @@
+import threading
+import time
+from typing import Any, Awaitable, Callable
+
+
+class StageTimings:
+    """Collects the latency of the stages of a command
+
+    Stages may run concurrently; each one is recorded with its start offset
+    so that overlapping stages are visible in the report.
+    """
+
+    def __init__(self):
+        """Start the clock for a new command"""
+        self.start_time = time.monotonic()
+        self.stages = []
+        self.lock = threading.Lock()
+
+    def timed(self, name: str, func: Callable, *args, **kwargs) -> Any:
+        """Run a stage and record how long it took
+
+        Args:
+            name: Name of the stage
+            func: Callable running the stage
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            Any: Return value of func
+        """
+        stage_start = time.monotonic()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stage_end = time.monotonic()
+            with self.lock:
+                self.stages.append((name, stage_start - self.start_time, stage_end - stage_start))
+
+    async def timed_async(self, name: str, awaitable: Awaitable) -> Any:
+        """Await a stage of an async command and record how long it took
+
+        Args:
+            name: Name of the stage
+            awaitable: Coroutine running the stage
+
+        Returns:
+            Any: Result of the awaitable
+        """
+        stage_start = time.monotonic()
+        try:
+            return await awaitable
+        finally:
+            stage_end = time.monotonic()
+            with self.lock:
+                self.stages.append((name, stage_start - self.start_time, stage_end - stage_start))
+
+    def report(self) -> str:
+        """Format the recorded stages in start order
+
+        Returns:
+            str: Formatted timing report
+        """
+        with self.lock:
+            stages = sorted(self.stages, key=lambda stage: stage[1])
+        width = max([len(name) for name, _, _ in stages] + [5])
+        output = "Stage timings:\n"
+        for name, offset, duration in stages:
+            output += f"  {name:<{width}}  start +{offset * 1000:8.1f} ms  took {duration * 1000:8.1f} ms\n"
+        output += f"  {'total':<{width}}  {(time.monotonic() - self.start_time) * 1000:23.1f} ms\n"
+        return output